@@ -1,12 +1,300 @@
-from django.contrib import admin
-from .models import Category, CandidateProfile, RecruiterProfile, JobOffer, Application, Message, Notification, Guide, Testimonial
-
-admin.site.register(Category)
-admin.site.register(CandidateProfile)
-admin.site.register(RecruiterProfile)
-admin.site.register(JobOffer)
-admin.site.register(Application)
-admin.site.register(Message)
-admin.site.register(Notification)
-admin.site.register(Guide)
-admin.site.register(Testimonial)
\ No newline at end of file
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.utils.functional import cached_property
+
+from .models import (
+    Application, ApplicationStats, CandidateProfile, Category, DigestDelivery, Guide, JobOffer, Message, MessageArchive,
+    Notification, NotificationArchive, OfferCluster, OfferSignature, QueuedTask, RecruiterProfile, Testimonial,
+)
+from .moderation import set_applications_status, set_candidates_sponsored, set_offers_validated, set_testimonials_approved
+
+# Admin de modération. Les grandes tables (candidatures, messages, notifications, offres)
+# n'y font jamais de COUNT(*) exact : voir EstimatedCountPaginator.
+
+
+class EstimatedCountPaginator(Paginator):
+    """Nombre de lignes approché pour les grandes tables.
+
+    Sans filtre : décompte exact mis en cache (ADMIN_COUNT_CACHE_TIMEOUT). Avec filtre ou
+    recherche : décompte plafonné à ADMIN_COUNT_LIMIT (COUNT sur une sous-requête LIMIT),
+    la pagination s'arrête alors à ce plafond.
+    """
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where:
+            key = f"admin:count:{query.model._meta.db_table}"
+            return cache.get_or_set(key, self.object_list.count, settings.ADMIN_COUNT_CACHE_TIMEOUT)
+        return self.object_list.values('pk')[:settings.ADMIN_COUNT_LIMIT].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'updated_at']
+    search_fields = ['name']
+
+
+@admin.register(CandidateProfile)
+class CandidateProfileAdmin(LargeTableAdmin):
+    list_display = ['full_name', 'user', 'years_experience', 'media_status', 'is_sponsored', 'created_at']
+    list_select_related = ['user']
+    list_filter = ['is_sponsored', 'alert_frequency']
+    raw_id_fields = ['user', 'alert_category']
+    search_fields = ['full_name', 'user__username']
+    readonly_fields = ['media_status']
+    ordering = ['-id']
+    actions = ['sponsor_candidates', 'unsponsor_candidates']
+
+    @admin.action(description="Sponsoriser les profils sélectionnés")
+    def sponsor_candidates(self, request, queryset):
+        count = set_candidates_sponsored(queryset, True)
+        self.message_user(request, f"{count} profil(s) sponsorisé(s).", messages.SUCCESS)
+
+    @admin.action(description="Retirer le sponsoring des profils sélectionnés")
+    def unsponsor_candidates(self, request, queryset):
+        count = set_candidates_sponsored(queryset, False)
+        self.message_user(request, f"{count} profil(s) retiré(s) du sponsoring.", messages.SUCCESS)
+
+
+@admin.register(RecruiterProfile)
+class RecruiterProfileAdmin(admin.ModelAdmin):
+    list_display = ['company_name', 'user', 'is_validated', 'created_at']
+    list_select_related = ['user']
+    list_filter = ['is_validated']
+    raw_id_fields = ['user']
+    search_fields = ['company_name', 'user__username']
+    ordering = ['-created_at']
+    actions = ['validate_recruiters', 'invalidate_recruiters']
+
+    # Aucun signal ne dépend de la validation d'un recruteur : une seule requête UPDATE suffit
+    @admin.action(description="Valider les recruteurs sélectionnés")
+    def validate_recruiters(self, request, queryset):
+        count = queryset.update(is_validated=True)
+        self.message_user(request, f"{count} recruteur(s) validé(s).", messages.SUCCESS)
+
+    @admin.action(description="Retirer la validation des recruteurs sélectionnés")
+    def invalidate_recruiters(self, request, queryset):
+        count = queryset.update(is_validated=False)
+        self.message_user(request, f"{count} recruteur(s) invalidé(s).", messages.SUCCESS)
+
+
+class DuplicateFilter(admin.SimpleListFilter):
+    title = "contrôle des doublons"
+    parameter_name = 'dedup'
+
+    def lookups(self, request, model_admin):
+        return [('duplicate', "Doublon probable"), ('spam', "Spam probable")]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'duplicate':
+            return queryset.filter(signature__duplicate_of__isnull=False)
+        if self.value() == 'spam':
+            return queryset.filter(signature__is_spam=True)
+        return queryset
+
+
+@admin.register(JobOffer)
+class JobOfferAdmin(LargeTableAdmin):
+    list_display = ['title', 'created_by', 'category', 'location', 'is_validated', 'duplicate_of', 'spam', 'created_at']
+    list_select_related = ['created_by', 'category', 'signature']
+    list_filter = ['is_validated', DuplicateFilter]
+    raw_id_fields = ['created_by']
+    search_fields = ['title']
+    ordering = ['-created_at', '-id']
+    actions = ['validate_offers', 'reject_offers']
+
+    @admin.display(description="Doublon de")
+    def duplicate_of(self, obj):
+        signature = getattr(obj, 'signature', None)
+        if signature is None or signature.duplicate_of_id is None:
+            return ''
+        return f"n°{signature.duplicate_of_id} ({signature.similarity:.0%})"
+
+    @admin.display(description="Spam", boolean=True)
+    def spam(self, obj):
+        signature = getattr(obj, 'signature', None)
+        return bool(signature and signature.is_spam)
+
+    @admin.action(description="Valider les offres sélectionnées")
+    def validate_offers(self, request, queryset):
+        count = set_offers_validated(queryset, True)
+        self.message_user(request, f"{count} offre(s) validée(s).", messages.SUCCESS)
+
+    @admin.action(description="Rejeter (dépublier) les offres sélectionnées")
+    def reject_offers(self, request, queryset):
+        count = set_offers_validated(queryset, False)
+        self.message_user(request, f"{count} offre(s) rejetée(s).", messages.SUCCESS)
+
+
+@admin.register(Application)
+class ApplicationAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'status', 'applied_at']
+    list_select_related = ['candidate', 'job_offer']  # __str__ lit le candidat et l'offre
+    list_filter = ['status']
+    raw_id_fields = ['candidate', 'job_offer']
+    ordering = ['-applied_at']
+    actions = ['accept_applications', 'reject_applications']
+
+    @admin.action(description="Accepter les candidatures sélectionnées")
+    def accept_applications(self, request, queryset):
+        count = set_applications_status(queryset, 'accepted')
+        self.message_user(request, f"{count} candidature(s) acceptée(s).", messages.SUCCESS)
+
+    @admin.action(description="Rejeter les candidatures sélectionnées")
+    def reject_applications(self, request, queryset):
+        count = set_applications_status(queryset, 'rejected')
+        self.message_user(request, f"{count} candidature(s) rejetée(s).", messages.SUCCESS)
+
+
+@admin.register(ApplicationStats)
+class ApplicationStatsAdmin(LargeTableAdmin):
+    list_display = ['job_offer', 'recruiter', 'total', 'pending', 'accepted', 'rejected', 'updated_at']
+    list_select_related = ['job_offer', 'recruiter']
+    raw_id_fields = ['job_offer', 'recruiter']
+    ordering = ['-job_offer_id']
+
+
+@admin.register(Message)
+class MessageAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'sent_at', 'is_read']
+    list_select_related = ['sender', 'recipient']  # __str__ lit l'expéditeur et le destinataire
+    raw_id_fields = ['conversation', 'sender', 'recipient']
+    ordering = ['-sent_at']
+
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'content', 'is_read', 'created_at']
+    list_select_related = ['user']
+    list_filter = ['is_read']
+    raw_id_fields = ['user', 'related_offer', 'related_application']
+    ordering = ['-created_at']
+
+
+@admin.register(MessageArchive)
+class MessageArchiveAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'message_count', 'first_sent_at', 'last_sent_at']
+    list_select_related = ['conversation']
+    raw_id_fields = ['conversation']
+    ordering = ['-month']
+    exclude = ['data']
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'notification_count']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    ordering = ['-month']
+    exclude = ['data']
+
+
+@admin.register(DigestDelivery)
+class DigestDeliveryAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'status', 'attempts', 'sent_at']
+    list_select_related = ['user']
+    list_filter = ['frequency', 'status']
+    raw_id_fields = ['user']
+    ordering = ['-period', '-id']
+
+
+@admin.register(Guide)
+class GuideAdmin(admin.ModelAdmin):
+    list_display = ['title', 'category', 'created_at']
+    list_filter = ['category']
+    search_fields = ['title']
+
+
+@admin.register(Testimonial)
+class TestimonialAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'display_name', 'rating', 'created_at', 'is_approved']
+    list_select_related = ['user']
+    list_filter = ['is_approved', 'rating']
+    raw_id_fields = ['user']
+    ordering = ['-created_at']
+    actions = ['approve_testimonials', 'hide_testimonials']
+
+    @admin.action(description="Approuver les témoignages sélectionnés")
+    def approve_testimonials(self, request, queryset):
+        count = set_testimonials_approved(queryset, True)
+        self.message_user(request, f"{count} témoignage(s) approuvé(s).", messages.SUCCESS)
+
+    @admin.action(description="Masquer les témoignages sélectionnés")
+    def hide_testimonials(self, request, queryset):
+        count = set_testimonials_approved(queryset, False)
+        self.message_user(request, f"{count} témoignage(s) masqué(s).", messages.SUCCESS)
+
+
+class OfferSignatureInline(admin.TabularInline):
+    model = OfferSignature
+    fields = ['job_offer', 'duplicate_of', 'similarity', 'is_spam', 'spam_reasons']
+    readonly_fields = fields
+    can_delete = False
+    extra = 0
+    max_num = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('job_offer', 'duplicate_of')
+
+
+@admin.register(OfferCluster)
+class OfferClusterAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'sample_title', 'size', 'pending', 'status', 'updated_at']
+    list_filter = ['status']
+    ordering = ['-updated_at']
+    inlines = [OfferSignatureInline]
+    actions = ['approve_clusters', 'reject_clusters']
+
+    def get_queryset(self, request):
+        first_title = OfferSignature.objects.filter(cluster=OuterRef('pk')).order_by('pk').values('job_offer__title')[:1]
+        return super().get_queryset(request).annotate(
+            member_count=Count('signatures'),
+            pending_count=Count('signatures', filter=Q(signatures__job_offer__is_validated=False)),
+            first_title=Subquery(first_title),
+        )
+
+    @admin.display(description="Offre exemple")
+    def sample_title(self, obj):
+        return obj.first_title
+
+    @admin.display(description="Offres", ordering='member_count')
+    def size(self, obj):
+        return obj.member_count
+
+    @admin.display(description="Non validées", ordering='pending_count')
+    def pending(self, obj):
+        return obj.pending_count
+
+    def _moderate(self, request, queryset, validated):
+        cluster_ids = list(queryset.values_list('pk', flat=True))
+        count = set_offers_validated(JobOffer.objects.filter(signature__cluster__in=cluster_ids), validated)
+        OfferCluster.objects.filter(pk__in=cluster_ids).update(status='approved' if validated else 'rejected')
+        return count
+
+    @admin.action(description="Valider toutes les offres des groupes sélectionnés")
+    def approve_clusters(self, request, queryset):
+        count = self._moderate(request, queryset, True)
+        self.message_user(request, f"{count} offre(s) validée(s).", messages.SUCCESS)
+
+    @admin.action(description="Rejeter toutes les offres des groupes sélectionnés")
+    def reject_clusters(self, request, queryset):
+        count = self._moderate(request, queryset, False)
+        self.message_user(request, f"{count} offre(s) rejetée(s).", messages.SUCCESS)
+
+
+@admin.register(QueuedTask)
+class QueuedTaskAdmin(LargeTableAdmin):
+    list_display = ['name', 'status', 'attempts', 'run_after', 'updated_at']
+    list_filter = ['status']
+    ordering = ['-id']
+    readonly_fields = ['locked_at', 'last_error', 'created_at', 'updated_at']
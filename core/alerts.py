@@ -0,0 +1,183 @@
+import datetime
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from . import realtime
+from .skills import skills_in_text
+
+# Résumés d'alertes emploi (commande send_job_alerts), en deux phases reprenables :
+# 1. build_digests() lit une fois les offres validées de la période, repère les compétences
+#    connues qu'elles citent, puis fait l'intersection avec les compétences de tous les candidats
+#    abonnés en une seule requête sur CandidateSkill (triée par candidat). Les DigestDelivery et
+#    les Notification sont écrites par bulk_create, DIGEST_CHUNK candidats par transaction ;
+#    les candidats déjà servis pour la période sont ignorés à la reprise. bulk_create n'émettant
+#    pas de signaux, les notifications sont publiées en temps réel ici, après validation du lot.
+# 2. send_digests() rend les e-mails des envois « pending » et les expédie par lots de
+#    DIGEST_EMAIL_BATCH sur DIGEST_EMAIL_WORKERS connexions en parallèle. Seul le thread
+#    principal touche la base ; un lot interrompu avant sa mise à jour sera renvoyé.
+
+PERIOD_LABELS = {'daily': "depuis hier", 'weekly': "cette semaine"}
+
+
+def period_window(frequency, day):
+    """(début, fin) de la période qui se termine au début de `day` : la veille ou les 7 jours précédents."""
+    end = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return end - datetime.timedelta(days=7 if frequency == 'weekly' else 1), end
+
+
+def new_offers(frequency, day):
+    from .models import JobOffer
+
+    since, until = period_window(frequency, day)
+    return list(
+        JobOffer.objects.filter(is_validated=True, created_at__gte=since, created_at__lt=until)
+        .select_related('category').order_by('-created_at', '-id')
+    )
+
+
+def offer_skill_index(offers):
+    """{compétence: {offres qui la citent}} pour les offres données."""
+    index = defaultdict(set)
+    for offer in offers:
+        for skill in skills_in_text(f"{offer.title}\n{offer.experience_required}\n{offer.description}"):
+            index[skill.pk].add(offer.pk)
+    return index
+
+
+def match_candidates(frequency, offers):
+    """(user_id, [offres]) de chaque candidat abonné à `frequency` ; les offres partageant le plus
+    de compétences d'abord, puis les plus récentes, au plus DIGEST_MAX_OFFERS."""
+    from .models import CandidateSkill
+
+    index = offer_skill_index(offers)
+    if not index:
+        return []
+    category_of = {offer.pk: offer.category_id for offer in offers}
+    recency = {offer.pk: position for position, offer in enumerate(offers)}
+    rows = (
+        CandidateSkill.objects.filter(skill_id__in=list(index), candidate__alert_frequency=frequency)
+        .order_by('candidate_id')
+        .values_list('candidate_id', 'skill_id', 'candidate__user_id', 'candidate__alert_category_id')
+    )
+    matches = []
+    for _, group in groupby(rows.iterator(chunk_size=2000), key=itemgetter(0)):
+        shared = Counter()
+        for _, skill_id, user_id, category_id in group:
+            shared.update(index[skill_id])
+        offer_ids = [pk for pk in shared if category_id is None or category_of[pk] == category_id]
+        offer_ids.sort(key=lambda pk: (-shared[pk], recency[pk]))
+        if offer_ids:
+            matches.append((user_id, offer_ids[:settings.DIGEST_MAX_OFFERS]))
+    return matches
+
+
+def notification_text(count, frequency):
+    return f"{count} nouvelle(s) offre(s) correspondant à votre profil {PERIOD_LABELS[frequency]}"
+
+
+def build_digests(frequency, day):
+    """Écrit les envois et notifications de la période ; renvoie le nombre de candidats ajoutés."""
+    from .models import DigestDelivery, Notification
+
+    done = set(DigestDelivery.objects.filter(frequency=frequency, period=day).values_list('user_id', flat=True))
+    matches = [(user_id, offer_ids) for user_id, offer_ids in match_candidates(frequency, new_offers(frequency, day))
+               if user_id not in done]
+    for start in range(0, len(matches), settings.DIGEST_CHUNK):
+        chunk = matches[start:start + settings.DIGEST_CHUNK]
+        with transaction.atomic():
+            DigestDelivery.objects.bulk_create([
+                DigestDelivery(user_id=user_id, frequency=frequency, period=day, offer_ids=offer_ids)
+                for user_id, offer_ids in chunk
+            ])
+            Notification.objects.bulk_create([
+                Notification(user_id=user_id, content=notification_text(len(offer_ids), frequency), related_offer_id=offer_ids[0])
+                for user_id, offer_ids in chunk
+            ])
+            # Un événement par texte distinct (nombre d'offres) plutôt qu'un par candidat
+            recipients = defaultdict(list)
+            for user_id, offer_ids in chunk:
+                recipients[notification_text(len(offer_ids), frequency)].append(user_id)
+            for content, user_ids in recipients.items():
+                realtime.publish(user_ids, 'notification', {'content': content})
+    return len(matches)
+
+
+def render_email(delivery, offers):
+    context = {
+        'user': delivery.user,
+        'period': PERIOD_LABELS[delivery.frequency],
+        'offers': [
+            (offer, settings.SITE_URL + reverse('job_offer_detail', args=[offer.pk]))
+            for offer in (offers.get(pk) for pk in delivery.offer_ids) if offer is not None
+        ],
+        'site_url': settings.SITE_URL,
+    }
+    message = EmailMultiAlternatives(
+        subject=f"Vos nouvelles offres d'emploi {context['period']}",
+        body=render_to_string('core/emails/job_alert_digest.txt', context),
+        to=[delivery.user.email],
+    )
+    message.attach_alternative(render_to_string('core/emails/job_alert_digest.html', context), 'text/html')
+    return message
+
+
+def send_batch(messages):
+    """Expédie un lot sur une seule connexion ; renvoie False en cas d'échec (lot à retenter)."""
+    try:
+        get_connection(fail_silently=False).send_messages(messages)
+    except Exception:
+        return False
+    return True
+
+
+def send_digests(frequency, day):
+    """Expédie les envois « pending » de la période ; renvoie (envoyés, sans adresse, en échec)."""
+    from .models import DigestDelivery, JobOffer
+
+    pending = DigestDelivery.objects.filter(frequency=frequency, period=day, status='pending')
+    offers = {offer.pk: offer for offer in new_offers(frequency, day)}
+    batch_size = settings.DIGEST_EMAIL_BATCH
+    sent = skipped = failed = 0
+    last_pk = 0
+    with ThreadPoolExecutor(max_workers=settings.DIGEST_EMAIL_WORKERS) as pool:
+        while True:
+            deliveries = list(
+                pending.filter(pk__gt=last_pk).select_related('user')
+                .order_by('pk')[:batch_size * settings.DIGEST_EMAIL_WORKERS]
+            )
+            if not deliveries:
+                break
+            last_pk = deliveries[-1].pk
+            missing = {pk for delivery in deliveries for pk in delivery.offer_ids} - offers.keys()
+            if missing:  # Offre d'une période rejouée après coup
+                offers.update(JobOffer.objects.select_related('category').in_bulk(missing))
+
+            without_email = [delivery.pk for delivery in deliveries if not delivery.user.email]
+            deliveries = [delivery for delivery in deliveries if delivery.user.email]
+            batches = [deliveries[start:start + batch_size] for start in range(0, len(deliveries), batch_size)]
+            results = pool.map(send_batch, [[render_email(delivery, offers) for delivery in batch] for batch in batches])
+
+            now = timezone.now()
+            DigestDelivery.objects.filter(pk__in=without_email).update(status='skipped')
+            skipped += len(without_email)
+            for batch, ok in zip(batches, results):
+                pks = [delivery.pk for delivery in batch]
+                if ok:
+                    DigestDelivery.objects.filter(pk__in=pks).update(status='sent', sent_at=now, attempts=F('attempts') + 1)
+                    sent += len(pks)
+                else:
+                    DigestDelivery.objects.filter(pk__in=pks).update(attempts=F('attempts') + 1)
+                    failed += DigestDelivery.objects.filter(
+                        pk__in=pks, attempts__gte=settings.DIGEST_MAX_ATTEMPTS
+                    ).update(status='failed')
+    return sent, skipped, failed
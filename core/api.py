@@ -0,0 +1,129 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.gzip import gzip_page
+from rest_framework import viewsets
+from rest_framework.pagination import CursorPagination
+from rest_framework.routers import DefaultRouter
+
+from . import facets, salary
+from .models import Category, Guide, JobOffer
+from .serializers import CategorySerializer, GuideSerializer, JobOfferSerializer
+
+# API publique en lecture seule (v1) : offres validées, catégories et guides.
+
+
+class CreatedCursorPagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500  # Clients de synchronisation : grandes pages, curseur stable
+
+
+class ConditionalViewSetMixin:
+    """ETag / Last-Modified calculés sans charger les objets ; 304 si le client est à jour."""
+
+    def get_validators(self, request):
+        """Renvoie (version, horodatage unix) de la ressource, ou None pour ne pas conditionner."""
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        self.kwargs = kwargs
+        validators = self.get_validators(request) if request.method in ('GET', 'HEAD') else None
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+        version, last_modified = validators
+        digest = hashlib.md5(request.get_full_path().encode()).hexdigest()[:12]
+        etag = quote_etag(f"{self.basename}-{version}-{digest}")
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+        return response
+
+
+class TableVersionMixin(ConditionalViewSetMixin):
+    # Petites tables : la version est le dernier updated_at (une agrégation sur la table)
+    def get_validators(self, request):
+        latest = self.queryset.model.objects.aggregate(latest=Max('updated_at'))['latest']
+        if latest is None:
+            return None
+        count = self.queryset.model.objects.count()  # Une suppression change aussi la version
+        return f"{int(latest.timestamp() * 1_000_000)}.{count}", int(latest.timestamp())
+
+
+@method_decorator(gzip_page, name='dispatch')
+class JobOfferViewSet(ConditionalViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """Offres validées. Filtres : ?category=<id>, ?location=<ville>, ?salary_min=, ?salary_max= (mensuel) ;
+    tri : ?sort=salary_desc|salary_asc ; ?fields=id,title,... ."""
+
+    serializer_class = JobOfferSerializer
+    pagination_class = CreatedCursorPagination
+    queryset = JobOffer.objects.filter(is_validated=True).select_related('category')
+
+    def get_queryset(self):
+        queryset = self.queryset
+        category = self.request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category_id=category) if category.isdigit() else queryset.filter(category__name=category)
+        location = self.request.query_params.get('location')
+        if location:
+            # Même normalisation que les facettes : « Douala, Cameroun » ou « DLA » -> « douala »
+            queryset = queryset.filter(location_normalized=facets.normalize_location(location)[0])
+        queryset, _ = salary.filter_offers(queryset, self.request.query_params)
+        if self.action == 'list':
+            queryset, ordering = salary.sorted_offers(queryset, self.request.query_params.get('sort'))
+            if ordering:
+                self.paginator.ordering = ordering
+        return queryset
+
+    def get_validators(self, request):
+        # Lus en base, donc identiques quel que soit le processus qui répond : pas de 304 sur des
+        # données modifiées par un autre worker
+        if 'pk' in self.kwargs:
+            row = self.queryset.filter(pk=self.kwargs['pk']).values_list('updated_at', 'category__updated_at').first()
+            if row is None:
+                return None
+            stamps, suffix = row, ''
+        else:
+            # Une offre retirée ou supprimée change le nombre ; une catégorie renommée change les offres sérialisées
+            state = self.queryset.aggregate(latest=Max('updated_at'), count=Count('pk'))
+            if state['latest'] is None:
+                return None
+            stamps = (state['latest'], Category.objects.aggregate(latest=Max('updated_at'))['latest'])
+            suffix = f".{state['count']}"
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        version = '.'.join(str(int(stamp.timestamp() * 1_000_000)) for stamp in stamps) + suffix
+        return version, int(max(stamps).timestamp())
+
+
+@method_decorator(gzip_page, name='dispatch')
+class CategoryViewSet(TableVersionMixin, viewsets.ReadOnlyModelViewSet):
+    serializer_class = CategorySerializer
+    pagination_class = None  # Quelques dizaines de lignes
+    queryset = Category.objects.order_by('name')
+
+
+@method_decorator(gzip_page, name='dispatch')
+class GuideViewSet(TableVersionMixin, viewsets.ReadOnlyModelViewSet):
+    """Guides. Filtre : ?category=cv|interview|career."""
+
+    serializer_class = GuideSerializer
+    pagination_class = CreatedCursorPagination
+    queryset = Guide.objects.all()
+
+    def get_queryset(self):
+        category = self.request.query_params.get('category')
+        return self.queryset.filter(category=category) if category else self.queryset
+
+
+router = DefaultRouter()
+router.register('offers', JobOfferViewSet, basename='offer')
+router.register('categories', CategoryViewSet, basename='category')
+router.register('guides', GuideViewSet, basename='guide')
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from . import realtime, stats
+
+# Dépôt des candidatures. Une offre populaire peut recevoir des centaines de candidatures par
+# minute : écrites une à une, chacune prendrait le verrou d'écriture SQLite pour une transaction.
+# Les soumissions sont donc confiées à une file d'écriture par processus : un thread unique les
+# regroupe pendant APPLICATIONS_COALESCE_WINDOW secondes puis les écrit en une transaction
+# (bulk_create, compteurs ApplicationStats et notifications des recruteurs), et chaque requête
+# attend le résultat de sa propre candidature.
+# La contrainte unique (candidate, job_offer) rend la soumission idempotente : un double clic ou
+# un renvoi du formulaire retrouve la candidature existante au lieu d'en créer une seconde.
+
+
+def write_applications(pairs):
+    """Crée les candidatures (candidate_id, job_offer_id) manquantes en une transaction.
+
+    Renvoie {(candidate_id, job_offer_id): (application_id, créée)}, application_id valant None
+    si l'offre n'est plus publiée ou le profil n'existe plus. bulk_create n'émettant pas
+    de signaux, les compteurs de l'offre et la notification du recruteur sont écrits ici.
+    """
+    from .models import Application, CandidateProfile, JobOffer, Notification
+
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                # Offre retirée ou profil supprimé depuis la requête : écarté sans faire échouer le lot
+                offers = {
+                    pk: (owner_id, title)
+                    for pk, owner_id, title in JobOffer.objects.filter(
+                        pk__in={job_offer_id for _, job_offer_id in pairs}, is_validated=True
+                    ).values_list('pk', 'created_by_id', 'title')
+                }
+                candidates = set(CandidateProfile.objects.filter(
+                    pk__in={candidate_id for candidate_id, _ in pairs}
+                ).values_list('pk', flat=True))
+                wanted = {(candidate_id, job_offer_id) for candidate_id, job_offer_id in pairs
+                          if candidate_id in candidates and job_offer_id in offers}
+                existing = {
+                    (candidate_id, job_offer_id): pk
+                    for pk, candidate_id, job_offer_id in Application.objects.filter(
+                        candidate_id__in={candidate_id for candidate_id, _ in wanted},
+                        job_offer_id__in={job_offer_id for _, job_offer_id in wanted},
+                    ).values_list('pk', 'candidate_id', 'job_offer_id')
+                    if (candidate_id, job_offer_id) in wanted
+                }
+                now = timezone.now()
+                created = Application.objects.bulk_create([
+                    Application(candidate_id=candidate_id, job_offer_id=job_offer_id, applied_at=now)
+                    for candidate_id, job_offer_id in sorted(wanted - existing.keys())
+                ])
+                per_offer = Counter(application.job_offer_id for application in created)
+                for job_offer_id, count in per_offer.items():
+                    stats.apply_delta(job_offer_id, {'total': count, 'pending': count})
+                Notification.objects.bulk_create([
+                    Notification(
+                        user_id=offers[application.job_offer_id][0],
+                        content=f"Nouvelle candidature pour votre offre : {offers[application.job_offer_id][1]}",
+                        related_offer_id=application.job_offer_id,
+                        related_application=application,
+                    )
+                    for application in created
+                ])
+                recruiters = Counter(offers[application.job_offer_id][0] for application in created)
+                transaction.on_commit(lambda: [
+                    realtime.publish([user_id], 'notification', {'content': f"{count} nouvelle(s) candidature(s)"})
+                    for user_id, count in recruiters.items()
+                ])
+        except IntegrityError:
+            # Candidature écrite entre la lecture et l'insertion (autre processus, base sans verrou
+            # d'écriture global) : la seconde passe la retrouve parmi les existantes
+            if attempt:
+                raise
+            continue
+        results = dict.fromkeys(pairs, (None, False))
+        results.update((pair, (pk, False)) for pair, pk in existing.items())
+        results.update(
+            ((application.candidate_id, application.job_offer_id), (application.pk, True)) for application in created
+        )
+        return results
+
+
+class PendingApplication:
+    def __init__(self, candidate_id, job_offer_id):
+        self.pair = (candidate_id, job_offer_id)
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ApplicationQueue:
+    """File d'écriture des candidatures du processus, vidée par un thread unique."""
+
+    def __init__(self):
+        self._pending = []
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, candidate_id, job_offer_id):
+        """Met la candidature en file et attend son écriture ; renvoie (application_id, créée)."""
+        item = PendingApplication(candidate_id, job_offer_id)
+        with self._condition:
+            self._pending.append(item)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='application-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        if not item.done.wait(settings.APPLICATIONS_SUBMIT_TIMEOUT):
+            raise TimeoutError("Candidature non écrite dans le délai imparti.")
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            time.sleep(settings.APPLICATIONS_COALESCE_WINDOW)  # Laisse arriver les soumissions simultanées
+            with self._condition:
+                batch = self._pending[:settings.APPLICATIONS_BATCH_SIZE]
+                del self._pending[:len(batch)]
+            close_old_connections()
+            try:
+                results = write_applications([item.pair for item in batch])
+            except Exception as error:
+                for item in batch:
+                    item.error = error
+            else:
+                for item in batch:
+                    item.result = results[item.pair]
+            finally:
+                for item in batch:
+                    item.done.set()
+
+
+_queue = ApplicationQueue()
+
+
+def submit_application(candidate, job_offer):
+    """Dépose la candidature (idempotent) ; renvoie (application_id ou None, créée)."""
+    if not settings.APPLICATIONS_COALESCE:
+        return write_applications([(candidate.pk, job_offer.pk)])[candidate.pk, job_offer.pk]
+    return _queue.submit(candidate.pk, job_offer.pk)
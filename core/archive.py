@@ -0,0 +1,165 @@
+import datetime
+import json
+import zlib
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Conversation, Message, MessageArchive, Notification, NotificationArchive
+
+# Rétention : les messages lus et les notifications lues au-delà d'un certain âge quittent les
+# tables chaudes (et leurs index) pour des blocs mensuels compressés, un par conversation ou par
+# utilisateur. messaging.thread_page() relit les blocs d'une conversation à la suite des messages
+# encore en table, de façon transparente pour la vue.
+# Le dernier message d'une conversation (aperçu de la boîte de réception) n'est jamais archivé.
+
+
+def cutoff(days):
+    return timezone.now() - datetime.timedelta(days=days)
+
+
+def month_of(moment):
+    return moment.date().replace(day=1)
+
+
+def encode_block(records):
+    lines = '\n'.join(json.dumps(record, ensure_ascii=False, separators=(',', ':')) for record in records)
+    return zlib.compress(lines.encode(), 6)
+
+
+def decode_block(data):
+    if not data:
+        return []
+    return [json.loads(line) for line in zlib.decompress(bytes(data)).decode().splitlines()]
+
+
+def message_record(message):
+    return {
+        'id': message.pk,
+        'sender': message.sender_id,
+        'recipient': message.recipient_id,
+        'sent_at': message.sent_at.isoformat(),
+        'is_read': message.is_read,
+        'content': message.content,
+    }
+
+
+def notification_record(notification):
+    return {
+        'id': notification.pk,
+        'created_at': notification.created_at.isoformat(),
+        'is_read': notification.is_read,
+        'offer': notification.related_offer_id,
+        'application': notification.related_application_id,
+        'content': notification.content,
+    }
+
+
+def _merge(existing, records):
+    """Fusionne de nouvelles lignes dans un bloc (rejouer un lot interrompu ne crée pas de doublons)."""
+    by_id = {record['id']: record for record in existing}
+    by_id.update((record['id'], record) for record in records)
+    return sorted(by_id.values(), key=lambda record: record['id'])
+
+
+def archive_messages(before, batch_size=1000):
+    """Archive un lot de messages lus envoyés avant `before` ; renvoie le nombre de messages archivés."""
+    batch = list(
+        Message.objects.filter(sent_at__lt=before, is_read=True, conversation__isnull=False)
+        .exclude(pk__in=Conversation.objects.filter(last_message__isnull=False).values('last_message_id'))
+        .order_by('sent_at', 'id')[:batch_size]
+    )
+    if not batch:
+        return 0
+    groups = defaultdict(list)
+    for message in batch:
+        groups[message.conversation_id, month_of(message.sent_at)].append(message)
+
+    with transaction.atomic():
+        blocks = {
+            (block.conversation_id, block.month): block
+            for block in MessageArchive.objects.filter(
+                conversation_id__in={conversation_id for conversation_id, _ in groups},
+                month__in={month for _, month in groups},
+            )
+        }
+        newest = {}
+        for (conversation_id, month), messages in groups.items():
+            block = blocks.get((conversation_id, month)) or MessageArchive(conversation_id=conversation_id, month=month)
+            records = _merge(decode_block(block.data), [message_record(message) for message in messages])
+            sent = [message.sent_at for message in messages]
+            block.first_sent_at = min([block.first_sent_at, *sent] if block.pk else sent)
+            block.last_sent_at = max([block.last_sent_at, *sent] if block.pk else sent)
+            block.message_count = len(records)
+            block.data = encode_block(records)
+            block.save()
+            newest[conversation_id] = max(newest.get(conversation_id, block.last_sent_at), block.last_sent_at)
+        for conversation_id, moment in newest.items():
+            Conversation.objects.filter(
+                Q(archived_until__isnull=True) | Q(archived_until__lt=moment), pk=conversation_id
+            ).update(archived_until=moment)
+        Message.objects.filter(pk__in=[message.pk for message in batch]).delete()
+    return len(batch)
+
+
+def archive_notifications(before, batch_size=1000):
+    """Archive un lot de notifications lues créées avant `before` ; renvoie leur nombre."""
+    batch = list(
+        Notification.objects.filter(created_at__lt=before, is_read=True).order_by('created_at', 'id')[:batch_size]
+    )
+    if not batch:
+        return 0
+    groups = defaultdict(list)
+    for notification in batch:
+        groups[notification.user_id, month_of(notification.created_at)].append(notification)
+
+    with transaction.atomic():
+        blocks = {
+            (block.user_id, block.month): block
+            for block in NotificationArchive.objects.filter(
+                user_id__in={user_id for user_id, _ in groups},
+                month__in={month for _, month in groups},
+            )
+        }
+        for (user_id, month), notifications in groups.items():
+            block = blocks.get((user_id, month)) or NotificationArchive(user_id=user_id, month=month)
+            records = _merge(decode_block(block.data), [notification_record(item) for item in notifications])
+            block.notification_count = len(records)
+            block.data = encode_block(records)
+            block.save()
+        Notification.objects.filter(pk__in=[notification.pk for notification in batch]).delete()
+    return len(batch)
+
+
+def archived_messages(conversation, before=None, limit=20):
+    """Messages archivés de `conversation`, du plus récent au plus ancien, strictement avant la clé
+    (sent_at, id) `before` ; au plus `limit`. Instances Message non enregistrées, expéditeur joint."""
+    blocks = MessageArchive.objects.filter(conversation=conversation).order_by('-last_sent_at')
+    if before is not None:
+        blocks = blocks.filter(first_sent_at__lte=before[0])
+    found = []
+    for block in blocks.iterator():
+        for record in decode_block(block.data):
+            message = Message(
+                pk=record['id'], conversation_id=conversation.pk, sender_id=record['sender'],
+                recipient_id=record['recipient'], sent_at=parse_datetime(record['sent_at']),
+                is_read=record['is_read'], content=record['content'],
+            )
+            if before is None or (message.sent_at, message.pk) < before:
+                found.append(message)
+        # Les blocs sont mensuels, donc disjoints : le suivant est entièrement plus ancien
+        if len(found) >= limit:
+            break
+    found.sort(key=lambda message: (message.sent_at, message.pk), reverse=True)
+    found = found[:limit]
+
+    # Expéditeurs encore existants (leurs messages en table auraient disparu en cascade)
+    senders = User.objects.in_bulk({message.sender_id for message in found})
+    found = [message for message in found if message.sender_id in senders]
+    for message in found:
+        message.sender = senders[message.sender_id]
+    return found
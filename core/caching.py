@@ -0,0 +1,111 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.contrib import messages
+from django.core.cache import cache, caches
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+# Cache des pages publiques (accueil, liste et détail des offres).
+# - Les pages des visiteurs anonymes sont stockées rendues, sous une clé qui inclut la
+#   « génération » des offres : enregistrer ou supprimer une offre ou une catégorie renouvelle
+#   la génération, ce qui périme d'un coup toutes les pages de liste sans les parcourir.
+#   La génération vit dans le cache « coordination », commun à tous les processus : une écriture
+#   faite par un autre worker, par run_tasks ou par import_offers périme aussi les pages d'ici.
+# - Chaque offre a en plus sa propre version (updated_at), relue en base une fois par génération.
+# - ETag / Last-Modified permettent aux navigateurs de revalider et de recevoir des 304.
+
+GENERATION_KEY = 'offers:generation'
+LAST_MODIFIED_KEY = 'offers:last-modified'
+
+
+def new_state():
+    # Génération en nanosecondes plutôt qu'un compteur : deux processus qui la renouvellent en
+    # même temps n'ont pas besoin d'incrément atomique, chacun produit une valeur nouvelle
+    return {GENERATION_KEY: time.time_ns(), LAST_MODIFIED_KEY: int(time.time())}
+
+
+def offers_state():
+    """(génération, horodatage de dernière modification) des offres publiées, communs aux processus."""
+    shared = caches['coordination']
+    state = shared.get_many([GENERATION_KEY, LAST_MODIFIED_KEY])
+    if len(state) < 2:
+        for key, value in new_state().items():
+            shared.add(key, value)
+        state = shared.get_many([GENERATION_KEY, LAST_MODIFIED_KEY])
+        if len(state) < 2:  # Cache indisponible : aucune page ne sera servie depuis le cache
+            state = new_state()
+    return state[GENERATION_KEY], state[LAST_MODIFIED_KEY]
+
+
+def offer_state(pk, generation=None):
+    """Version (updated_at en microsecondes) d'une offre validée, ou None si elle n'est pas publiée.
+
+    Mémorisée dans le cache du processus pour la génération courante : toute écriture sur une
+    offre renouvelant la génération, la version est relue en base après chaque modification.
+    """
+    from .models import JobOffer
+
+    if generation is None:
+        generation, _ = offers_state()
+    key = f'offer:{pk}:updated:{generation}'
+    updated = cache.get(key)
+    if updated is None:
+        value = JobOffer.objects.filter(pk=pk, is_validated=True).values_list('updated_at', flat=True).first()
+        updated = int(value.timestamp() * 1_000_000) if value else 0
+        cache.set(key, updated)
+    return updated or None
+
+
+def invalidate_offers(pks=()):
+    """Périme, dans tous les processus, les pages de liste et les versions d'offres mémorisées.
+
+    `pks` (offres modifiées) est conservé pour les appelants : la nouvelle génération suffit à
+    faire relire leur version en base.
+    """
+    caches['coordination'].set_many(new_state())
+
+
+def cached_page(prefix, offer_kwarg=None):
+    """Met en cache la page pour les anonymes et gère les requêtes conditionnelles.
+
+    `offer_kwarg` désigne l'argument de la vue contenant l'id de l'offre affichée : la page suit
+    alors la version de cette offre plutôt que la génération globale.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # Les messages flash en attente doivent être affichés (et consommés) : pas de cache
+            if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            generation, last_modified = offers_state()
+            if offer_kwarg:
+                generation = offer_state(kwargs[offer_kwarg], generation)
+                if generation is None:
+                    return view(request, *args, **kwargs)
+                last_modified = generation // 1_000_000
+            anonymous = not request.user.is_authenticated
+            path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            # L'ETag distingue l'utilisateur : la barre de navigation n'est pas la même pour tous
+            etag = quote_etag(f"{prefix}-{generation}-{path_hash[:12]}-{request.user.pk or 0}")
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                key = f'page:{prefix}:{generation}:{path_hash}'
+                cached = cache.get(key) if anonymous else None
+                if cached is not None:
+                    response = cached
+                else:
+                    response = view(request, *args, **kwargs)
+                    if anonymous and response.status_code == 200 and not response.streaming and not response.cookies:
+                        cache.set(key, response)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+                patch_cache_control(response, max_age=0, must_revalidate=True)
+                patch_vary_headers(response, ['Cookie'])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.urls import URLResolver, get_resolver
+
+# Vérifications au démarrage (manage.py check, runserver, migrate) : les réglages qui désignent
+# des vues par leur nom d'URL doivent correspondre à des routes existantes, sans quoi ils sont
+# ignorés en silence.
+
+
+def view_names(resolver=None, prefix=''):
+    """Noms d'URL résolvables (« namespace:nom ») de la configuration d'URL."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            namespace = f"{prefix}{pattern.namespace}:" if pattern.namespace else prefix
+            yield from view_names(pattern, namespace)
+        elif pattern.name:
+            yield prefix + pattern.name
+
+
+def unknown_view_names(setting_name, names, known):
+    return [
+        Error(
+            f"{setting_name} désigne la vue « {name} », qui ne correspond à aucun nom d'URL.",
+            hint="Vérifiez le nom (et l'espace de noms) dans les fichiers urls.py et les routeurs de l'API.",
+            id='core.E001',
+        )
+        for name in names if name not in known
+    ]
+
+
+@register(Tags.urls)
+def check_view_name_settings(app_configs, **kwargs):
+    known = set(view_names())
+    return (
+        unknown_view_names('DATABASE_REPLICA_VIEWS', settings.DATABASE_REPLICA_VIEWS, known)
+        + unknown_view_names('RATE_LIMITS', settings.RATE_LIMITS, known)
+    )
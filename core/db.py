@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+# Routage lecture/écriture : pendant les requêtes GET des vues de consultation
+# (settings.DATABASE_REPLICA_VIEWS), les lectures passent par la connexion « replica ».
+# Partout ailleurs — écritures, tâches, commandes, vues qui modifient des données — tout
+# reste sur « default », si bien qu'une lecture ne suit jamais une écriture sur une autre connexion.
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+@contextmanager
+def read_from_replica():
+    """Envoie les lectures du bloc vers la base « replica » (si elle est configurée)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and 'replica' in connections.settings:
+            return 'replica'
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Deux vues sur les mêmes données
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReadReplicaMiddleware:
+    """Active la lecture sur « replica » pour les requêtes GET/HEAD des vues listées."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._use_replica = False
+        try:
+            return self.get_response(request)
+        finally:
+            # Sous ASGI, process_view s'exécute dans un autre contexte que __call__ : pas de
+            # Token.reset() possible, la valeur par défaut est simplement rétablie (utile en WSGI,
+            # où le contexte du thread sert à la requête suivante)
+            if request._use_replica:
+                _use_replica.set(False)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in ('GET', 'HEAD') and request.resolver_match.view_name in settings.DATABASE_REPLICA_VIEWS:
+            _use_replica.set(True)
+            request._use_replica = True
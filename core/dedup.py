@@ -0,0 +1,159 @@
+import hashlib
+import random
+import re
+from array import array
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .tasks import task
+from .text import tokenize
+
+# Détection des quasi-doublons et du spam dans la file de modération des offres.
+# Chaque offre est réduite à une signature MinHash de ses « shingles » (suites de mots) :
+# la proportion de valeurs égales entre deux signatures estime la similarité de Jaccard.
+# La signature est découpée en DEDUP_BANDS bandes, chacune hachée en un seau LSH : deux
+# offres similaires partagent au moins un seau avec forte probabilité. Une nouvelle offre
+# n'est donc comparée qu'aux offres de ses seaux, pas à toute la table.
+
+MERSENNE_PRIME = (1 << 61) - 1
+SHINGLE_SIZE = 3  # Mots par shingle
+
+CONTACT_RE = re.compile(
+    r"https?://|www\.|[\w.+-]+@[\w-]+\.\w+|(?:\+?\d[\s.-]?){8,}|whatsapp|telegram", re.IGNORECASE
+)
+
+
+def _permutations(count):
+    # Graine fixe : les signatures restent comparables d'un processus et d'un déploiement à l'autre
+    rng = random.Random(0x5EED)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME)) for _ in range(count)]
+
+
+PERMUTATIONS = _permutations(settings.DEDUP_NUM_PERM)
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+
+
+def offer_text(title, description):
+    return f"{title}\n{description}"
+
+
+def shingles(text):
+    """Empreintes des suites de SHINGLE_SIZE mots (texte sans accents ni casse)."""
+    words = tokenize(text)
+    if len(words) <= SHINGLE_SIZE:
+        return {_hash64(' '.join(words))} if words else set()
+    return {_hash64(' '.join(words[i:i + SHINGLE_SIZE])) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """Signature MinHash (array d'entiers 64 bits), ou None pour un texte vide."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return array('Q', (min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS))
+
+
+def from_bytes(data):
+    signature = array('Q')
+    signature.frombytes(bytes(data))
+    return signature
+
+
+def similarity(first, second):
+    """Similarité de Jaccard estimée entre deux signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def band_keys(signature):
+    """Une clé de seau (entier signé 64 bits) par bande de la signature."""
+    rows = len(signature) // settings.DEDUP_BANDS
+    keys = []
+    for band in range(settings.DEDUP_BANDS):
+        digest = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8, salt=band.to_bytes(2, 'big'))
+        keys.append(int.from_bytes(digest.digest(), 'big', signed=True))
+    return keys
+
+
+def content_spam_reasons(text):
+    reasons = []
+    if len(CONTACT_RE.findall(text)) >= settings.DEDUP_SPAM_MAX_CONTACTS:
+        reasons.append("coordonnées répétées")
+    letters = [char for char in text if char.isalpha()]
+    if len(letters) >= 40 and sum(char.isupper() for char in letters) / len(letters) > 0.6:
+        reasons.append("majuscules")
+    return reasons
+
+
+def candidates(pk, keys):
+    """Offres partageant au moins un seau avec `keys` (les plus récentes, dans la limite configurée)."""
+    from .models import LSHBucket
+
+    return list(
+        LSHBucket.objects.filter(key__in=keys).exclude(job_offer_id=pk)
+        .values_list('job_offer_id', flat=True).distinct().order_by('-job_offer_id')[:settings.DEDUP_MAX_CANDIDATES]
+    )
+
+
+def check_offer(pk):
+    """Calcule la signature d'une offre, la range dans ses seaux et la signale si doublon ou spam.
+
+    Coût indépendant de la taille de la table : quelques requêtes indexées et au plus
+    DEDUP_MAX_CANDIDATES comparaisons de signatures.
+    """
+    from .models import JobOffer, LSHBucket, OfferCluster, OfferSignature
+
+    offer = JobOffer.objects.filter(pk=pk).values('title', 'description', 'created_by_id').first()
+    if offer is None:
+        return None
+    text = offer_text(offer['title'], offer['description'])
+    signature = minhash(text)
+    with transaction.atomic():
+        LSHBucket.objects.filter(job_offer_id=pk).delete()
+        if signature is None:
+            OfferSignature.objects.filter(pk=pk).delete()
+            return None
+        keys = band_keys(signature)
+        best, best_score, owners, cluster_id = None, 0.0, set(), None
+        rows = OfferSignature.objects.filter(pk__in=candidates(pk, keys)).values_list(
+            'pk', 'minhash', 'cluster_id', 'job_offer__created_by_id'
+        )
+        for other_pk, other_minhash, other_cluster, owner in rows:
+            score = similarity(signature, from_bytes(other_minhash))
+            if score < settings.DEDUP_THRESHOLD:
+                continue
+            owners.add(owner)
+            if score > best_score:
+                best, best_score, cluster_id = other_pk, score, other_cluster
+        reasons = content_spam_reasons(text)
+        owners.discard(offer['created_by_id'])
+        if len(owners) + 1 >= settings.DEDUP_SPAM_MIN_OWNERS:
+            reasons.append(f"publiée par {len(owners) + 1} recruteurs")
+
+        if best is not None:
+            # Rejoint le groupe de l'offre la plus proche (créé au besoin), à réexaminer
+            if cluster_id is None:
+                cluster_id = OfferCluster.objects.create().pk
+                OfferSignature.objects.filter(pk=best).update(cluster_id=cluster_id)
+            else:
+                OfferCluster.objects.filter(pk=cluster_id).update(status='pending', updated_at=timezone.now())
+        OfferSignature.objects.update_or_create(job_offer_id=pk, defaults={
+            'minhash': signature.tobytes(),
+            'cluster_id': cluster_id,
+            'duplicate_of_id': best,
+            'similarity': best_score,
+            'is_spam': bool(reasons),
+            'spam_reasons': ', '.join(reasons)[:255],
+            'computed_at': timezone.now(),
+        })
+        LSHBucket.objects.bulk_create([LSHBucket(key=key, job_offer_id=pk) for key in keys])
+    return best
+
+
+@task('dedup.check_offer')
+def check_offer_task(payload, queued_task=None):
+    check_offer(payload['offer_id'])
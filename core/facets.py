@@ -0,0 +1,215 @@
+import re
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Value
+from django.db.models.functions import Greatest
+
+from .text import tokenize
+
+# Filtres à facettes de la liste des offres (catégorie, ville, expérience).
+# Le nombre d'offres validées par valeur de facette est tenu dans FacetCount : chaque
+# création, modification, validation ou suppression d'offre applique un delta (+1/-1),
+# la barre latérale ne lit donc que quelques dizaines de lignes. Les opérations en masse
+# sans signaux appliquent la différence de snapshot() avant/après ; la commande
+# rebuild_facets recalcule tout.
+
+FACETS = [
+    ('category', "Catégorie"),
+    ('location', "Ville"),
+    ('experience', "Expérience"),
+]
+
+# (clé, libellé, années minimum, années maximum)
+EXPERIENCE_LEVELS = [
+    ('0', "Débutant accepté", 0, 0),
+    ('1-2', "1 à 2 ans", 1, 2),
+    ('3-5', "3 à 5 ans", 3, 5),
+    ('6+', "6 ans et plus", 6, None),
+]
+
+# Abréviations courantes dans les offres saisies à la main
+LOCATION_ALIASES = {
+    'dla': 'douala',
+    'yde': 'yaounde',
+    'yaounde-cameroun': 'yaounde',
+    'douala-cameroun': 'douala',
+}
+
+LOCATION_SPLIT_RE = re.compile(r"[,;/(|]| - ")
+EXPERIENCE_RE = re.compile(r"(\d+)\s*(mois|month)?", re.IGNORECASE)
+BEGINNER_RE = re.compile(r"d[ée]butant|sans exp[ée]rience|aucune|junior|stage", re.IGNORECASE)
+
+
+def normalize_location(location):
+    """Ville normalisée (« Douala, Cameroun » -> ("douala", "Douala")) ; chaînes vides si inconnue."""
+    segment = ' '.join(LOCATION_SPLIT_RE.split(location or '', 1)[0].split())
+    slug = '-'.join(tokenize(segment))[:100]
+    value = LOCATION_ALIASES.get(slug, slug)
+    # Abréviation reconnue : libellé reconstruit à partir de la valeur normalisée
+    label = segment if value == slug else value.replace('-', ' ').title()
+    return value, label[:100]
+
+
+def parse_experience(text):
+    """Années d'expérience demandées (« 3 ans » -> 3, « Débutant » -> 0), None si non précisé."""
+    match = EXPERIENCE_RE.search(text or '')
+    if match:
+        years = int(match.group(1))
+        return years // 12 if match.group(2) else min(years, 50)
+    if BEGINNER_RE.search(text or ''):
+        return 0
+    return None
+
+
+def experience_level(years):
+    if years is None:
+        return None
+    for key, _, low, high in EXPERIENCE_LEVELS:
+        if years >= low and (high is None or years <= high):
+            return key
+    return None
+
+
+def derived_fields(location, experience_required):
+    """Colonnes indexées de JobOffer calculées à partir des champs texte."""
+    return {
+        'location_normalized': normalize_location(location)[0],
+        'experience_years': parse_experience(experience_required),
+    }
+
+
+def offer_keys(category_id, location_normalized, experience_years):
+    """Valeurs de facette (facette, valeur) d'une offre."""
+    keys = []
+    if category_id is not None:
+        keys.append(('category', str(category_id)))
+    if location_normalized:
+        keys.append(('location', location_normalized))
+    level = experience_level(experience_years)
+    if level is not None:
+        keys.append(('experience', level))
+    return keys
+
+
+def snapshot(queryset):
+    """Compteurs {(facette, valeur): n} et libellés des offres validées du queryset, en une agrégation."""
+    counts, labels = Counter(), {}
+    rows = (
+        queryset.filter(is_validated=True)
+        .values_list('category_id', 'location_normalized', 'experience_years')
+        .annotate(n=Count('pk'), sample=Min('location')).order_by()
+    )
+    for category_id, location_normalized, experience_years, n, sample in rows:
+        for key in offer_keys(category_id, location_normalized, experience_years):
+            counts[key] += n
+        if location_normalized:
+            labels[('location', location_normalized)] = normalize_location(sample)[1]
+    return counts, labels
+
+
+def apply(delta, labels=None):
+    """Ajoute `delta` ({(facette, valeur): ±n}) aux compteurs, en créant les lignes au besoin."""
+    from .models import FacetCount
+
+    labels = labels or {}
+    for (facet, value), n in delta.items():
+        if not n:
+            continue
+        rows = FacetCount.objects.filter(facet=facet, value=value)
+        if rows.update(count=Greatest(F('count') + n, Value(0))) or n < 0:
+            continue
+        try:
+            with transaction.atomic():
+                FacetCount.objects.create(facet=facet, value=value, label=labels.get((facet, value), ''), count=n)
+        except IntegrityError:
+            # Ligne créée entre-temps par une autre requête
+            rows.update(count=F('count') + n)
+
+
+def apply_change(before, after, labels=None):
+    """Applique la différence entre deux états (listes ou Counter de valeurs de facette)."""
+    delta = Counter(after)
+    delta.subtract(Counter(before))
+    apply(delta, labels)
+
+
+@transaction.atomic
+def rebuild():
+    """Recalcule tous les compteurs en une passe sur les offres validées."""
+    from .models import FacetCount, JobOffer
+
+    counts, labels = snapshot(JobOffer.objects.all())
+    FacetCount.objects.all().delete()
+    FacetCount.objects.bulk_create(
+        [FacetCount(facet=facet, value=value, label=labels.get((facet, value), ''), count=n)
+         for (facet, value), n in counts.items()],
+        batch_size=500,
+    )
+    return len(counts)
+
+
+def filter_offers(queryset, params):
+    """Applique les filtres de facette de la requête ; renvoie (queryset, {facette: valeur})."""
+    active = {}
+    category = params.get('category', '')
+    if category.isdigit():
+        queryset = queryset.filter(category_id=int(category))
+        active['category'] = category
+    location = params.get('location', '')
+    if location:
+        queryset = queryset.filter(location_normalized=location)
+        active['location'] = location
+    levels = {key: (low, high) for key, _, low, high in EXPERIENCE_LEVELS}
+    experience = params.get('experience', '')
+    if experience in levels:
+        low, high = levels[experience]
+        queryset = queryset.filter(experience_years__gte=low)
+        if high is not None:
+            queryset = queryset.filter(experience_years__lte=high)
+        active['experience'] = experience
+    return queryset, active
+
+
+def sidebar(params, limit):
+    """Groupes de la barre latérale : au plus `limit` valeurs par facette, lien d'activation compris.
+
+    Deux requêtes quel que soit le nombre d'offres : les compteurs et les noms des catégories.
+    """
+    from .models import Category, FacetCount
+
+    rows = list(FacetCount.objects.filter(count__gt=0).order_by('facet', '-count', 'value'))
+    category_ids = [int(row.value) for row in rows if row.facet == 'category']
+    category_names = dict(Category.objects.filter(pk__in=category_ids).values_list('pk', 'name'))
+    level_labels = {key: label for key, label, _, _ in EXPERIENCE_LEVELS}
+
+    groups = []
+    for facet, title in FACETS:
+        options = []
+        for row in rows:
+            if row.facet != facet or len(options) >= limit:
+                continue
+            if facet == 'category':
+                label = category_names.get(int(row.value))
+            elif facet == 'experience':
+                label = level_labels.get(row.value)
+            else:
+                label = row.label or row.value
+            if label is None:
+                continue
+            query = params.copy()
+            query.pop('cursor', None)
+            selected = params.get(facet) == row.value
+            if selected:
+                query.pop(facet, None)
+            else:
+                query[facet] = row.value
+            options.append({
+                'value': row.value, 'label': label, 'count': row.count,
+                'selected': selected, 'query': query.urlencode(),
+            })
+        if facet == 'experience':
+            options.sort(key=lambda option: option['value'])  # Niveaux dans l'ordre croissant
+        if options:
+            groups.append({'name': facet, 'title': title, 'options': options})
+    return groups
@@ -0,0 +1,124 @@
+import csv
+import json
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# Flux d'offres d'emploi (import des partenaires, export) au format JSONL ou CSV.
+# Lecture et écriture enregistrement par enregistrement : ni le fichier ni le queryset ne
+# sont jamais chargés entièrement en mémoire.
+
+FORMATS = ('jsonl', 'csv')
+EXPORT_FIELDS = [
+    'id', 'source', 'external_id', 'title', 'description', 'category',
+    'location', 'salary', 'experience_required', 'created_at',
+]
+# Longueurs maximales des champs CharField de JobOffer
+MAX_LENGTHS = {'title': 200, 'location': 100, 'salary': 100, 'experience_required': 100}
+
+
+def guess_format(path):
+    extension = path.rsplit('.', 1)[-1].lower()
+    if extension in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    if extension == 'csv':
+        return 'csv'
+    raise ValueError(f"Format non reconnu pour {path} (jsonl ou csv attendu)")
+
+
+def read_records(stream, fmt):
+    """Génère (numéro, enregistrement, erreur) pour chaque enregistrement du flux texte `stream`.
+
+    Un enregistrement illisible est signalé par `erreur` sans interrompre la lecture.
+    """
+    if fmt == 'jsonl':
+        number = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield number, None, f"JSON invalide : {exc}"
+                continue
+            if isinstance(record, dict):
+                yield number, record, None
+            else:
+                yield number, None, "Objet JSON attendu"
+    elif fmt == 'csv':
+        for number, record in enumerate(csv.DictReader(stream), start=1):
+            yield number, record, None
+    else:
+        raise ValueError(f"Format inconnu : {fmt}")
+
+
+def offer_fields(record):
+    """Champs de JobOffer (hors source/propriétaire) tirés d'un enregistrement ; ValueError si incomplet."""
+    def text(name):
+        value = record.get(name)
+        return '' if value is None else str(value).strip()
+
+    fields = {
+        'external_id': text('external_id') or text('id'),
+        'title': text('title'),
+        'description': text('description'),
+        'location': text('location'),
+        'salary': text('salary'),
+        'experience_required': text('experience_required'),
+    }
+    missing = [name for name in ('external_id', 'title', 'description', 'location') if not fields[name]]
+    if missing:
+        raise ValueError(f"Champs obligatoires manquants : {', '.join(missing)}")
+    if len(fields['external_id']) > 100:
+        raise ValueError("external_id trop long (100 caractères maximum)")
+    for name, length in MAX_LENGTHS.items():
+        fields[name] = fields[name][:length]
+    created_at = text('created_at')
+    if created_at:
+        value = parse_datetime(created_at)
+        if value is None:
+            raise ValueError(f"Date invalide : {created_at}")
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, timezone.get_default_timezone())
+        fields['created_at'] = value
+    return fields, text('category')
+
+
+def iter_offers(queryset, chunk_size=1000):
+    """Parcourt les offres par tranches de clé primaire, catégorie comprise, sans tout charger."""
+    columns = [field for field in EXPORT_FIELDS if field != 'category']
+    last_pk = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values(*columns, category_name=F('category__name'))[:chunk_size]
+        )
+        if not rows:
+            return
+        for row in rows:
+            row['category'] = row.pop('category_name') or ''
+            row['created_at'] = row['created_at'].isoformat()
+            yield row
+        last_pk = rows[-1]['id']
+
+
+class _Echo:
+    """Pseudo-fichier dont write() renvoie la ligne au lieu de l'écrire (pour csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def serialize(rows, fmt):
+    """Génère le flux texte (une ligne à la fois) des lignes `rows` au format demandé."""
+    if fmt == 'jsonl':
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + '\n'
+    elif fmt == 'csv':
+        writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_FIELDS)
+        yield writer.writeheader()
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        raise ValueError(f"Format inconnu : {fmt}")
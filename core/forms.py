@@ -1,12 +1,22 @@
 from django import forms
+from django.conf import settings
+from django.core.validators import FileExtensionValidator
+from django.template.defaultfilters import filesizeformat
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Submit
-from .models import CandidateProfile
+from .models import CandidateProfile, Testimonial
 
 class CandidateProfileForm(forms.ModelForm):
     class Meta:
         model = CandidateProfile
-        fields = ['full_name', 'skills', 'years_experience', 'education', 'cv_file', 'profile_picture', 'social_links']
+        fields = [
+            'full_name', 'skills', 'years_experience', 'education', 'cv_file', 'profile_picture', 'social_links',
+            'alert_frequency', 'alert_category',
+        ]
+        labels = {
+            'alert_frequency': "Alertes emploi par e-mail",
+            'alert_category': "Catégorie des alertes (toutes si vide)",
+        }
         widgets = {
             'skills': forms.Textarea(attrs={'rows': 4}),
             'education': forms.Textarea(attrs={'rows': 4}),
@@ -18,8 +28,56 @@ class CandidateProfileForm(forms.ModelForm):
         self.helper = FormHelper()
         self.helper.form_method = 'post'
         self.helper.add_input(Submit('submit', 'Enregistrer', css_class='bg-orange-500 text-white px-4 py-2 rounded hover:bg-orange-300'))
+        self.fields['cv_file'].validators.append(FileExtensionValidator(['pdf', 'doc', 'docx']))
+        self.fields['cv_file'].widget.attrs['accept'] = '.pdf,.doc,.docx'
+        self.fields['profile_picture'].widget.attrs['accept'] = 'image/*'
+
+    def reject_uploads(self, rejected):
+        """Signale les fichiers abandonnés pendant la réception car trop volumineux."""
+        for field, limit in rejected.items():
+            if field in self.fields:
+                self.add_error(field, f"Fichier trop volumineux (maximum {filesizeformat(limit)}).")
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for field in ('cv_file', 'profile_picture'):
+            upload = self.files.get(field)
+            limit = settings.UPLOAD_MAX_SIZES.get(field, settings.UPLOAD_DEFAULT_MAX_SIZE)
+            if upload is not None and upload.size > limit:
+                self.add_error(field, f"Fichier trop volumineux (maximum {filesizeformat(limit)}).")
+        return cleaned_data
+
+class TestimonialForm(forms.ModelForm):
+    class Meta:
+        model = Testimonial
+        fields = ['display_name', 'content', 'rating']
+        labels = {
+            'display_name': "Votre nom",
+            'content': "Votre avis",
+            'rating': "Note (1-5 étoiles)",
+        }
+        widgets = {
+            'content': forms.Textarea(attrs={'rows': 4}),
+            'rating': forms.NumberInput(attrs={'min': 1, 'max': 5}),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['display_name'].required = True
+
+class AlertSettingsForm(forms.ModelForm):
+    """Préférences d'alertes emploi d'un profil candidat existant."""
+
+    class Meta:
+        model = CandidateProfile
+        fields = ['alert_frequency', 'alert_category']
+        labels = CandidateProfileForm.Meta.labels
+
+class CandidateSearchForm(forms.Form):
+    skills = forms.CharField(max_length=500, label="Compétences", help_text="Séparées par des virgules (ex: Python, Django)")
+    min_experience = forms.IntegerField(min_value=0, required=False, label="Expérience minimale (années)")
+    max_experience = forms.IntegerField(min_value=0, required=False, label="Expérience maximale (années)")
+
 
-class TestimonialForm(forms.Form):
-    name = forms.CharField(max_length=100, label="Votre nom")
-    review = forms.CharField(widget=forms.Textarea, label="Votre avis")
-    rating = forms.IntegerField(min_value=1, max_value=5, label="Note (1-5 étoiles)")
\ No newline at end of file
+class MessageForm(forms.Form):
+    content = forms.CharField(widget=forms.Textarea(attrs={'rows': 3}), max_length=5000, label="Votre message")
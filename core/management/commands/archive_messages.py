@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core import archive
+
+
+class Command(BaseCommand):
+    help = "Déplace les messages lus et les notifications lues anciens vers les archives mensuelles compressées, par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--message-days', type=int, default=settings.ARCHIVE_MESSAGES_AFTER_DAYS,
+                            help="Âge minimal des messages archivés, en jours.")
+        parser.add_argument('--notification-days', type=int, default=settings.ARCHIVE_NOTIFICATIONS_AFTER_DAYS,
+                            help="Âge minimal des notifications archivées, en jours.")
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE, help="Lignes par lot (une transaction).")
+        parser.add_argument('--max-batches', type=int, default=0, help="Arrête après ce nombre de lots par table (0 : sans limite).")
+        parser.add_argument('--vacuum', action='store_true', help="Compacte ensuite le fichier SQLite (VACUUM, bloque les écritures).")
+
+    def handle(self, *args, **options):
+        jobs = [
+            ('messages archivés', archive.archive_messages, archive.cutoff(options['message_days'])),
+            ('notifications archivées', archive.archive_notifications, archive.cutoff(options['notification_days'])),
+        ]
+        for label, archive_batch, before in jobs:
+            total = batches = 0
+            while not options['max_batches'] or batches < options['max_batches']:
+                count = archive_batch(before, options['batch_size'])
+                if not count:
+                    break
+                total += count
+                batches += 1
+                self.stdout.write(f"{total} {label}…")
+            self.stdout.write(self.style.SUCCESS(f"{total} {label} (avant le {before:%Y-%m-%d})."))
+
+        if options['vacuum'] and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+            self.stdout.write(self.style.SUCCESS("Base SQLite compactée."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import caching, salary
+from core.models import JobOffer
+
+
+class Command(BaseCommand):
+    help = "Analyse le salaire texte des offres existantes et renseigne les colonnes numériques, par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Nombre d'offres par lot.")
+        parser.add_argument('--all', action='store_true', help="Réanalyse aussi les offres déjà renseignées (règles modifiées).")
+
+    def handle(self, *args, **options):
+        offers = JobOffer.objects.exclude(salary='')
+        if not options['all']:
+            offers = offers.filter(salary_period='')
+        processed = updated = unparsed = 0
+        last_pk = 0
+        while True:
+            batch = list(offers.filter(pk__gt=last_pk).order_by('pk').only('pk', 'salary', *salary.FIELDS)[:options['batch_size']])
+            if not batch:
+                break
+            changed = []
+            for offer in batch:
+                fields = salary.parse_salary(offer.salary)
+                if fields['salary_period'] == '':
+                    unparsed += 1
+                if any(getattr(offer, field) != value for field, value in fields.items()):
+                    for field, value in fields.items():
+                        setattr(offer, field, value)
+                    changed.append(offer)
+            with transaction.atomic():
+                JobOffer.objects.bulk_update(changed, salary.FIELDS, batch_size=500)
+            processed += len(batch)
+            updated += len(changed)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"{processed} offres analysées…")
+
+        if updated:
+            caching.invalidate_offers()
+        self.stdout.write(self.style.SUCCESS(
+            f"{processed} offres analysées, {updated} mises à jour, {unparsed} sans montant reconnu."
+        ))
@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models import Count
+from django.core.management.base import BaseCommand
+
+from core.models import CandidateProfile, CandidateSkill, Skill
+from core.skills import parse_skills, resolve_skills
+
+
+class Command(BaseCommand):
+    help = "Renseigne les compétences normalisées à partir du champ texte des profils existants."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Nombre de profils par lot.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        cache = {}
+        processed = links = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                CandidateProfile.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'skills')[:batch_size]
+            )
+            if not batch:
+                break
+            rows = []
+            for pk, skills in batch:
+                rows.extend(
+                    CandidateSkill(candidate_id=pk, skill_id=skill.pk)
+                    for skill in resolve_skills(parse_skills(skills), cache=cache)
+                )
+            with transaction.atomic():
+                CandidateSkill.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+            processed += len(batch)
+            links += len(rows)
+            last_pk = batch[-1][0]
+            self.stdout.write(f"{processed} profils traités…")
+
+        # Tailles des listes de candidats recalculées en une passe
+        counts = dict(CandidateSkill.objects.values('skill').annotate(total=Count('pk')).values_list('skill', 'total'))
+        skills = list(Skill.objects.only('pk', 'candidate_count'))
+        for skill in skills:
+            skill.candidate_count = counts.get(skill.pk, 0)
+        Skill.objects.bulk_update(skills, ['candidate_count'], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f"{processed} profils, {links} compétences liées, {len(skills)} compétences."))
@@ -0,0 +1,218 @@
+import json
+import math
+import platform
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import ConversationMember, JobOffer
+from core.pagination import keyset_paginate
+
+# Scénarios mesurés (méthodes scenario_<nom>). Les URL sont calculées sur les données présentes
+# (voir seed_data) ; chaque itération vise un objet différent quand c'est possible.
+SCENARIOS = [
+    'home',
+    'job_offer_list',
+    'job_offer_list_page2',
+    'job_offer_search',
+    'job_offer_detail',
+    'message_list',
+    'candidate_profile_create',
+    'candidate_profile_create_post',
+]
+
+
+def percentile(values, fraction):
+    """Percentile par interpolation linéaire sur une liste triée."""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * fraction
+    low, high = math.floor(position), math.ceil(position)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class Command(BaseCommand):
+    help = "Mesure latences (p50/p95/p99) et nombre de requêtes SQL des vues principales via le client de test."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help="Requêtes mesurées par scénario.")
+        parser.add_argument('--warmup', type=int, default=5, help="Requêtes non mesurées avant chaque scénario.")
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, help="Limite aux scénarios donnés (répétable).")
+        parser.add_argument('--cold-cache', action='store_true', help="Vide le cache avant chaque requête.")
+        parser.add_argument('--output', help="Fichier JSON des résultats.")
+        parser.add_argument('--thresholds', help='Fichier JSON de seuils : {"scénario": {"p95_ms": 50, "queries": 5}}.')
+        parser.add_argument('--baseline', help="Résultats JSON d'une exécution précédente à ne pas dépasser.")
+        parser.add_argument('--tolerance', type=float, default=0.2, help="Marge admise sur la latence de référence (0.2 = +20 %%).")
+
+    def handle(self, *args, **options):
+        try:
+            setup_test_environment()  # Autorise l'hôte « testserver » du client de test
+        except RuntimeError:
+            pass  # Environnement de test déjà en place (appel depuis la suite de tests)
+        self.prepare()
+        results = {}
+        for name in options['scenario'] or SCENARIOS:
+            requests = getattr(self, f'scenario_{name}')()
+            if requests is None:
+                self.stdout.write(self.style.WARNING(f"{name} : données insuffisantes, scénario ignoré."))
+                continue
+            results[name] = self.measure(requests, options['iterations'], options['warmup'], options['cold_cache'])
+            stats = results[name]
+            self.stdout.write(
+                f"{name:32} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+                f"p99 {stats['p99_ms']:8.2f} ms  requêtes SQL {stats['queries']:3}  statut {stats['status']}"
+            )
+
+        report = {
+            'date': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'offers': JobOffer.objects.count(),
+            'iterations': options['iterations'],
+            'cold_cache': options['cold_cache'],
+            'scenarios': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+
+        failures = self.check_limits(results, options)
+        for failure in failures:
+            self.stderr.write(self.style.ERROR(failure))
+        if failures:
+            raise CommandError(f"{len(failures)} régression(s) détectée(s).")
+        self.stdout.write(self.style.SUCCESS("Mesures terminées."))
+
+    # -- Mesure --
+
+    def measure(self, requests, iterations, warmup, cold_cache):
+        for index in range(warmup):
+            requests(index)
+        timings, queries, statuses = [], [], set()
+        for index in range(warmup, warmup + iterations):
+            if cold_cache:
+                cache.clear()
+            with ExitStack() as stack:
+                # Toutes les connexions : les vues de consultation lisent sur la base « replica »
+                captured = [stack.enter_context(CaptureQueriesContext(alias)) for alias in connections.all()]
+                start = time.perf_counter()
+                response = requests(index)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(sum(len(context) for context in captured))
+            statuses.add(response.status_code)
+        timings.sort()
+        return {
+            'p50_ms': round(percentile(timings, 0.50), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'p99_ms': round(percentile(timings, 0.99), 3),
+            'max_ms': round(timings[-1], 3),
+            'queries': max(queries),
+            'status': sorted(statuses)[0] if len(statuses) == 1 else sorted(statuses),
+        }
+
+    def check_limits(self, results, options):
+        failures = []
+        limits = {}
+        if options['thresholds']:
+            with open(options['thresholds']) as f:
+                limits = json.load(f)
+        baseline = {}
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f).get('scenarios', {})
+        for name, stats in results.items():
+            statuses = stats['status'] if isinstance(stats['status'], list) else [stats['status']]
+            if any(status >= 500 for status in statuses):
+                failures.append(f"{name} : erreur serveur (statut {stats['status']})")
+            limit = limits.get(name, {})
+            if 'p95_ms' in limit and stats['p95_ms'] > limit['p95_ms']:
+                failures.append(f"{name} : p95 {stats['p95_ms']} ms > seuil {limit['p95_ms']} ms")
+            if 'queries' in limit and stats['queries'] > limit['queries']:
+                failures.append(f"{name} : {stats['queries']} requêtes SQL > seuil {limit['queries']}")
+            reference = baseline.get(name)
+            if reference:
+                allowed = reference['p95_ms'] * (1 + options['tolerance'])
+                if stats['p95_ms'] > allowed:
+                    failures.append(f"{name} : p95 {stats['p95_ms']} ms > référence {reference['p95_ms']} ms (+{options['tolerance']:.0%})")
+                if stats['queries'] > reference['queries']:
+                    failures.append(f"{name} : {stats['queries']} requêtes SQL > référence {reference['queries']}")
+        return failures
+
+    # -- Scénarios : chacun renvoie une fonction index -> réponse, ou None --
+
+    def prepare(self):
+        self.anonymous = Client(raise_request_exception=False)
+        self.offer_ids = list(
+            JobOffer.objects.filter(is_validated=True).order_by('-created_at', '-id').values_list('pk', flat=True)[:500]
+        )
+        # Utilisateur ayant le plus de messages non lus dans une conversation
+        member = ConversationMember.objects.order_by('-unread_count').values_list('user_id', flat=True).first()
+        self.messaging_client = self._client_for(member)
+        # Utilisateur sans profil candidat, pour le formulaire de création
+        newcomer = User.objects.filter(candidate_profile__isnull=True).order_by('-pk').values_list('pk', flat=True).first()
+        self.newcomer_client = self._client_for(newcomer)
+
+    @staticmethod
+    def _client_for(user_id):
+        if user_id is None:
+            return None
+        client = Client(raise_request_exception=False)
+        client.force_login(User.objects.get(pk=user_id))
+        return client
+
+    def scenario_home(self):
+        url = reverse('home')
+        return lambda index: self.anonymous.get(url)
+
+    def scenario_job_offer_list(self):
+        url = reverse('job_offer_list')
+        return lambda index: self.anonymous.get(url)
+
+    def scenario_job_offer_list_page2(self):
+        page = keyset_paginate(JobOffer.objects.filter(is_validated=True), page_size=settings.JOB_OFFERS_PAGE_SIZE)
+        if not page.has_next:
+            return None
+        url = f"{reverse('job_offer_list')}?cursor={page.next_cursor}"
+        return lambda index: self.anonymous.get(url)
+
+    def scenario_job_offer_search(self):
+        url = reverse('job_offer_list')
+        terms = ['développeur', 'python', 'comptabilité', 'douala', 'ingénieur']
+        return lambda index: self.anonymous.get(url, {'q': terms[index % len(terms)]})
+
+    def scenario_job_offer_detail(self):
+        if not self.offer_ids:
+            return None
+        return lambda index: self.anonymous.get(
+            reverse('job_offer_detail', args=[self.offer_ids[index % len(self.offer_ids)]])
+        )
+
+    def scenario_message_list(self):
+        if self.messaging_client is None:
+            return None
+        url = reverse('message_list')
+        return lambda index: self.messaging_client.get(url)
+
+    def scenario_candidate_profile_create(self):
+        if self.newcomer_client is None:
+            return None
+        url = reverse('candidate_profile_create')
+        return lambda index: self.newcomer_client.get(url)
+
+    def scenario_candidate_profile_create_post(self):
+        # Formulaire invalide (nom manquant) : mesure la validation sans créer de profil
+        if self.newcomer_client is None:
+            return None
+        url = reverse('candidate_profile_create')
+        return lambda index: self.newcomer_client.post(url, {'skills': 'Python, Django', 'years_experience': 2})
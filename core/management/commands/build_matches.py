@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.matching import engine
+
+
+class Command(BaseCommand):
+    help = "Recalcule toute la matrice de correspondance candidats/offres."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Nombre de candidats par lot.")
+
+    def handle(self, *args, **options):
+        stored = engine.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{stored} scores de correspondance enregistrés."))
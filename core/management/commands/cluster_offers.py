@@ -0,0 +1,142 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core import dedup
+from core.models import JobOffer, LSHBucket, OfferCluster, OfferSignature
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcule les signatures MinHash manquantes puis regroupe les offres quasi identiques "
+        "(collisions LSH vérifiées par similarité) pour la modération en masse."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Nombre d'offres par lot.")
+
+    def handle(self, *args, **options):
+        computed = self.compute_missing(options['batch_size'])
+        signatures = {pk: dedup.from_bytes(data) for pk, data in OfferSignature.objects.values_list('pk', 'minhash').iterator()}
+        parent, best = self.link(signatures)
+
+        components = defaultdict(list)
+        for pk in parent:
+            components[self.find(parent, pk)].append(pk)
+        groups = [sorted(members) for members in components.values() if len(members) > 1]
+        created = self.save(groups, best)
+        self.stdout.write(self.style.SUCCESS(
+            f"{computed} signatures calculées, {len(signatures)} offres comparées, "
+            f"{len(groups)} groupes de doublons ({created} nouveaux)."
+        ))
+
+    def compute_missing(self, batch_size):
+        computed = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                JobOffer.objects.filter(pk__gt=last_pk, signature__isnull=True).order_by('pk')
+                .values_list('pk', 'title', 'description')[:batch_size]
+            )
+            if not batch:
+                return computed
+            signatures, buckets = [], []
+            now = timezone.now()
+            for pk, title, description in batch:
+                text = dedup.offer_text(title, description)
+                signature = dedup.minhash(text)
+                if signature is None:
+                    continue
+                reasons = dedup.content_spam_reasons(text)
+                signatures.append(OfferSignature(
+                    job_offer_id=pk, minhash=signature.tobytes(), is_spam=bool(reasons),
+                    spam_reasons=', '.join(reasons)[:255], computed_at=now,
+                ))
+                buckets.extend(LSHBucket(key=key, job_offer_id=pk) for key in dedup.band_keys(signature))
+            with transaction.atomic():
+                LSHBucket.objects.filter(job_offer_id__in=[pk for pk, _, _ in batch]).delete()
+                OfferSignature.objects.bulk_create(signatures, batch_size=500)
+                LSHBucket.objects.bulk_create(buckets, batch_size=500)
+            computed += len(signatures)
+            last_pk = batch[-1][0]
+            self.stdout.write(f"{computed} signatures calculées…")
+
+    def link(self, signatures):
+        """Union-find sur les paires d'un même seau dont la similarité atteint DEDUP_THRESHOLD."""
+        parent = {}
+        best = {}  # pk -> (offre la plus proche, similarité)
+        checked = set()
+
+        def compare(first, second):
+            pair = (first, second) if first < second else (second, first)
+            if pair in checked:
+                return
+            checked.add(pair)
+            score = dedup.similarity(signatures[first], signatures[second])
+            if score < settings.DEDUP_THRESHOLD:
+                return
+            for pk, other in ((first, second), (second, first)):
+                parent.setdefault(pk, pk)
+                if score > best.get(pk, (None, 0.0))[1]:
+                    best[pk] = (other, score)
+            root_first, root_second = self.find(parent, first), self.find(parent, second)
+            if root_first != root_second:
+                parent[max(root_first, root_second)] = min(root_first, root_second)
+
+        current_key, members = None, []
+        rows = LSHBucket.objects.order_by('key', 'job_offer_id').values_list('key', 'job_offer_id').iterator(chunk_size=5000)
+        for key, pk in rows:
+            if key != current_key:
+                current_key, members = key, []
+            if pk not in signatures:
+                continue
+            # Seaux très peuplés : comparaison limitée aux DEDUP_MAX_CANDIDATES premiers membres
+            for other in members:
+                compare(other, pk)
+            if len(members) < settings.DEDUP_MAX_CANDIDATES:
+                members.append(pk)
+        return parent, best
+
+    @staticmethod
+    def find(parent, pk):
+        root = pk
+        while parent[root] != root:
+            root = parent[root]
+        while parent[pk] != root:
+            parent[pk], pk = root, parent[pk]
+        return root
+
+    @transaction.atomic
+    def save(self, groups, best):
+        # Les groupes encore à examiner sont recalculés ; les groupes déjà tranchés sont conservés
+        # et accueillent leurs nouveaux membres, qui les renvoient en examen.
+        OfferSignature.objects.filter(cluster__status='pending').update(cluster=None)
+        OfferCluster.objects.filter(status='pending').delete()
+        existing = dict(OfferSignature.objects.filter(cluster__isnull=False).values_list('pk', 'cluster_id'))
+
+        created = 0
+        assignments = {}
+        reopened = set()
+        for members in groups:
+            cluster_id = next((existing[pk] for pk in members if pk in existing), None)
+            new_members = [pk for pk in members if pk not in existing]
+            if not new_members:
+                continue
+            if cluster_id is None:
+                cluster_id = OfferCluster.objects.create().pk
+                created += 1
+            else:
+                reopened.add(cluster_id)
+            for pk in new_members:
+                assignments[pk] = cluster_id
+
+        OfferCluster.objects.filter(pk__in=reopened).update(status='pending', updated_at=timezone.now())
+        rows = list(OfferSignature.objects.filter(pk__in=list(best)).only('pk', 'cluster_id', 'duplicate_of_id', 'similarity'))
+        for row in rows:
+            row.cluster_id = assignments.get(row.pk, row.cluster_id)
+            row.duplicate_of_id, row.similarity = best[row.pk]
+        OfferSignature.objects.bulk_update(rows, ['cluster', 'duplicate_of', 'similarity'], batch_size=500)
+        return created
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core import feeds
+from core.models import JobOffer
+
+
+class Command(BaseCommand):
+    help = "Exporte les offres d'emploi en JSONL ou CSV, en flux, sans charger toute la table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=feeds.FORMATS, default='jsonl')
+        parser.add_argument('--output', help="Fichier de sortie (sortie standard par défaut).")
+        parser.add_argument('--source', help="N'exporte que les offres de ce partenaire.")
+        parser.add_argument('--all', action='store_true', help="Inclut les offres non validées.")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Offres lues par requête.")
+
+    def handle(self, *args, **options):
+        offers = JobOffer.objects.all() if options['all'] else JobOffer.objects.filter(is_validated=True)
+        if options['source'] is not None:
+            offers = offers.filter(source=options['source'])
+        lines = feeds.serialize(feeds.iter_offers(offers, options['chunk_size']), options['format'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,139 @@
+import json
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import caching, facets, feeds, salary, search, tasks
+from core.models import Category, JobOffer
+
+# Champs remplacés quand une offre déjà importée réapparaît dans le flux (la validation est conservée)
+UPDATE_FIELDS = [
+    'title', 'description', 'category', 'location', 'salary', 'experience_required',
+    'location_normalized', 'experience_years', *salary.FIELDS, 'updated_at',
+]
+
+
+class Command(BaseCommand):
+    help = "Importe un flux d'offres partenaire (JSONL ou CSV) par lots, avec reprise sur point de contrôle."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier JSONL ou CSV.")
+        parser.add_argument('--source', required=True, help="Nom du partenaire ; (source, external_id) identifie une offre.")
+        parser.add_argument('--owner', required=True, help="Nom d'utilisateur du recruteur propriétaire des offres.")
+        parser.add_argument('--format', choices=feeds.FORMATS, help="Format du fichier (déduit de l'extension par défaut).")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Enregistrements par transaction.")
+        parser.add_argument('--validate', action='store_true', help="Publie directement les nouvelles offres (partenaire de confiance).")
+        parser.add_argument('--checkpoint', help="Fichier de point de contrôle (par défaut : <path>.checkpoint).")
+        parser.add_argument('--restart', action='store_true', help="Ignore le point de contrôle existant.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            fmt = options['format'] or feeds.guess_format(path)
+        except ValueError as exc:
+            raise CommandError(exc)
+        try:
+            self.owner = User.objects.get(username=options['owner'])
+        except User.DoesNotExist:
+            raise CommandError(f"Utilisateur inconnu : {options['owner']}")
+        self.source = options['source']
+        self.validate = options['validate']
+        self.categories = dict(Category.objects.values_list('name', 'pk'))
+
+        checkpoint_path = options['checkpoint'] or f"{path}.checkpoint"
+        done = 0
+        if os.path.exists(checkpoint_path) and not options['restart']:
+            with open(checkpoint_path) as f:
+                done = json.load(f)['records']
+            self.stdout.write(f"Reprise après l'enregistrement {done}.")
+
+        created = updated = errors = 0
+        batch = {}
+        last_number = done
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            for number, record, error in feeds.read_records(stream, fmt):
+                if number <= done:
+                    continue
+                last_number = number
+                if error is None:
+                    try:
+                        fields, category = feeds.offer_fields(record)
+                    except ValueError as exc:
+                        error = str(exc)
+                if error is not None:
+                    errors += 1
+                    self.stderr.write(f"Enregistrement {number} ignoré : {error}")
+                    continue
+                fields['category_id'] = self.category_id(category)
+                batch[fields['external_id']] = fields  # Doublon dans le lot : la dernière version l'emporte
+                if len(batch) >= options['batch_size']:
+                    batch_created, batch_updated = self.flush(batch)
+                    created += batch_created
+                    updated += batch_updated
+                    self.save_checkpoint(checkpoint_path, last_number)
+                    self.stdout.write(
+                        f"{last_number} enregistrements lus, {created} offres créées, {updated} mises à jour…"
+                    )
+                    batch = {}
+        if batch:
+            batch_created, batch_updated = self.flush(batch)
+            created += batch_created
+            updated += batch_updated
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)  # Import terminé : un nouvel appel repartira du début
+        self.stdout.write(self.style.SUCCESS(
+            f"{last_number} enregistrements lus, {created} offres créées, {updated} mises à jour, {errors} erreurs."
+        ))
+
+    def category_id(self, name):
+        if not name:
+            return None
+        if name not in self.categories:
+            self.categories[name] = Category.objects.get_or_create(name=name[:100])[0].pk
+        return self.categories[name]
+
+    def flush(self, batch):
+        """Insère ou met à jour un lot dans une transaction ; renvoie (offres créées, offres mises à jour)."""
+        now = timezone.now()
+        with transaction.atomic():
+            in_batch = JobOffer.objects.filter(source=self.source, external_id__in=list(batch))
+            existing = set(in_batch.values_list('external_id', flat=True))
+            facets_before, _ = facets.snapshot(in_batch)
+            JobOffer.objects.bulk_create(
+                [
+                    JobOffer(
+                        source=self.source, created_by=self.owner, is_validated=self.validate, updated_at=now,
+                        **fields, **facets.derived_fields(fields['location'], fields['experience_required']),
+                        **salary.parse_salary(fields['salary']),
+                    )
+                    for fields in batch.values()
+                ],
+                update_conflicts=True,
+                unique_fields=['source', 'external_id'],
+                update_fields=UPDATE_FIELDS,
+            )
+            offers = list(
+                JobOffer.objects.filter(source=self.source, external_id__in=list(batch))
+                .values_list('pk', 'external_id', 'is_validated')
+            )
+            # bulk_create n'émet pas de signaux : index, cache, facettes et correspondances sont mis à jour ici
+            facets.apply_change(facets_before, *facets.snapshot(in_batch))
+            pks = [pk for pk, _, _ in offers]
+            transaction.on_commit(lambda: search.index_offers(pks))
+            transaction.on_commit(lambda: caching.invalidate_offers(pks))
+            published = {pk for pk, external_id, validated in offers if validated and external_id not in existing}
+            tasks.enqueue_many('notifications.offer_validated', [{'offer_id': pk} for pk in sorted(published)])
+            tasks.enqueue_many('matching.refresh_offer', [{'offer_id': pk} for pk in pks if pk not in published])
+            tasks.enqueue_many('dedup.check_offer', [{'offer_id': pk} for pk in pks])
+        return len(batch) - len(existing), len(existing)
+
+    @staticmethod
+    def save_checkpoint(path, records):
+        # Écrit après la validation du lot : au pire, un lot est rejoué (sans doublon grâce à external_id)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'records': records}, f)
+        os.replace(tmp, path)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from core import caching, facets
+from core.models import JobOffer
+
+
+class Command(BaseCommand):
+    help = "Recalcule les villes et niveaux d'expérience normalisés des offres, puis les compteurs de facettes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Nombre d'offres par lot.")
+
+    def handle(self, *args, **options):
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                JobOffer.objects.filter(pk__gt=last_pk).order_by('pk')
+                .only('pk', 'location', 'experience_required', 'location_normalized', 'experience_years')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            changed = []
+            for offer in batch:
+                fields = facets.derived_fields(offer.location, offer.experience_required)
+                if any(getattr(offer, field) != value for field, value in fields.items()):
+                    for field, value in fields.items():
+                        setattr(offer, field, value)
+                    changed.append(offer)
+            JobOffer.objects.bulk_update(changed, ['location_normalized', 'experience_years'], batch_size=500)
+            updated += len(changed)
+            last_pk = batch[-1].pk
+
+        count = facets.rebuild()
+        caching.invalidate_offers()
+        self.stdout.write(self.style.SUCCESS(f"{updated} offres renormalisées, {count} valeurs de facette."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Reconstruit entièrement l'index de recherche des offres d'emploi."
+
+    def handle(self, *args, **options):
+        search.get_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS("Index de recherche reconstruit."))
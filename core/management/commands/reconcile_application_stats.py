@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import ApplicationStats, JobOffer
+from core.stats import COUNT_FIELDS, compute
+
+
+class Command(BaseCommand):
+    help = "Recalcule les statistiques de candidatures en une passe et signale les écarts avec les compteurs incrémentaux."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Signale les écarts sans les corriger.")
+
+    def handle(self, *args, **options):
+        expected = compute()
+        owners = dict(JobOffer.objects.values_list('pk', 'created_by_id'))
+        current = {row.pk: row for row in ApplicationStats.objects.all()}
+
+        to_create, to_update, to_delete = [], [], []
+        for pk, counts in expected.items():
+            row = current.get(pk)
+            if row is None:
+                to_create.append(ApplicationStats(job_offer_id=pk, recruiter_id=owners[pk], **counts))
+                self.report(pk, None, counts)
+            elif any(getattr(row, field) != counts[field] for field in COUNT_FIELDS) or row.recruiter_id != owners[pk]:
+                self.report(pk, {field: getattr(row, field) for field in COUNT_FIELDS}, counts)
+                for field, value in counts.items():
+                    setattr(row, field, value)
+                row.recruiter_id = owners[pk]
+                to_update.append(row)
+        for pk, row in current.items():
+            if pk not in expected and any(getattr(row, field) for field in COUNT_FIELDS):
+                self.report(pk, {field: getattr(row, field) for field in COUNT_FIELDS}, None)
+                to_delete.append(pk)
+
+        drift = len(to_create) + len(to_update) + len(to_delete)
+        if drift and not options['dry_run']:
+            with transaction.atomic():
+                ApplicationStats.objects.bulk_create(to_create, batch_size=500)
+                ApplicationStats.objects.bulk_update(to_update, list(COUNT_FIELDS) + ['recruiter'], batch_size=500)
+                for start in range(0, len(to_delete), 500):
+                    ApplicationStats.objects.filter(pk__in=to_delete[start:start + 500]).delete()
+        style = self.style.WARNING if drift else self.style.SUCCESS
+        action = "à corriger" if options['dry_run'] else "corrigées"
+        self.stdout.write(style(f"{len(expected)} offres avec candidatures, {drift} lignes en écart {action}."))
+
+    def report(self, pk, stored, expected):
+        self.stdout.write(f"Offre {pk} : enregistré {stored or '-'}, attendu {expected or '-'}")
@@ -0,0 +1,50 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import realtime, tasks
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches d'arrière-plan en file (notifications, correspondances…)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help="Taille du pool de threads.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Attente (s) quand la file est vide.")
+        parser.add_argument('--stale-after', type=int, default=600, help="Délai (s) avant de reprendre une tâche bloquée.")
+        parser.add_argument('--once', action='store_true', help="Vide la file puis s'arrête.")
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        stale_after = timedelta(seconds=options['stale_after'])
+        requeued = tasks.requeue_stale(stale_after)
+        if requeued:
+            self.stdout.write(f"{requeued} tâche(s) bloquée(s) remise(s) en file.")
+
+        in_flight = set()
+        processed = 0
+        next_purge = 0.0
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='run_tasks') as pool:
+            try:
+                while True:
+                    if time.monotonic() >= next_purge:
+                        # Événements temps réel déjà relayés (aucun processus web ne les purge)
+                        realtime.purge_relay()
+                        next_purge = time.monotonic() + settings.REALTIME_RELAY_RETENTION
+                    free = threads - len(in_flight)
+                    claimed = tasks.claim(free) if free else []
+                    for queued_task in claimed:
+                        in_flight.add(pool.submit(tasks.run, queued_task))
+                    if in_flight:
+                        done, in_flight = wait(in_flight, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                        processed += len(done)
+                    elif options['once']:
+                        break
+                    else:
+                        time.sleep(options['poll_interval'])
+            except KeyboardInterrupt:
+                self.stdout.write("Arrêt demandé, fin des tâches en cours…")
+        self.stdout.write(self.style.SUCCESS(f"{processed} tâche(s) exécutée(s)."))
@@ -0,0 +1,268 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core import caching, facets, ranking, salary, search, stats
+from core.matching import engine
+from core.models import (
+    Application, CandidateProfile, Category, Conversation, ConversationMember, JobOffer, Mailbox, Message,
+    Notification, RecruiterProfile, Skill,
+)
+
+CITIES = ['Douala', 'Yaoundé', 'Bafoussam', 'Garoua', 'Bamenda', 'Kribi', 'Limbé', 'Ngaoundéré', 'Maroua', 'Bertoua']
+CATEGORIES = ['Informatique', 'Finance', 'Santé', 'Éducation', 'Commerce', 'BTP', 'Logistique', 'Marketing']
+JOBS = [
+    'Développeur {skill}', 'Ingénieur {skill}', 'Stagiaire {skill}', 'Chef de projet {skill}',
+    'Consultant {skill}', 'Technicien {skill}', 'Responsable {skill}', 'Formateur {skill}',
+]
+FIRST_NAMES = ['Aïcha', 'Jean', 'Marie', 'Paul', 'Estelle', 'Brice', 'Nadège', 'Hervé', 'Clarisse', 'Yannick']
+LAST_NAMES = ['Nkoulou', 'Mbarga', 'Fotso', 'Ndongo', 'Tchoua', 'Ebogo', 'Kamga', 'Atangana', 'Njoya', 'Manga']
+WORDS = (
+    "poste équipe projet client mission expérience compétences autonomie rigueur analyse gestion "
+    "développement suivi qualité reporting formation terrain outils communication organisation"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Génère des données synthétiques réalistes (utilisateurs, offres, candidatures, messages…) pour les mesures de performance."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=10000)
+        parser.add_argument('--recruiters', type=int, default=1000)
+        parser.add_argument('--offers', type=int, default=100000)
+        parser.add_argument('--applications', type=int, default=200000)
+        parser.add_argument('--messages', type=int, default=1000000)
+        parser.add_argument('--conversations', type=int, default=50000)
+        parser.add_argument('--notifications', type=int, default=200000)
+        parser.add_argument('--batch-size', type=int, default=5000, help="Lignes par insertion.")
+        parser.add_argument('--seed', type=int, default=42, help="Graine du générateur (données reproductibles).")
+        parser.add_argument('--prefix', default='seed', help="Préfixe des noms d'utilisateur créés.")
+        parser.add_argument('--matches', action='store_true', help="Recalcule aussi la matrice de correspondance.")
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.skills = list(Skill.objects.values_list('name', flat=True)) or ['Python', 'Django', 'Comptabilité']
+
+        categories = self.seed_categories()
+        recruiters = self.seed_users(options['prefix'], 'recruiter', options['recruiters'])
+        candidates = self.seed_users(options['prefix'], 'candidate', options['candidates'])
+        self.seed_recruiter_profiles(recruiters)
+        profiles = self.seed_candidate_profiles(candidates)
+        offers = self.seed_offers(options['offers'], recruiters, categories)
+        applications = self.seed_applications(options['applications'], profiles, offers)
+        self.seed_messages(options['messages'], options['conversations'], recruiters + candidates)
+        self.seed_notifications(options['notifications'], candidates, offers, applications)
+
+        # Les insertions en masse n'émettent pas de signaux : structures dérivées reconstruites en une passe
+        self.stdout.write("Compétences normalisées…")
+        call_command('backfill_skills', stdout=self.stdout)
+        self.stdout.write("Index de recherche…")
+        search.get_backend().rebuild()
+        self.stdout.write("Compteurs de facettes…")
+        facets.rebuild()
+        self.stdout.write("Statistiques de candidatures…")
+        stats.rebuild()
+        ranking.rebuild()
+        caching.invalidate_offers()
+        if options['matches']:
+            self.stdout.write("Matrice de correspondance…")
+            engine.rebuild()
+        self.stdout.write(self.style.SUCCESS("Données générées."))
+
+    # -- Outils --
+
+    def insert(self, model, rows, label):
+        """Insère `rows` (itérable d'instances) par lots et renvoie les identifiants créés."""
+        pks, batch = [], []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                pks.extend(self._flush(model, batch))
+                batch = []
+        if batch:
+            pks.extend(self._flush(model, batch))
+        self.stdout.write(f"{len(pks)} {label}")
+        return pks
+
+    def _flush(self, model, batch):
+        with transaction.atomic():
+            return [obj.pk for obj in model.objects.bulk_create(batch)]
+
+    def past(self, days=365):
+        return self.now - timedelta(seconds=self.random.randrange(days * 86400))
+
+    def sentence(self, words):
+        return ' '.join(self.random.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    # -- Générateurs --
+
+    def seed_categories(self):
+        for name in CATEGORIES:
+            Category.objects.get_or_create(name=name)
+        return list(Category.objects.values_list('pk', flat=True))
+
+    def seed_users(self, prefix, role, count):
+        start = User.objects.filter(username__startswith=f"{prefix}_{role}_").count()
+        password = make_password('benchmark')  # Un seul hachage pour tous les comptes
+        return self.insert(User, (
+            User(
+                username=f"{prefix}_{role}_{start + i}", email=f"{prefix}_{role}_{start + i}@example.com",
+                password=password, date_joined=self.past(),
+            )
+            for i in range(count)
+        ), f"utilisateurs ({role})")
+
+    def seed_recruiter_profiles(self, user_ids):
+        self.insert(RecruiterProfile, (
+            RecruiterProfile(
+                user_id=pk, company_name=f"Entreprise {pk}", is_validated=self.random.random() < 0.8,
+                company_description=self.sentence(20),
+            )
+            for pk in user_ids
+        ), "profils recruteurs")
+
+    def seed_candidate_profiles(self, user_ids):
+        def profile(pk):
+            skills = self.random.sample(self.skills, min(len(self.skills), self.random.randint(2, 6)))
+            return CandidateProfile(
+                user_id=pk,
+                full_name=f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}",
+                skills=', '.join(skills),
+                years_experience=self.random.choice([0, 0, 1, 2, 3, 5, 8, 12]),
+                education=self.sentence(8),
+                created_at=self.past(),
+            )
+        return self.insert(CandidateProfile, (profile(pk) for pk in user_ids), "profils candidats")
+
+    def seed_offers(self, count, recruiters, categories):
+        def offer():
+            skill = self.random.choice(self.skills)
+            location = self.random.choice(CITIES)
+            experience = f"{self.random.choice([0, 1, 2, 3, 5])} ans"
+            pay = f"{self.random.randrange(100, 1500) * 1000:,} FCFA/mois".replace(',', ' ')
+            return JobOffer(
+                title=self.random.choice(JOBS).format(skill=skill),
+                description=f"{self.sentence(40)} Maîtrise de {skill} appréciée. {self.sentence(30)}",
+                category_id=self.random.choice(categories),
+                location=location,
+                salary=pay,
+                experience_required=experience,
+                **facets.derived_fields(location, experience),
+                **salary.parse_salary(pay),
+                created_by_id=self.random.choice(recruiters),
+                is_validated=self.random.random() < 0.9,
+                created_at=self.past(),
+            )
+        return self.insert(JobOffer, (offer() for _ in range(count)), "offres")
+
+    def seed_applications(self, count, profiles, offers):
+        if not profiles or not offers:
+            return []
+        count = min(count, len(profiles) * len(offers))
+        seen = set()
+
+        def applications():
+            while len(seen) < count:
+                pair = (self.random.choice(profiles), self.random.choice(offers))
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                yield Application(
+                    candidate_id=pair[0], job_offer_id=pair[1], applied_at=self.past(),
+                    status=self.random.choice(['pending', 'pending', 'accepted', 'rejected']),
+                )
+        return self.insert(Application, applications(), "candidatures")
+
+    def seed_messages(self, count, conversation_count, users):
+        """Messages répartis en conversations, avec les compteurs dénormalisés de core.messaging."""
+        if count <= 0 or len(users) < 2:
+            return
+        pairs = set()
+        while len(pairs) < min(conversation_count, len(users) * (len(users) - 1) // 2):
+            low, high = sorted(self.random.sample(users, 2))
+            pairs.add((low, high))
+        pairs = sorted(pairs)
+        conversations = self.insert(Conversation, (
+            Conversation(participants_key=f"{low}:{high}") for low, high in pairs
+        ), "conversations")
+        self.insert(ConversationMember, (
+            ConversationMember(conversation_id=conversation, user_id=user, other_user_id=other)
+            for conversation, (low, high) in zip(conversations, pairs)
+            for user, other in ((low, high), (high, low))
+        ), "participants")
+
+        # Messages dans l'ordre chronologique : le dernier écrit est le dernier de sa conversation
+        step = timedelta(days=365) / count
+        start = self.now - timedelta(days=365)
+        last = {}  # conversation -> (pk, date)
+        unread = {}  # (conversation, destinataire) -> nombre de non-lus
+        batch = []
+
+        def flush():
+            self._flush(Message, batch)
+            for message in batch:
+                last[message.conversation_id] = (message.pk, message.sent_at)
+            batch.clear()
+
+        for i in range(count):
+            index = self.random.randrange(len(pairs))
+            sender, recipient = pairs[index] if self.random.random() < 0.5 else pairs[index][::-1]
+            sent_at = start + step * i
+            is_read = sent_at < self.now - timedelta(days=7) or self.random.random() < 0.5
+            if not is_read:
+                key = (conversations[index], recipient)
+                unread[key] = unread.get(key, 0) + 1
+            batch.append(Message(
+                conversation_id=conversations[index], sender_id=sender, recipient_id=recipient,
+                content=self.sentence(self.random.randint(3, 25)), sent_at=sent_at, is_read=is_read,
+            ))
+            if len(batch) >= self.batch_size:
+                flush()
+        if batch:
+            flush()
+        self.stdout.write(f"{count} messages")
+
+        with transaction.atomic():
+            Conversation.objects.bulk_update(
+                [Conversation(pk=pk, last_message_id=message, last_message_at=sent_at) for pk, (message, sent_at) in last.items()],
+                ['last_message', 'last_message_at'], batch_size=1000,
+            )
+            members = list(
+                ConversationMember.objects.filter(conversation__gte=conversations[0], conversation__lte=conversations[-1])
+                .only('pk', 'conversation_id', 'user_id')
+            )
+            members = [member for member in members if member.conversation_id in last]
+            for member in members:
+                member.last_message_at = last[member.conversation_id][1]
+                member.unread_count = unread.get((member.conversation_id, member.user_id), 0)
+            ConversationMember.objects.bulk_update(members, ['last_message_at', 'unread_count'], batch_size=1000)
+            totals = {}
+            for (_, user), value in unread.items():
+                totals[user] = totals.get(user, 0) + value
+            # Comptes tout juste créés : aucune boîte existante
+            Mailbox.objects.bulk_create(
+                [Mailbox(user_id=user, unread_count=totals.get(user, 0)) for user in users], batch_size=1000
+            )
+
+    def seed_notifications(self, count, users, offers, applications):
+        if not users:
+            return
+        self.insert(Notification, (
+            Notification(
+                user_id=self.random.choice(users),
+                content=self.sentence(10),
+                is_read=self.random.random() < 0.7,
+                created_at=self.past(),
+                related_offer_id=self.random.choice(offers) if offers and self.random.random() < 0.7 else None,
+                related_application_id=self.random.choice(applications) if applications and self.random.random() < 0.2 else None,
+            )
+            for _ in range(count)
+        ), "notifications")
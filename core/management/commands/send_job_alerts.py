@@ -0,0 +1,31 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import alerts
+
+
+class Command(BaseCommand):
+    help = "Écrit les notifications et envoie les e-mails d'alertes emploi de la période écoulée ; relançable après interruption."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--frequency', choices=['daily', 'weekly'], default='daily',
+                            help="daily : offres de la veille ; weekly : des 7 derniers jours (à lancer une fois par semaine).")
+        parser.add_argument('--date', help="Jour d'exécution AAAA-MM-JJ (par défaut aujourd'hui) ; la période se termine à son début.")
+        parser.add_argument('--no-email', action='store_true', help="Écrit les notifications sans envoyer les e-mails.")
+
+    def handle(self, *args, **options):
+        try:
+            day = datetime.date.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError("Date invalide, format attendu : AAAA-MM-JJ.")
+        frequency = options['frequency']
+
+        added = alerts.build_digests(frequency, day)
+        self.stdout.write(f"{added} candidat(s) notifié(s) pour la période se terminant le {day}.")
+        if options['no_email']:
+            return
+        sent, skipped, failed = alerts.send_digests(frequency, day)
+        style = self.style.WARNING if failed else self.style.SUCCESS
+        self.stdout.write(style(f"{sent} e-mail(s) envoyé(s), {skipped} sans adresse, {failed} en échec définitif."))
@@ -0,0 +1,313 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .tasks import task
+from .text import tokenize
+
+# Moteur de correspondance candidats <-> offres.
+# Chaque profil (compétences) et chaque offre (titre, catégorie, description) devient un
+# vecteur TF-IDF creux normalisé ; le score est le cosinus entre les deux, pondéré par
+# l'expérience. Les deux matrices sont tenues en mémoire sous forme de listes inversées
+# (terme -> {id: poids}) : le produit d'une ligne par la matrice ne parcourt que les
+# colonnes qui partagent au moins un terme. Les scores utiles (>= MATCHING_MIN_SCORE)
+# sont persistés dans MatchScore et seule la ligne ou la colonne de l'entité modifiée
+# est recalculée à l'enregistrement, par le worker de tâches (commande run_tasks).
+
+STOPWORDS = frozenset(
+    "a au aux avec ce ces dans de des du en et il la le les leur ou par pas pour qui que "
+    "sa se ses son sur un une vous nous est sont etre avoir the and of to in for with on".split()
+)
+
+EXPERIENCE_RE = re.compile(r"(\d+)")
+
+
+def _terms(text, weight=1.0, counts=None):
+    counts = Counter() if counts is None else counts
+    for token in tokenize(text):
+        if len(token) > 1 and token not in STOPWORDS:
+            counts[token] += weight
+    return counts
+
+
+def candidate_terms(skills):
+    return _terms((skills or '').replace(',', ' '))
+
+
+def offer_terms(title, description, experience_required, category):
+    counts = _terms(title, 3.0)
+    _terms(category, 2.0, counts)
+    _terms(experience_required, 1.0, counts)
+    _terms(description, 1.0, counts)
+    return counts
+
+
+def required_years(experience_required):
+    match = EXPERIENCE_RE.search(experience_required or '')
+    return int(match.group(1)) if match else 0
+
+
+def experience_factor(years, required):
+    # Pas de pénalité si l'expérience est suffisante, pénalité progressive sinon
+    if years >= required:
+        return 1.0
+    return (years + 1) / (required + 1)
+
+
+class SparseMatrix:
+    """Lignes creuses normalisées indexées aussi par colonne (terme)."""
+
+    def __init__(self):
+        self.rows = {}
+        self.postings = defaultdict(dict)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def upsert(self, pk, vector):
+        self.remove(pk)
+        if not vector:
+            return
+        self.rows[pk] = vector
+        for term, weight in vector.items():
+            self.postings[term][pk] = weight
+
+    def remove(self, pk):
+        for term in self.rows.pop(pk, {}):
+            column = self.postings.get(term)
+            if column is not None:
+                column.pop(pk, None)
+                if not column:
+                    del self.postings[term]
+
+    def dot(self, vector):
+        """Produit matrice x vecteur : {id: score} pour les lignes partageant un terme."""
+        scores = defaultdict(float)
+        for term, weight in vector.items():
+            for pk, other in self.postings.get(term, {}).items():
+                scores[pk] += weight * other
+        return scores
+
+
+class MatchingEngine:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self.offers = SparseMatrix()
+        self.candidates = SparseMatrix()
+        self.offer_years = {}
+        self.candidate_years = {}
+        self.document_frequency = Counter()
+        self.document_count = 0
+
+    # -- vecteurs -------------------------------------------------------------
+
+    def _weigh(self, counts):
+        total = self.document_count + 1
+        vector = {}
+        for term, count in counts.items():
+            idf = math.log(total / (1 + self.document_frequency[term])) + 1
+            vector[term] = (1 + math.log(count)) * idf
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+    def _set_offer(self, pk, counts, years):
+        self._forget(self.offers, pk)
+        if counts:
+            self.document_frequency.update(counts.keys())
+            self.document_count += 1
+        self.offers.upsert(pk, self._weigh(counts))
+        self.offer_years[pk] = years
+
+    def _set_candidate(self, pk, counts, years):
+        self._forget(self.candidates, pk)
+        if counts:
+            self.document_frequency.update(counts.keys())
+            self.document_count += 1
+        self.candidates.upsert(pk, self._weigh(counts))
+        self.candidate_years[pk] = years
+
+    def _forget(self, matrix, pk):
+        previous = matrix.rows.get(pk)
+        if previous:
+            self.document_frequency.subtract(previous.keys())
+            self.document_count -= 1
+        matrix.remove(pk)
+
+    # -- chargement -----------------------------------------------------------
+
+    def ensure_built(self):
+        with self._lock:
+            if not self._built:
+                self._load()
+                self._built = True
+
+    def _load(self):
+        from .models import CandidateProfile, JobOffer
+
+        offers = {}
+        for pk, title, description, experience, category in (
+            JobOffer.objects.filter(is_validated=True)
+            .values_list('pk', 'title', 'description', 'experience_required', 'category__name')
+            .iterator(chunk_size=2000)
+        ):
+            offers[pk] = (offer_terms(title, description, experience, category), required_years(experience))
+        candidates = {
+            pk: (candidate_terms(skills), years)
+            for pk, skills, years in CandidateProfile.objects.values_list(
+                'pk', 'skills', 'years_experience'
+            ).iterator(chunk_size=2000)
+        }
+        # Fréquences documentaires calculées une fois avant la pondération
+        self.document_frequency = Counter()
+        for counts, _ in list(offers.values()) + list(candidates.values()):
+            self.document_frequency.update(counts.keys())
+        self.document_count = len(offers) + len(candidates)
+        self.offers, self.candidates = SparseMatrix(), SparseMatrix()
+        for pk, (counts, years) in offers.items():
+            self.offers.upsert(pk, self._weigh(counts))
+            self.offer_years[pk] = years
+        for pk, (counts, years) in candidates.items():
+            self.candidates.upsert(pk, self._weigh(counts))
+            self.candidate_years[pk] = years
+
+    # -- scores ---------------------------------------------------------------
+
+    def offer_scores(self, candidate_id):
+        """Ligne de la matrice des scores : {offer_id: score} pour un candidat."""
+        vector = self.candidates.rows.get(candidate_id)
+        if not vector:
+            return {}
+        years = self.candidate_years.get(candidate_id, 0)
+        scores = self.offers.dot(vector)
+        return {
+            pk: score * experience_factor(years, self.offer_years.get(pk, 0))
+            for pk, score in scores.items()
+        }
+
+    def candidate_scores(self, offer_id):
+        """Colonne de la matrice des scores : {candidate_id: score} pour une offre."""
+        vector = self.offers.rows.get(offer_id)
+        if not vector:
+            return {}
+        required = self.offer_years.get(offer_id, 0)
+        scores = self.candidates.dot(vector)
+        return {
+            pk: score * experience_factor(self.candidate_years.get(pk, 0), required)
+            for pk, score in scores.items()
+        }
+
+    # -- mises à jour incrémentales -------------------------------------------
+
+    def refresh_candidate(self, candidate_id):
+        from .models import CandidateProfile, MatchScore
+
+        with self._lock:
+            self.ensure_built()
+            row = CandidateProfile.objects.filter(pk=candidate_id).values_list('skills', 'years_experience').first()
+            if row is None:
+                self._forget(self.candidates, candidate_id)
+                return
+            self._set_candidate(candidate_id, candidate_terms(row[0]), row[1])
+            scores = self.offer_scores(candidate_id)
+        with transaction.atomic():
+            MatchScore.objects.filter(candidate_id=candidate_id).delete()
+            MatchScore.objects.bulk_create(
+                [
+                    MatchScore(candidate_id=candidate_id, job_offer_id=offer_id, score=score)
+                    for offer_id, score in scores.items()
+                    if score >= settings.MATCHING_MIN_SCORE
+                ],
+                batch_size=500,
+            )
+
+    def refresh_offer(self, offer_id):
+        from .models import JobOffer, MatchScore
+
+        with self._lock:
+            self.ensure_built()
+            row = (
+                JobOffer.objects.filter(pk=offer_id, is_validated=True)
+                .values_list('title', 'description', 'experience_required', 'category__name')
+                .first()
+            )
+            if row is None:
+                self._forget(self.offers, offer_id)
+                scores = {}
+            else:
+                title, description, experience, category = row
+                self._set_offer(offer_id, offer_terms(title, description, experience, category), required_years(experience))
+                scores = self.candidate_scores(offer_id)
+        with transaction.atomic():
+            MatchScore.objects.filter(job_offer_id=offer_id).delete()
+            MatchScore.objects.bulk_create(
+                [
+                    MatchScore(candidate_id=candidate_id, job_offer_id=offer_id, score=score)
+                    for candidate_id, score in scores.items()
+                    if score >= settings.MATCHING_MIN_SCORE
+                ],
+                batch_size=500,
+            )
+
+    def rebuild(self, batch_size=500):
+        """Recalcule toute la matrice des scores, par lots de candidats. Renvoie le nombre de paires."""
+        from .models import MatchScore
+
+        with self._lock:
+            self._load()
+            self._built = True
+            candidate_ids = sorted(self.candidates.rows)
+        MatchScore.objects.all().delete()
+        stored = 0
+        for start in range(0, len(candidate_ids), batch_size):
+            batch = []
+            for candidate_id in candidate_ids[start:start + batch_size]:
+                batch.extend(
+                    MatchScore(candidate_id=candidate_id, job_offer_id=offer_id, score=score)
+                    for offer_id, score in self.offer_scores(candidate_id).items()
+                    if score >= settings.MATCHING_MIN_SCORE
+                )
+            with transaction.atomic():
+                MatchScore.objects.bulk_create(batch, batch_size=500)
+            stored += len(batch)
+        return stored
+
+
+engine = MatchingEngine()
+
+
+@task('matching.refresh_offer')
+def refresh_offer_task(payload, queued_task=None):
+    engine.refresh_offer(payload['offer_id'])
+
+
+@task('matching.refresh_candidate')
+def refresh_candidate_task(payload, queued_task=None):
+    engine.refresh_candidate(payload['candidate_id'])
+
+
+def top_offers_for_candidate(candidate, k=None):
+    from .models import MatchScore
+
+    k = k or settings.MATCHING_TOP_K
+    return list(
+        MatchScore.objects.filter(candidate=candidate, job_offer__is_validated=True)
+        .select_related('job_offer', 'job_offer__category')
+        .order_by('-score')[:k]
+    )
+
+
+def top_candidates_for_offer(job_offer, k=None):
+    from .models import MatchScore
+
+    k = k or settings.MATCHING_TOP_K
+    return list(
+        MatchScore.objects.filter(job_offer=job_offer)
+        .select_related('candidate')
+        .order_by('-score')[:k]
+    )
+
@@ -0,0 +1,91 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import archive, realtime
+from .models import Conversation, ConversationMember, Mailbox, Message
+from .pagination import KeysetPage, decode_cursor, encode_cursor, keyset_paginate
+
+# Messagerie : conversations à deux et compteurs de non-lus dénormalisés.
+# Toute écriture passe par send_message() / mark_conversation_read() pour garder
+# Conversation.last_message, ConversationMember.unread_count et Mailbox.unread_count cohérents.
+
+
+def participants_key(user_a, user_b):
+    low, high = sorted((user_a.pk, user_b.pk))
+    return f"{low}:{high}"
+
+
+def get_or_create_conversation(user_a, user_b):
+    conversation, created = Conversation.objects.get_or_create(participants_key=participants_key(user_a, user_b))
+    if created:
+        ConversationMember.objects.bulk_create(
+            [
+                ConversationMember(conversation=conversation, user=user, other_user=other)
+                for user, other in ((user_a, user_b), (user_b, user_a))
+            ],
+            ignore_conflicts=True,
+        )
+    return conversation
+
+
+@transaction.atomic
+def send_message(sender, recipient, content):
+    conversation = get_or_create_conversation(sender, recipient)
+    message = Message.objects.create(
+        conversation=conversation, sender=sender, recipient=recipient, content=content, sent_at=timezone.now()
+    )
+    Conversation.objects.filter(pk=conversation.pk).update(last_message=message, last_message_at=message.sent_at)
+    ConversationMember.objects.filter(conversation=conversation).update(last_message_at=message.sent_at)
+    if recipient.pk != sender.pk:
+        ConversationMember.objects.filter(conversation=conversation, user=recipient).update(
+            unread_count=F('unread_count') + 1
+        )
+        Mailbox.objects.get_or_create(user=recipient)
+        Mailbox.objects.filter(user=recipient).update(unread_count=F('unread_count') + 1)
+        realtime.publish([recipient.pk], 'message', {
+            'conversation': conversation.pk,
+            'sender': sender.get_username(),
+            'content': content[:200],
+            'sent_at': message.sent_at.isoformat(),
+        })
+    return message
+
+
+@transaction.atomic
+def mark_conversation_read(conversation, user):
+    """Marque comme lus les messages reçus par `user` ; renvoie leur nombre."""
+    count = Message.objects.filter(conversation=conversation, recipient=user, is_read=False).update(is_read=True)
+    if count:
+        ConversationMember.objects.filter(conversation=conversation, user=user).update(unread_count=0)
+        Mailbox.objects.filter(user=user).update(unread_count=Greatest(F('unread_count') - count, 0))
+    return count
+
+
+def unread_count(user):
+    return Mailbox.objects.filter(user=user).values_list('unread_count', flat=True).first() or 0
+
+
+def thread_page(conversation, cursor=None, page_size=20):
+    """Page de messages d'une conversation, du plus récent au plus ancien ; au-delà des messages
+    en table, continue dans les blocs archivés (core.archive) avec le même curseur."""
+    ordering = ('-sent_at', '-id')
+    page = keyset_paginate(
+        Message.objects.filter(conversation=conversation).select_related('sender'), cursor, page_size, ordering
+    )
+    archived_until = conversation.archived_until
+    if archived_until is None or (page.has_next and page.object_list[-1].sent_at > archived_until):
+        return page
+
+    before = None
+    if cursor:
+        sent_at, pk = decode_cursor(cursor)  # Déjà validé par keyset_paginate()
+        before = (Message._meta.get_field('sent_at').to_python(sent_at), int(pk))
+    archived = archive.archived_messages(conversation, before, page_size + 1)
+    rows = sorted(page.object_list + archived, key=lambda message: (message.sent_at, message.pk), reverse=True)
+    next_cursor = None
+    if page.has_next or len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor([rows[-1].sent_at, rows[-1].pk])
+    return KeysetPage(rows, next_cursor)
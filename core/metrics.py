@@ -0,0 +1,228 @@
+import bisect
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+# Instrumentation des requêtes HTTP : durée, nombre et temps des requêtes SQL, requêtes SQL
+# répétées (N+1), agrégés en histogrammes en mémoire et exposés au format texte Prometheus.
+# Les compteurs sont propres à chaque processus : sous gunicorn, chaque worker expose les
+# siens et Prometheus les agrège (label instance). Coût par requête SQL : un appel à
+# perf_counter et l'incrément d'un compteur.
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Dernière case : +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Compteurs et histogrammes étiquetés, partagés par les threads du processus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}  # (nom, labels) -> valeur
+        self.histograms = {}  # (nom, labels) -> Histogram
+        self.help = {}
+
+    def describe(self, name, kind, text):
+        self.help[name] = (kind, text)
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def render(self, gauges=()):
+        """Texte d'exposition Prometheus ; `gauges` : [(nom, aide, valeur)] calculées à la demande."""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                (key, (list(h.counts), h.sum, h.count, h.buckets)) for key, h in self.histograms.items()
+            )
+        lines = []
+        described = set()
+
+        def header(name):
+            if name not in described and name in self.help:
+                kind, text = self.help[name]
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                described.add(name)
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        for (name, labels), (counts, total, count, buckets) in histograms:
+            header(name)
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + ['+Inf'], counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{name}_count{format_labels(labels)} {count}")
+        for name, text, value in gauges:
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+registry = Registry()
+registry.describe('eeuez_http_requests_total', 'counter', "Requêtes HTTP traitées.")
+registry.describe('eeuez_http_request_duration_seconds', 'histogram', "Durée de traitement des requêtes HTTP.")
+registry.describe('eeuez_http_request_queries', 'histogram', "Requêtes SQL par requête HTTP.")
+registry.describe('eeuez_http_request_sql_seconds', 'histogram', "Temps SQL cumulé par requête HTTP.")
+registry.describe('eeuez_http_duplicate_queries_total', 'counter', "Requêtes SQL répétées à l'identique dans une même requête HTTP.")
+registry.describe('eeuez_http_nplusone_total', 'counter', "Requêtes HTTP présentant un motif N+1.")
+registry.describe('eeuez_http_slow_requests_total', 'counter', "Requêtes HTTP plus lentes que METRICS_SLOW_REQUEST_MS.")
+
+
+class QueryRecorder:
+    """Enveloppe d'exécution SQL (connection.execute_wrapper) : compte, chronomètre, repère les répétitions."""
+
+    def __init__(self, keep_slowest=0):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()  # SQL paramétré -> nombre d'exécutions
+        self.keep_slowest = keep_slowest
+        self.slowest = []  # Tas (durée, sql) des requêtes les plus lentes
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            self.statements[sql] += 1
+            if self.keep_slowest:
+                if len(self.slowest) < self.keep_slowest:
+                    heapq.heappush(self.slowest, (elapsed, sql))
+                elif elapsed > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, (elapsed, sql))
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else '<non résolue>'
+
+
+def record(request, response, elapsed, recorder=None):
+    view = view_label(request)
+    labels = (('view', view),)
+    registry.inc('eeuez_http_requests_total', labels + (('method', request.method), ('status', str(response.status_code))))
+    registry.observe('eeuez_http_request_duration_seconds', labels, elapsed, DURATION_BUCKETS)
+    if recorder is None:
+        return
+    registry.observe('eeuez_http_request_queries', labels, recorder.count, QUERY_BUCKETS)
+    registry.observe('eeuez_http_request_sql_seconds', labels, recorder.duration, DURATION_BUCKETS)
+    repeated = {sql: count for sql, count in recorder.statements.items() if count > 1}
+    if repeated:
+        registry.inc('eeuez_http_duplicate_queries_total', labels, sum(repeated.values()) - len(repeated))
+        worst_sql, worst = max(repeated.items(), key=lambda item: item[1])
+        if worst >= settings.METRICS_NPLUSONE_THRESHOLD:
+            registry.inc('eeuez_http_nplusone_total', labels)
+            logger.warning("N+1 probable dans %s : %s exécutions de %s", view, worst, worst_sql[:500])
+    slow_ms = settings.METRICS_SLOW_REQUEST_MS
+    if slow_ms and elapsed * 1000 >= slow_ms:
+        registry.inc('eeuez_http_slow_requests_total', labels)
+        slowest = '\n'.join(
+            f"  {duration * 1000:.1f} ms  {sql[:1000]}" for duration, sql in sorted(recorder.slowest, reverse=True)
+        )
+        logger.warning(
+            "Requête lente %s %s (%s) : %.0f ms, %s requêtes SQL en %.0f ms\n%s",
+            request.method, request.path, view, elapsed * 1000, recorder.count, recorder.duration * 1000, slowest,
+        )
+
+
+def install_recorder(recorder):
+    """Branche `recorder` sur les connexions du thread courant ; renvoie les enveloppes à retirer."""
+    wrappers = [connection.execute_wrapper(recorder) for connection in connections.all()]
+    for wrapper in wrappers:
+        wrapper.__enter__()
+    return wrappers
+
+
+def remove_recorder(wrappers):
+    for wrapper in reversed(wrappers):
+        wrapper.__exit__(None, None, None)
+
+
+class MetricsMiddleware:
+    """Mesure chaque requête ; à placer en tête de MIDDLEWARE pour inclure les autres middlewares."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        recorder = QueryRecorder(keep_slowest=5 if settings.METRICS_SLOW_REQUEST_MS else 0)
+        start = time.perf_counter()
+        wrappers = install_recorder(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            remove_recorder(wrappers)
+        record(request, response, time.perf_counter() - start, recorder)
+        return response
+
+    async def __acall__(self, request):
+        # Chemin ASGI : vues synchrones et ORM s'exécutent dans le thread sync_to_async de la requête
+        # (thread_sensitive) ; l'enveloppe SQL est donc branchée et retirée dans ce même thread
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        recorder = QueryRecorder(keep_slowest=5 if settings.METRICS_SLOW_REQUEST_MS else 0)
+        start = time.perf_counter()
+        wrappers = await sync_to_async(install_recorder)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(remove_recorder)(wrappers)
+        record(request, response, time.perf_counter() - start, recorder)
+        return response
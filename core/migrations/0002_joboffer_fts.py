@@ -0,0 +1,38 @@
+from django.db import migrations
+
+FTS_TABLE = 'core_joboffer_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, description, location, category, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    JobOffer = apps.get_model('core', 'JobOffer')
+    rows = JobOffer.objects.filter(is_validated=True).values_list(
+        'pk', 'title', 'description', 'location', 'category__name'
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, description, location, category) VALUES (%s, %s, %s, %s, %s)",
+            [[pk, title, description, location, category or ''] for pk, title, description, location, category in rows],
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_joboffer_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_validated', True)), fields=['-created_at', '-id'], name='joboffer_validated_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(fields=['created_by', '-created_at'], name='joboffer_owner_recent_idx'),
+        ),
+    ]
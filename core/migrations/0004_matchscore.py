@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_joboffer_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='core.candidateprofile')),
+                ('job_offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='core.joboffer')),
+            ],
+            options={
+                'verbose_name': 'Score de correspondance',
+                'verbose_name_plural': 'Scores de correspondance',
+                'indexes': [models.Index(fields=['candidate', '-score'], name='matchscore_candidate_idx'), models.Index(fields=['job_offer', '-score'], name='matchscore_offer_idx')],
+                'constraints': [models.UniqueConstraint(fields=('candidate', 'job_offer'), name='unique_match_score')],
+            },
+        ),
+    ]
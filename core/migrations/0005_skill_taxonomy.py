@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Compétences courantes et leurs synonymes (formes canoniques, voir core.skills.canonical_key)
+DEFAULT_SKILLS = {
+    'javascript': ('JavaScript', ['js', 'java script', 'ecmascript']),
+    'typescript': ('TypeScript', ['ts']),
+    'node.js': ('Node.js', ['node', 'nodejs', 'node js']),
+    'python': ('Python', ['py', 'python3']),
+    'postgresql': ('PostgreSQL', ['postgres', 'psql']),
+    'c#': ('C#', ['csharp', 'c sharp']),
+    'c++': ('C++', ['cpp']),
+    'excel': ('Excel', ['ms excel', 'microsoft excel']),
+    'anglais': ('Anglais', ['english']),
+    'gestion de projet': ('Gestion de projet', ['project management', 'gestion de projets']),
+    'comptabilite': ('Comptabilité', ['accounting', 'compta']),
+    'marketing digital': ('Marketing digital', ['digital marketing', 'marketing numerique', 'webmarketing']),
+}
+
+
+def seed_skills(apps, schema_editor):
+    Skill = apps.get_model('core', 'Skill')
+    SkillAlias = apps.get_model('core', 'SkillAlias')
+    for slug, (name, aliases) in DEFAULT_SKILLS.items():
+        skill, _ = Skill.objects.get_or_create(slug=slug, defaults={'name': name})
+        for alias in aliases:
+            SkillAlias.objects.get_or_create(alias=alias, defaults={'skill': skill})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_matchscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.CharField(max_length=100, unique=True)),
+                ('candidate_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Compétence',
+                'verbose_name_plural': 'Compétences',
+            },
+        ),
+        migrations.AlterField(
+            model_name='candidateprofile',
+            name='years_experience',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.CreateModel(
+            name='CandidateSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_skills', to='core.candidateprofile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_skills', to='core.skill')),
+            ],
+            options={
+                'verbose_name': 'Compétence du candidat',
+                'verbose_name_plural': 'Compétences des candidats',
+            },
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='candidates', through='core.CandidateSkill', to='core.skill'),
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='core.skill')),
+            ],
+            options={
+                'verbose_name': 'Synonyme de compétence',
+                'verbose_name_plural': 'Synonymes de compétences',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='candidateskill',
+            constraint=models.UniqueConstraint(fields=('skill', 'candidate'), name='unique_candidate_skill'),
+        ),
+        migrations.RunPython(seed_skills, migrations.RunPython.noop),
+    ]
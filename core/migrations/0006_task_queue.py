@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminée'), ('failed', 'Échouée')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tâche planifiée',
+                'verbose_name_plural': 'Tâches planifiées',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='matchscore',
+            index=models.Index(fields=['job_offer', 'candidate'], name='matchscore_offer_candidate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='queuedtask',
+            index=models.Index(fields=['status', 'run_after'], name='queuedtask_due_idx'),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_conversations(apps, schema_editor):
+    Message = apps.get_model('core', 'Message')
+    Conversation = apps.get_model('core', 'Conversation')
+    ConversationMember = apps.get_model('core', 'ConversationMember')
+    Mailbox = apps.get_model('core', 'Mailbox')
+
+    threads = {}
+    for pk, sender_id, recipient_id, sent_at, is_read in (
+        Message.objects.order_by('sent_at', 'pk').values_list('pk', 'sender_id', 'recipient_id', 'sent_at', 'is_read')
+    ):
+        low, high = sorted((sender_id, recipient_id))
+        thread = threads.setdefault((low, high), {'messages': [], 'unread': {low: 0, high: 0}})
+        thread['messages'].append(pk)
+        thread['last'] = (pk, sent_at)
+        if not is_read:
+            thread['unread'][recipient_id] += 1
+
+    unread_totals = {}
+    for (low, high), thread in threads.items():
+        last_pk, last_at = thread['last']
+        conversation = Conversation.objects.create(
+            participants_key=f"{low}:{high}", last_message_id=last_pk, last_message_at=last_at, created_at=last_at
+        )
+        Message.objects.filter(pk__in=thread['messages']).update(conversation=conversation)
+        for user_id, other_id in {(low, high), (high, low)}:
+            ConversationMember.objects.create(
+                conversation=conversation, user_id=user_id, other_user_id=other_id,
+                unread_count=thread['unread'][user_id], last_message_at=last_at,
+            )
+            unread_totals[user_id] = unread_totals.get(user_id, 0) + thread['unread'][user_id]
+    Mailbox.objects.bulk_create([Mailbox(user_id=user_id, unread_count=total) for user_id, total in unread_totals.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0006_task_queue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Participant',
+                'verbose_name_plural': 'Participants',
+            },
+        ),
+        migrations.CreateModel(
+            name='Mailbox',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='mailbox', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Boîte de réception',
+                'verbose_name_plural': 'Boîtes de réception',
+            },
+        ),
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('participants_key', models.CharField(max_length=50, unique=True)),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.message')),
+            ],
+            options={
+                'verbose_name': 'Conversation',
+                'verbose_name_plural': 'Conversations',
+            },
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='conversation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='core.conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['recipient', 'is_read', 'sent_at'], name='message_recipient_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', '-sent_at', '-id'], name='message_thread_idx'),
+        ),
+        migrations.AddField(
+            model_name='conversationmember',
+            name='conversation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='core.conversation'),
+        ),
+        migrations.AddField(
+            model_name='conversationmember',
+            name='other_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversationmember',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_memberships', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='conversationmember',
+            index=models.Index(fields=['user', '-last_message_at', '-id'], name='member_inbox_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversationmember',
+            constraint=models.UniqueConstraint(fields=('user', 'conversation'), name='unique_conversation_member'),
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_category_guide_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='cv_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='media_status',
+            field=models.CharField(choices=[('none', 'Aucun fichier'), ('pending', 'En attente'), ('processing', 'En cours de traitement'), ('ready', 'Prêt'), ('failed', 'Échec')], default='none', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='picture_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_candidateprofile_media'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='source',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddConstraint(
+            model_name='joboffer',
+            constraint=models.UniqueConstraint(fields=('source', 'external_id'), name='joboffer_source_external_id_uniq'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUS_FIELDS = ('pending', 'accepted', 'rejected')
+
+
+def backfill_application_stats(apps, schema_editor):
+    Application = apps.get_model('core', 'Application')
+    ApplicationStats = apps.get_model('core', 'ApplicationStats')
+
+    stats = {}
+    for job_offer_id, recruiter_id, status, count in (
+        Application.objects.values_list('job_offer_id', 'job_offer__created_by_id', 'status')
+        .annotate(n=Count('pk')).order_by()
+    ):
+        row = stats.setdefault(job_offer_id, ApplicationStats(job_offer_id=job_offer_id, recruiter_id=recruiter_id))
+        row.total += count
+        if status in STATUS_FIELDS:
+            setattr(row, status, getattr(row, status) + count)
+    ApplicationStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_joboffer_external_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStats',
+            fields=[
+                ('job_offer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_stats', serialize=False, to='core.joboffer')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('accepted', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Statistiques de candidatures',
+                'verbose_name_plural': 'Statistiques de candidatures',
+            },
+        ),
+        migrations.RunPython(backfill_application_stats, migrations.RunPython.noop),
+    ]
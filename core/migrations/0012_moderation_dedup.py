@@ -0,0 +1,103 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_application_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Seau LSH',
+                'verbose_name_plural': 'Seaux LSH',
+            },
+        ),
+        migrations.CreateModel(
+            name='OfferCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'À examiner'), ('approved', 'Approuvé'), ('rejected', 'Rejeté')], db_index=True, default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Groupe de doublons',
+                'verbose_name_plural': 'Groupes de doublons',
+            },
+        ),
+        migrations.CreateModel(
+            name='OfferSignature',
+            fields=[
+                ('job_offer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='core.joboffer')),
+                ('minhash', models.BinaryField()),
+                ('similarity', models.FloatField(default=0)),
+                ('is_spam', models.BooleanField(default=False)),
+                ('spam_reasons', models.CharField(blank=True, max_length=255)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': "Signature d'offre",
+                'verbose_name_plural': "Signatures d'offres",
+            },
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-applied_at'], name='application_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', '-applied_at'], name='application_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_validated', False)), fields=['-created_at', '-id'], name='joboffer_moderation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['-sent_at'], name='message_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', '-created_at'], name='notification_read_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recruiterprofile',
+            index=models.Index(fields=['is_validated', '-created_at'], name='recruiter_moderation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['is_approved', '-created_at'], name='testimonial_moderation_idx'),
+        ),
+        migrations.AddField(
+            model_name='lshbucket',
+            name='job_offer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='core.joboffer'),
+        ),
+        migrations.AddField(
+            model_name='offersignature',
+            name='cluster',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='signatures', to='core.offercluster'),
+        ),
+        migrations.AddField(
+            model_name='offersignature',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.joboffer'),
+        ),
+        migrations.AddIndex(
+            model_name='lshbucket',
+            index=models.Index(fields=['key', 'job_offer'], name='lshbucket_key_idx'),
+        ),
+    ]
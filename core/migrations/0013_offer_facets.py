@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:41
+
+from django.conf import settings
+from collections import Counter
+
+from django.db import migrations, models
+
+from core.facets import derived_fields, normalize_location, offer_keys
+
+
+def backfill_offer_facets(apps, schema_editor):
+    JobOffer = apps.get_model('core', 'JobOffer')
+    FacetCount = apps.get_model('core', 'FacetCount')
+
+    offers = list(JobOffer.objects.only('pk', 'location', 'experience_required', 'category_id', 'is_validated'))
+    counts, labels = Counter(), {}
+    for offer in offers:
+        for field, value in derived_fields(offer.location, offer.experience_required).items():
+            setattr(offer, field, value)
+        if offer.is_validated:
+            counts.update(offer_keys(offer.category_id, offer.location_normalized, offer.experience_years))
+            labels.setdefault(('location', offer.location_normalized), normalize_location(offer.location)[1])
+    JobOffer.objects.bulk_update(offers, ['location_normalized', 'experience_years'], batch_size=500)
+    FacetCount.objects.bulk_create(
+        [FacetCount(facet=facet, value=value, label=labels.get((facet, value), ''), count=n)
+         for (facet, value), n in counts.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_moderation_dedup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=100)),
+                ('label', models.CharField(blank=True, max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Compteur de facette',
+                'verbose_name_plural': 'Compteurs de facettes',
+            },
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='experience_years',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='location_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_validated', True)), fields=['category', '-created_at', '-id'], name='joboffer_category_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_validated', True)), fields=['location_normalized', '-created_at', '-id'], name='joboffer_location_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_validated', True)), fields=['experience_years', '-created_at', '-id'], name='joboffer_experience_recent_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='facetcount_facet_value_uniq'),
+        ),
+        migrations.RunPython(backfill_offer_facets, migrations.RunPython.noop),
+    ]
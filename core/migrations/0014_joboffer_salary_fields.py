@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_offer_facets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='salary_currency',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='salary_max',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='salary_min',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='salary_monthly',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='salary_period',
+            field=models.CharField(blank=True, choices=[('hour', 'Heure'), ('day', 'Jour'), ('week', 'Semaine'), ('month', 'Mois'), ('year', 'An')], editable=False, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_validated', True), ('salary_monthly__isnull', False)), fields=['salary_monthly', 'id'], name='joboffer_salary_idx'),
+        ),
+    ]
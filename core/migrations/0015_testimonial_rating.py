@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:50
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_joboffer_salary_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testimonial',
+            name='display_name',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='testimonial',
+            name='rating',
+            field=models.PositiveSmallIntegerField(default=5, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+    ]
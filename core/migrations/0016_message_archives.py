@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_testimonial_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='archived_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='MessageArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('first_sent_at', models.DateTimeField()),
+                ('last_sent_at', models.DateTimeField()),
+                ('message_count', models.PositiveIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archives', to='core.conversation')),
+            ],
+            options={
+                'verbose_name': 'Archive de messages',
+                'verbose_name_plural': 'Archives de messages',
+                'indexes': [models.Index(fields=['conversation', '-last_sent_at'], name='message_archive_thread_idx')],
+                'constraints': [models.UniqueConstraint(fields=('conversation', 'month'), name='unique_message_archive_month')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('notification_count', models.PositiveIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_archives', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archive de notifications',
+                'verbose_name_plural': 'Archives de notifications',
+                'constraints': [models.UniqueConstraint(fields=('user', 'month'), name='unique_notification_archive_month')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_message_archives'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='alert_category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.category'),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='alert_frequency',
+            field=models.CharField(choices=[('none', 'Aucune'), ('daily', 'Quotidienne'), ('weekly', 'Hebdomadaire')], default='none', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='DigestDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frequency', models.CharField(choices=[('none', 'Aucune'), ('daily', 'Quotidienne'), ('weekly', 'Hebdomadaire')], max_length=10)),
+                ('period', models.DateField()),
+                ('offer_ids', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('pending', 'À envoyer'), ('sent', 'Envoyé'), ('skipped', 'Sans adresse e-mail'), ('failed', 'Échec')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='digest_deliveries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Envoi de résumé',
+                'verbose_name_plural': 'Envois de résumés',
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['frequency', 'period', 'id'], name='digest_pending_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'frequency', 'period'), name='unique_digest_delivery')],
+            },
+        ),
+    ]
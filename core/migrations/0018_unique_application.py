@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:59
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min, Value
+from django.db.models.functions import Greatest
+
+STATUS_FIELDS = ('pending', 'accepted', 'rejected')
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    # Garde la première candidature de chaque paire et retire les doublons des statistiques
+    Application = apps.get_model('core', 'Application')
+    ApplicationStats = apps.get_model('core', 'ApplicationStats')
+
+    duplicates = (
+        Application.objects.values('candidate_id', 'job_offer_id')
+        .annotate(n=Count('pk'), first=Min('pk')).filter(n__gt=1).order_by()
+    )
+    for row in list(duplicates):
+        extra = Application.objects.filter(
+            candidate_id=row['candidate_id'], job_offer_id=row['job_offer_id']
+        ).exclude(pk=row['first'])
+        delta = {'total': 0}
+        for status in extra.values_list('status', flat=True):
+            delta['total'] += 1
+            if status in STATUS_FIELDS:
+                delta[status] = delta.get(status, 0) + 1
+        extra.delete()
+        ApplicationStats.objects.filter(pk=row['job_offer_id']).update(
+            **{field: Greatest(F(field) - value, Value(0)) for field, value in delta.items()}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_job_alert_digests'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('candidate', 'job_offer'), name='unique_application'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_realtime_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_validated', True)), fields=['updated_at'], name='joboffer_validated_updated_idx'),
+        ),
+    ]
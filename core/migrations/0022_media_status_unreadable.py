@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_joboffer_validated_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidateprofile',
+            name='media_status',
+            field=models.CharField(choices=[('none', 'Aucun fichier'), ('pending', 'En attente'), ('processing', 'En cours de traitement'), ('ready', 'Prêt'), ('unreadable', 'Fichier illisible'), ('failed', 'Échec')], default='none', max_length=20),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -6,6 +7,7 @@ from django.utils import timezone
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -14,26 +16,95 @@ class Category(models.Model):
         verbose_name = "Catégorie"
         verbose_name_plural = "Catégories"
 
+# Compétence normalisée (taxonomie partagée par les profils)
+class Skill(models.Model):
+    name = models.CharField(max_length=100)  # Libellé affiché (ex: "Node.js")
+    slug = models.CharField(max_length=100, unique=True)  # Forme canonique (ex: "node.js")
+    candidate_count = models.PositiveIntegerField(default=0)  # Taille de la liste de candidats
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Compétence"
+        verbose_name_plural = "Compétences"
+
+# Synonyme d'une compétence (ex: "js" -> JavaScript)
+class SkillAlias(models.Model):
+    alias = models.CharField(max_length=100, unique=True)  # Forme canonique du synonyme
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+
+    def __str__(self):
+        return f"{self.alias} → {self.skill}"
+
+    class Meta:
+        verbose_name = "Synonyme de compétence"
+        verbose_name_plural = "Synonymes de compétences"
+
 # Modèle pour les profils candidats
 class CandidateProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='candidate_profile')
     full_name = models.CharField(max_length=200)
     skills = models.TextField(blank=True)  # Compétences séparées par des virgules
-    years_experience = models.PositiveIntegerField(default=0)
+    skill_set = models.ManyToManyField(Skill, through='CandidateSkill', related_name='candidates', blank=True)  # Compétences normalisées
+    years_experience = models.PositiveIntegerField(default=0, db_index=True)
     education = models.TextField(blank=True)  # Formations
     cv_file = models.FileField(upload_to='cvs/', blank=True, null=True)  # Fichier CV
     profile_picture = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    MEDIA_STATUS_CHOICES = [
+        ('none', 'Aucun fichier'),
+        ('pending', 'En attente'),
+        ('processing', 'En cours de traitement'),
+        ('ready', 'Prêt'),
+        ('unreadable', 'Fichier illisible'),
+        ('failed', 'Échec'),
+    ]
+    media_status = models.CharField(max_length=20, choices=MEDIA_STATUS_CHOICES, default='none')  # Traitement du CV et de la photo
+    cv_text = models.TextField(blank=True, editable=False)  # Texte extrait du CV
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False)  # {"160": "profiles/variants/..."}
     social_links = models.JSONField(blank=True, null=True)  # Liens réseaux sociaux (ex: {"linkedin": "url", "twitter": "url"})
     is_sponsored = models.BooleanField(default=False)  # Profil sponsorisé (payant)
+    ALERT_FREQUENCY_CHOICES = [
+        ('none', 'Aucune'),
+        ('daily', 'Quotidienne'),
+        ('weekly', 'Hebdomadaire'),
+    ]
+    # Alertes emploi par e-mail (core.alerts) : offres citant ses compétences, dans la catégorie choisie
+    alert_frequency = models.CharField(max_length=10, choices=ALERT_FREQUENCY_CHOICES, default='none')
+    alert_category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
     created_at = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
         return f"Profil de {self.full_name}"
 
+    def avatar_url(self, size=160):
+        """URL de la vignette de la taille demandée, ou de la photo d'origine tant qu'elle n'est pas prête."""
+        from django.core.files.storage import default_storage
+
+        variant = self.picture_variants.get(str(size))
+        if variant:
+            return default_storage.url(variant)
+        return self.profile_picture.url if self.profile_picture else ''
+
     class Meta:
         verbose_name = "Profil Candidat"
         verbose_name_plural = "Profils Candidats"
 
+# Lien profil <-> compétence ; l'index (skill, candidate) sert de liste de candidats triée par compétence
+class CandidateSkill(models.Model):
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='candidate_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='candidate_skills')
+
+    def __str__(self):
+        return f"{self.candidate_id} · {self.skill_id}"
+
+    class Meta:
+        verbose_name = "Compétence du candidat"
+        verbose_name_plural = "Compétences des candidats"
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'candidate'], name='unique_candidate_skill'),
+        ]
+
 # Modèle pour les comptes recruteurs
 class RecruiterProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='recruiter_profile')
@@ -48,17 +119,38 @@ class RecruiterProfile(models.Model):
     class Meta:
         verbose_name = "Profil Recruteur"
         verbose_name_plural = "Profils Recruteurs"
+        indexes = [
+            models.Index(fields=['is_validated', '-created_at'], name='recruiter_moderation_idx'),
+        ]
 
 # Modèle pour les offres d'emploi
 class JobOffer(models.Model):
+    SALARY_PERIOD_CHOICES = [
+        ('hour', 'Heure'),
+        ('day', 'Jour'),
+        ('week', 'Semaine'),
+        ('month', 'Mois'),
+        ('year', 'An'),
+    ]
     title = models.CharField(max_length=200)
     description = models.TextField()
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True)
     location = models.CharField(max_length=100)
     salary = models.CharField(max_length=100, blank=True)  # Ex: "50,000 FCFA/mois"
+    # Salaire analysé (core.salary), renseigné à l'enregistrement
+    salary_min = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    salary_max = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    salary_currency = models.CharField(max_length=3, blank=True, editable=False)  # Code ISO 4217
+    salary_period = models.CharField(max_length=10, choices=SALARY_PERIOD_CHOICES, blank=True, editable=False)
+    salary_monthly = models.PositiveBigIntegerField(null=True, blank=True, editable=False)  # Mensuel, en SALARY_BASE_CURRENCY
     experience_required = models.CharField(max_length=100, blank=True)
+    # Valeurs de facette dérivées des champs texte (core.facets), renseignées à l'enregistrement
+    location_normalized = models.CharField(max_length=100, blank=True, editable=False)  # Ex: "douala"
+    experience_years = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_offers')
     is_validated = models.BooleanField(default=False)  # Validation par personnel
+    source = models.CharField(max_length=50, blank=True, default='')  # Flux partenaire d'origine ("" : saisie sur le site)
+    external_id = models.CharField(max_length=100, blank=True, null=True)  # Identifiant stable dans le flux partenaire
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -68,6 +160,56 @@ class JobOffer(models.Model):
     class Meta:
         verbose_name = "Offre d'emploi"
         verbose_name_plural = "Offres d'emploi"
+        indexes = [
+            # Liste publique : index partiel sur les offres validées, dans l'ordre de la
+            # pagination par curseur (created_at, id). Django compile is_validated=True en
+            # « WHERE is_validated », ce qu'un index (is_validated, ...) ne sait pas exploiter.
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_validated=True),
+                name='joboffer_validated_recent_idx',
+            ),
+            # Offres d'un recruteur, les plus récentes d'abord
+            models.Index(fields=['created_by', '-created_at'], name='joboffer_owner_recent_idx'),
+            # Filtres à facettes de la liste publique, dans l'ordre de la pagination
+            models.Index(
+                fields=['category', '-created_at', '-id'],
+                condition=models.Q(is_validated=True),
+                name='joboffer_category_recent_idx',
+            ),
+            models.Index(
+                fields=['location_normalized', '-created_at', '-id'],
+                condition=models.Q(is_validated=True),
+                name='joboffer_location_recent_idx',
+            ),
+            models.Index(
+                fields=['experience_years', '-created_at', '-id'],
+                condition=models.Q(is_validated=True),
+                name='joboffer_experience_recent_idx',
+            ),
+            # Filtre par fourchette et tri par salaire mensuel (parcouru dans les deux sens)
+            models.Index(
+                fields=['salary_monthly', 'id'],
+                condition=models.Q(is_validated=True, salary_monthly__isnull=False),
+                name='joboffer_salary_idx',
+            ),
+            # Version de la liste de l'API (dernière modification parmi les offres validées)
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(is_validated=True),
+                name='joboffer_validated_updated_idx',
+            ),
+            # File de modération (filtre « non validée » de l'admin)
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_validated=False),
+                name='joboffer_moderation_idx',
+            ),
+        ]
+        constraints = [
+            # Clé de dédoublonnage des imports ; les offres saisies sur le site (NULL) n'entrent pas en conflit
+            models.UniqueConstraint(fields=['source', 'external_id'], name='joboffer_source_external_id_uniq'),
+        ]
 
 # Modèle pour les candidatures
 class Application(models.Model):
@@ -87,9 +229,125 @@ class Application(models.Model):
     class Meta:
         verbose_name = "Candidature"
         verbose_name_plural = "Candidatures"
+        constraints = [
+            # Une candidature par candidat et par offre (dépôt idempotent, core.applications)
+            models.UniqueConstraint(fields=['candidate', 'job_offer'], name='unique_application'),
+        ]
+        indexes = [
+            models.Index(fields=['-applied_at'], name='application_recent_idx'),
+            models.Index(fields=['status', '-applied_at'], name='application_status_idx'),
+        ]
+
+# Compteurs de candidatures par offre, tenus à jour par signaux (core.stats) : les tableaux de
+# bord des recruteurs les lisent sans jamais agréger la table des candidatures
+class ApplicationStats(models.Model):
+    job_offer = models.OneToOneField(JobOffer, on_delete=models.CASCADE, primary_key=True, related_name='application_stats')
+    recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='application_stats')  # Copie de job_offer.created_by
+    total = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    accepted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Statistiques de {self.job_offer_id}"
+
+    class Meta:
+        verbose_name = "Statistiques de candidatures"
+        verbose_name_plural = "Statistiques de candidatures"
+
+# Nombre d'offres validées par valeur de facette (voir core.facets)
+class FacetCount(models.Model):
+    facet = models.CharField(max_length=20)  # "category", "location" ou "experience"
+    value = models.CharField(max_length=100)  # Identifiant de catégorie, ville normalisée ou niveau
+    label = models.CharField(max_length=100, blank=True)  # Libellé affiché (villes)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.facet}={self.value} ({self.count})"
+
+    class Meta:
+        verbose_name = "Compteur de facette"
+        verbose_name_plural = "Compteurs de facettes"
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='facetcount_facet_value_uniq'),
+        ]
+
+# Score de correspondance candidat/offre (matrice creuse calculée par core.matching)
+class MatchScore(models.Model):
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='match_scores')
+    job_offer = models.ForeignKey(JobOffer, on_delete=models.CASCADE, related_name='match_scores')
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Score {self.score:.2f} ({self.candidate_id} / {self.job_offer_id})"
+
+    class Meta:
+        verbose_name = "Score de correspondance"
+        verbose_name_plural = "Scores de correspondance"
+        constraints = [
+            models.UniqueConstraint(fields=['candidate', 'job_offer'], name='unique_match_score'),
+        ]
+        indexes = [
+            models.Index(fields=['candidate', '-score'], name='matchscore_candidate_idx'),
+            models.Index(fields=['job_offer', '-score'], name='matchscore_offer_idx'),
+            # Parcours par lots des candidats d'une offre (diffusion des notifications)
+            models.Index(fields=['job_offer', 'candidate'], name='matchscore_offer_candidate_idx'),
+        ]
+
+# Fil de discussion entre deux utilisateurs
+class Conversation(models.Model):
+    participants_key = models.CharField(max_length=50, unique=True)  # "id_min:id_max", une conversation par paire
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    archived_until = models.DateTimeField(null=True, blank=True, editable=False)  # Date du plus récent message archivé
+
+    def __str__(self):
+        return f"Conversation {self.participants_key}"
+
+    class Meta:
+        verbose_name = "Conversation"
+        verbose_name_plural = "Conversations"
+
+# Participation d'un utilisateur à une conversation (une ligne par participant)
+class ConversationMember(models.Model):
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='members')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversation_memberships')
+    other_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')  # Interlocuteur
+    unread_count = models.PositiveIntegerField(default=0)
+    last_message_at = models.DateTimeField(default=timezone.now)  # Copie de Conversation.last_message_at pour le tri
+
+    def __str__(self):
+        return f"{self.user} dans {self.conversation}"
+
+    class Meta:
+        verbose_name = "Participant"
+        verbose_name_plural = "Participants"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'conversation'], name='unique_conversation_member'),
+        ]
+        indexes = [
+            # Boîte de réception paginée par curseur
+            models.Index(fields=['user', '-last_message_at', '-id'], name='member_inbox_idx'),
+        ]
+
+# Compteur de messages non lus par utilisateur
+class Mailbox(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='mailbox')
+    unread_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Boîte de {self.user}"
+
+    class Meta:
+        verbose_name = "Boîte de réception"
+        verbose_name_plural = "Boîtes de réception"
 
 # Modèle pour les messages
 class Message(models.Model):
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, null=True, blank=True, related_name='messages')
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
     content = models.TextField()
@@ -102,6 +360,11 @@ class Message(models.Model):
     class Meta:
         verbose_name = "Message"
         verbose_name_plural = "Messages"
+        indexes = [
+            models.Index(fields=['recipient', 'is_read', 'sent_at'], name='message_recipient_unread_idx'),
+            models.Index(fields=['conversation', '-sent_at', '-id'], name='message_thread_idx'),
+            models.Index(fields=['-sent_at'], name='message_recent_idx'),
+        ]
 
 # Modèle pour les notifications
 class Notification(models.Model):
@@ -118,6 +381,82 @@ class Notification(models.Model):
     class Meta:
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
+        indexes = [
+            models.Index(fields=['is_read', '-created_at'], name='notification_read_recent_idx'),
+        ]
+
+# Archives compressées (core.archive) : un bloc par conversation ou par utilisateur et par mois,
+# contenant les lignes retirées de Message / Notification en JSON Lines compressé par zlib
+class MessageArchive(models.Model):
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='archives')
+    month = models.DateField()  # Premier jour du mois
+    first_sent_at = models.DateTimeField()
+    last_sent_at = models.DateTimeField()
+    message_count = models.PositiveIntegerField(default=0)
+    data = models.BinaryField()
+
+    def __str__(self):
+        return f"Archive {self.month:%Y-%m} de {self.conversation}"
+
+    class Meta:
+        verbose_name = "Archive de messages"
+        verbose_name_plural = "Archives de messages"
+        constraints = [
+            models.UniqueConstraint(fields=['conversation', 'month'], name='unique_message_archive_month'),
+        ]
+        indexes = [
+            models.Index(fields=['conversation', '-last_sent_at'], name='message_archive_thread_idx'),
+        ]
+
+class NotificationArchive(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_archives')
+    month = models.DateField()  # Premier jour du mois
+    notification_count = models.PositiveIntegerField(default=0)
+    data = models.BinaryField()
+
+    def __str__(self):
+        return f"Archive {self.month:%Y-%m} de {self.user}"
+
+    class Meta:
+        verbose_name = "Archive de notifications"
+        verbose_name_plural = "Archives de notifications"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='unique_notification_archive_month'),
+        ]
+
+# Envoi d'un résumé d'alertes emploi (core.alerts) : une ligne par candidat et par période,
+# écrite avec sa notification ; l'envoi de l'e-mail reprend sur les lignes encore « pending »
+class DigestDelivery(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'À envoyer'),
+        ('sent', 'Envoyé'),
+        ('skipped', 'Sans adresse e-mail'),
+        ('failed', 'Échec'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='digest_deliveries')
+    frequency = models.CharField(max_length=10, choices=CandidateProfile.ALERT_FREQUENCY_CHOICES)
+    period = models.DateField()  # Jour de fin (exclu) de la période couverte
+    offer_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Résumé {self.frequency} du {self.period} pour {self.user}"
+
+    class Meta:
+        verbose_name = "Envoi de résumé"
+        verbose_name_plural = "Envois de résumés"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'frequency', 'period'], name='unique_digest_delivery'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['frequency', 'period', 'id'],
+                condition=models.Q(status='pending'),
+                name='digest_pending_idx',
+            ),
+        ]
 
 # Modèle pour les guides/accompagnement
 class Guide(models.Model):
@@ -129,6 +468,7 @@ class Guide(models.Model):
         ('career', 'Orientation professionnelle'),
     ])
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -140,13 +480,118 @@ class Guide(models.Model):
 # Modèle pour les témoignages
 class Testimonial(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='testimonials')
+    display_name = models.CharField(max_length=100, blank=True)  # Nom affiché sur l'accueil
     content = models.TextField()
+    rating = models.PositiveSmallIntegerField(default=5, validators=[MinValueValidator(1), MaxValueValidator(5)])  # Étoiles
     created_at = models.DateTimeField(default=timezone.now)
     is_approved = models.BooleanField(default=False)
 
     def __str__(self):
         return f"Témoignage de {self.user.username}"
 
+    @property
+    def author(self):
+        return self.display_name or self.user.get_full_name() or self.user.username
+
     class Meta:
         verbose_name = "Témoignage"
-        verbose_name_plural = "Témoignages"
\ No newline at end of file
+        verbose_name_plural = "Témoignages"
+        indexes = [
+            models.Index(fields=['is_approved', '-created_at'], name='testimonial_moderation_idx'),
+        ]
+
+# File de tâches d'arrière-plan stockée en base (voir core.tasks et la commande run_tasks)
+class QueuedTask(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('done', 'Terminée'),
+        ('failed', 'Échouée'),
+    ]
+    name = models.CharField(max_length=100)  # Nom de la tâche enregistrée (ex: "notifications.offer_validated")
+    payload = models.JSONField(default=dict, blank=True)  # Arguments et point de reprise
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+    class Meta:
+        verbose_name = "Tâche planifiée"
+        verbose_name_plural = "Tâches planifiées"
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='queuedtask_due_idx'),
+        ]
+
+# Détection des quasi-doublons (core.dedup) : signature MinHash d'une offre et groupe de doublons
+class OfferCluster(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'À examiner'),
+        ('approved', 'Approuvé'),
+        ('rejected', 'Rejeté'),
+    ]
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Groupe de doublons n°{self.pk}"
+
+    class Meta:
+        verbose_name = "Groupe de doublons"
+        verbose_name_plural = "Groupes de doublons"
+
+class OfferSignature(models.Model):
+    job_offer = models.OneToOneField(JobOffer, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    minhash = models.BinaryField()  # DEDUP_NUM_PERM entiers non signés de 64 bits
+    cluster = models.ForeignKey(OfferCluster, on_delete=models.SET_NULL, null=True, blank=True, related_name='signatures')
+    duplicate_of = models.ForeignKey(JobOffer, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')  # Offre la plus proche
+    similarity = models.FloatField(default=0)  # Similarité de Jaccard estimée avec duplicate_of
+    is_spam = models.BooleanField(default=False)
+    spam_reasons = models.CharField(max_length=255, blank=True)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Signature de {self.job_offer_id}"
+
+    class Meta:
+        verbose_name = "Signature d'offre"
+        verbose_name_plural = "Signatures d'offres"
+
+# Seau LSH : une ligne par bande de la signature ; deux offres partageant un seau sont candidates
+class LSHBucket(models.Model):
+    key = models.BigIntegerField()  # Empreinte (bande, valeurs de la bande)
+    job_offer = models.ForeignKey(JobOffer, on_delete=models.CASCADE, related_name='lsh_buckets')
+
+    def __str__(self):
+        return f"{self.key} · {self.job_offer_id}"
+
+    class Meta:
+        verbose_name = "Seau LSH"
+        verbose_name_plural = "Seaux LSH"
+        indexes = [
+            models.Index(fields=['key', 'job_offer'], name='lshbucket_key_idx'),
+        ]
+
+# Relais temps réel entre processus (core.realtime.DatabaseRelayBroker) : événement publié par un
+# processus (worker run_tasks, autre worker web), relu par chaque processus qui sert des flux SSE
+class RealtimeEvent(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    event = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Événement {self.event.get('type')} pour {self.user_id}"
+
+    class Meta:
+        verbose_name = "Événement temps réel"
+        verbose_name_plural = "Événements temps réel"
+        indexes = [
+            models.Index(fields=['created_at'], name='realtimeevent_created_idx'),
+        ]
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.utils import timezone
+
+from . import caching, facets, ranking, search, tasks, testimonials
+
+# Actions de modération en masse : une seule requête UPDATE par lot. QuerySet.update()
+# n'émettant pas de signaux, les effets habituels (index de recherche, cache des pages,
+# correspondances, notifications, statistiques) sont déclenchés ici explicitement.
+
+
+@transaction.atomic
+def set_offers_validated(queryset, validated):
+    """Publie (`validated=True`) ou retire les offres du queryset ; renvoie le nombre d'offres modifiées."""
+    from .models import JobOffer
+
+    changed = queryset.exclude(is_validated=validated)
+    pks = list(changed.values_list('pk', flat=True))
+    if not pks:
+        return 0
+    before, _ = facets.snapshot(JobOffer.objects.filter(pk__in=pks))
+    JobOffer.objects.filter(pk__in=changed.values('pk')).update(is_validated=validated, updated_at=timezone.now())
+    facets.apply_change(before, *facets.snapshot(JobOffer.objects.filter(pk__in=pks)))
+    transaction.on_commit(lambda: search.index_offers(pks))
+    transaction.on_commit(lambda: caching.invalidate_offers(pks))
+    if validated:
+        tasks.enqueue_many('notifications.offer_validated', [{'offer_id': pk} for pk in pks])
+    else:
+        tasks.enqueue_many('matching.refresh_offer', [{'offer_id': pk} for pk in pks])
+    return len(pks)
+
+
+@transaction.atomic
+def set_applications_status(queryset, status):
+    """Change le statut des candidatures du queryset et recalcule les statistiques des offres touchées."""
+    from .models import Application
+    from .stats import recount
+
+    job_offer_ids = set(queryset.values_list('job_offer_id', flat=True).distinct())
+    updated = Application.objects.filter(pk__in=queryset.values('pk')).update(status=status)
+    recount(job_offer_ids)
+    return updated
+
+
+@transaction.atomic
+def set_testimonials_approved(queryset, approved):
+    """Approuve ou masque les témoignages du queryset ; le carrousel est reconstruit s'il change."""
+    from .models import Testimonial
+
+    updated = Testimonial.objects.filter(pk__in=queryset.exclude(is_approved=approved).values('pk')).update(is_approved=approved)
+    if updated:
+        transaction.on_commit(testimonials.refresh)
+    return updated
+
+
+@transaction.atomic
+def set_candidates_sponsored(queryset, sponsored):
+    """Active ou retire le sponsoring des profils du queryset et les replace dans le classement."""
+    from .models import CandidateProfile
+
+    pks = list(queryset.exclude(is_sponsored=sponsored).values_list('pk', flat=True))
+    if not pks:
+        return 0
+    CandidateProfile.objects.filter(pk__in=pks).update(is_sponsored=sponsored)
+    transaction.on_commit(lambda: ranking.update_profiles(pks))
+    return len(pks)
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import transaction
+
+from . import realtime
+from .matching import engine
+from .tasks import checkpoint, task
+
+# Diffusion des notifications aux candidats, exécutée par le worker de tâches.
+
+
+@task('notifications.offer_validated')
+def fan_out_offer_validated(payload, queued_task=None):
+    """Notifie les candidats correspondant à une offre qui vient d'être validée.
+
+    Les notifications sont écrites par lots de NOTIFICATION_FANOUT_CHUNK, chacun dans sa propre
+    courte transaction avec le point de reprise : le verrou d'écriture SQLite est relâché entre
+    deux lots et une reprise après échec ne crée pas de doublons.
+    """
+    from .models import JobOffer, MatchScore, Notification
+
+    offer = JobOffer.objects.filter(pk=payload['offer_id'], is_validated=True).first()
+    if offer is None:
+        return
+    if not payload.get('matched'):
+        engine.refresh_offer(offer.pk)
+        checkpoint(queued_task, matched=True)
+
+    content = f"Nouvelle offre correspondant à votre profil : {offer.title}"
+    after = payload.get('after', 0)
+    while True:
+        rows = list(
+            MatchScore.objects.filter(job_offer=offer, candidate_id__gt=after)
+            .order_by('candidate_id')
+            .values_list('candidate_id', 'candidate__user_id')[:settings.NOTIFICATION_FANOUT_CHUNK]
+        )
+        if not rows:
+            break
+        after = rows[-1][0]
+        with transaction.atomic():
+            Notification.objects.bulk_create(
+                [Notification(user_id=user_id, content=content, related_offer=offer) for _, user_id in rows]
+            )
+            checkpoint(queued_task, after=after)
+            realtime.publish([user_id for _, user_id in rows], 'notification', {'content': content, 'offer': offer.pk})
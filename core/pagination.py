@@ -0,0 +1,100 @@
+import base64
+import datetime
+import decimal
+import json
+
+from django.db.models import Q
+from django.http import Http404
+
+# Pagination par curseur (keyset) : le curseur encode les valeurs de tri de la
+# dernière ligne affichée, la page suivante repart de là grâce à l'index composite.
+# Une page profonde coûte donc autant que la première, contrairement à OFFSET.
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class CursorEncoder(json.JSONEncoder):
+    # isoformat() complet : DjangoJSONEncoder tronque les microsecondes, ce qui ferait
+    # sauter des lignes de même milliseconde.
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.date)):
+            return o.isoformat()
+        if isinstance(o, decimal.Decimal):
+            return str(o)
+        return super().default(o)
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise Http404("Curseur de pagination invalide.")
+    if not isinstance(values, list):
+        raise Http404("Curseur de pagination invalide.")
+    return values
+
+
+def _after(model, ordering, values):
+    """Condition « strictement après la ligne `values` » dans l'ordre `ordering`."""
+    fields = [name.lstrip('-') for name in ordering]
+    if len(values) != len(fields):
+        raise Http404("Curseur de pagination invalide.")
+    try:
+        values = [model._meta.get_field(field).to_python(value) for field, value in zip(fields, values)]
+    except Exception:
+        raise Http404("Curseur de pagination invalide.")
+
+    # Premier champ en borne large (<= / >=) pour que la base fasse un seek dans l'index,
+    # puis la comparaison lexicographique exacte pour départager les égalités.
+    first_lookup = 'lte' if ordering[0].startswith('-') else 'gte'
+    condition = Q()
+    equal = Q()
+    for name, field, value in zip(ordering, fields, values):
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{field}__{lookup}': value})
+        equal &= Q(**{field: value})
+    return Q(**{f'{fields[0]}__{first_lookup}': values[0]}) & condition
+
+
+def keyset_paginate(queryset, cursor=None, page_size=20, ordering=('-created_at', '-id')):
+    """Renvoie une KeysetPage de `queryset` trié par `ordering` (champs non nuls, le dernier unique)."""
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        queryset = queryset.filter(_after(queryset.model, ordering, decode_cursor(cursor)))
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, name.lstrip('-')) for name in ordering)
+    return KeysetPage(rows, next_cursor)
+
+
+def offset_from_cursor(cursor):
+    """Curseur d'une liste classée par pertinence (recherche) : simple position de départ."""
+    if not cursor:
+        return 0
+    values = decode_cursor(cursor)
+    if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+        raise Http404("Curseur de pagination invalide.")
+    return values[0]
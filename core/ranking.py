@@ -0,0 +1,191 @@
+import bisect
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404
+
+from .pagination import decode_cursor
+from .tasks import enqueue, task
+
+# Classement des candidats pour les recruteurs : profils sponsorisés d'abord, puis par
+# ancienneté du profil (par tranches de CANDIDATE_RECENCY_BUCKET_DAYS jours) et par expérience.
+# Chaque processus garde en mémoire deux listes triées de clés (-tranche, -expérience, -id) ;
+# une page n'est qu'une tranche de ces listes, sans lecture de l'ensemble des profils.
+# Les processus restent d'accord par un petit état commun (CANDIDATE_RANKING_CACHE) :
+# - une version (époque, numéro), relue à chaque page ;
+# - le journal des profils modifiés par numéro. Un processus en retard rejoue les entrées
+#   manquantes (quelques profils relus en base) ; trop en retard, ou après un changement
+#   d'époque (rebuild), il recalcule tout.
+# Chaque modification de profil (signaux, actions d'admin) ajoute une entrée au journal sous un
+# verrou : une mise à jour qui ne l'obtient pas dans CANDIDATE_RANKING_LOCK_WAIT secondes est
+# confiée à la file des tâches, qui la rejoue plus tard.
+# Rotation équitable : l'ordre des sponsorisés est décalé d'une page à chaque période de
+# CANDIDATE_SPONSORED_ROTATION secondes, chacun passe ainsi à son tour en tête de liste.
+
+STATE_KEY = 'candidates:ranking:state'  # (époque, numéro de la dernière modification)
+LOCK_KEY = 'candidates:ranking:lock'
+RANK_FIELDS = ('is_sponsored', 'years_experience', 'created_at')
+MAX_REPLAY = 200  # Au-delà de ce retard, recalcul complet plutôt que rejeu du journal
+
+_local = {'state': None, 'ranking': None, 'built_at': 0.0}
+_local_lock = threading.Lock()
+
+
+class RankingBusy(Exception):
+    pass
+
+
+def ranking_cache():
+    return caches[settings.CANDIDATE_RANKING_CACHE]
+
+
+def change_key(epoch, number):
+    return f'candidates:ranking:{epoch}:{number}'
+
+
+def sort_key(pk, years_experience, created_at):
+    bucket = int(created_at.timestamp() // (settings.CANDIDATE_RECENCY_BUCKET_DAYS * 86400))
+    return (-bucket, -years_experience, -pk)
+
+
+def shared_state(cache):
+    state = cache.get(STATE_KEY)
+    if state is None:
+        cache.add(STATE_KEY, (uuid.uuid4().hex, 0), timeout=None)
+        state = cache.get(STATE_KEY) or (uuid.uuid4().hex, 0)
+    return state
+
+
+def build():
+    """Classement complet lu en base : {'sponsored': [...], 'regular': [...]}."""
+    from .models import CandidateProfile
+
+    ranking = {'sponsored': [], 'regular': []}
+    rows = CandidateProfile.objects.values_list('pk', *RANK_FIELDS).iterator(chunk_size=2000)
+    for pk, is_sponsored, years_experience, created_at in rows:
+        ranking['sponsored' if is_sponsored else 'regular'].append(sort_key(pk, years_experience, created_at))
+    for keys in ranking.values():
+        keys.sort()
+    return ranking
+
+
+def replaced(ranking, pks):
+    """Copie du classement où les profils donnés sont relus en base (retirés s'ils n'existent plus)."""
+    from .models import CandidateProfile
+
+    removed = {-pk for pk in pks}
+    ranking = {group: [key for key in keys if key[2] not in removed] for group, keys in ranking.items()}
+    rows = CandidateProfile.objects.filter(pk__in=list(pks)).values_list('pk', *RANK_FIELDS)
+    for pk, is_sponsored, years_experience, created_at in rows:
+        bisect.insort(ranking['sponsored' if is_sponsored else 'regular'], sort_key(pk, years_experience, created_at))
+    return ranking
+
+
+def _store(state, ranking, built_at=None):
+    with _local_lock:
+        _local.update(state=state, ranking=ranking, built_at=built_at or _local['built_at'])
+    return ranking
+
+
+def get_ranking():
+    """Classement du processus, mis à la version commune (rejeu du journal ou recalcul complet)."""
+    cache = ranking_cache()
+    state = shared_state(cache)  # Lu avant la base : une modification ultérieure sera rejouée
+    with _local_lock:
+        local_state, ranking, built_at = _local['state'], _local['ranking'], _local['built_at']
+    if ranking is not None and time.monotonic() - built_at < settings.CANDIDATE_RANKING_TIMEOUT:
+        if local_state == state:
+            return ranking
+        (epoch, number), (local_epoch, local_number) = state, local_state
+        if epoch == local_epoch and 0 < number - local_number <= MAX_REPLAY:
+            keys = [change_key(epoch, n) for n in range(local_number + 1, number + 1)]
+            changes = cache.get_many(keys)
+            if len(changes) == len(keys):
+                return _store(state, replaced(ranking, {pk for pks in changes.values() for pk in pks}))
+    return _store(state, build(), time.monotonic())
+
+
+def rebuild():
+    """Recalcul complet dans tous les processus (après un chargement en masse) : nouvelle époque."""
+    cache = ranking_cache()
+    state = (uuid.uuid4().hex, 0)
+    cache.set(STATE_KEY, state, timeout=None)
+    return _store(state, build(), time.monotonic())
+
+
+def acquire_lock(cache):
+    deadline = time.monotonic() + settings.CANDIDATE_RANKING_LOCK_WAIT
+    while not cache.add(LOCK_KEY, 1, timeout=30):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def update_profiles(pks):
+    """Signale aux processus les profils à replacer dans le classement ; verrou occupé trop
+    longtemps : la mise à jour est mise en file."""
+    if not record_change(pks):
+        enqueue('ranking.update_profiles', {'pks': sorted(pks)})
+
+
+@task('ranking.update_profiles')
+def update_profiles_task(payload, queued_task=None):
+    if not record_change(payload['pks']):
+        raise RankingBusy("Classement en cours de mise à jour, nouvelle tentative plus tard.")
+
+
+def record_change(pks):
+    """Ajoute les profils au journal et avance la version, sous le verrou ; False si le verrou n'a pas pu être pris."""
+    cache = ranking_cache()
+    if not acquire_lock(cache):
+        return False
+    try:
+        epoch, number = shared_state(cache)
+        cache.set(change_key(epoch, number + 1), sorted(pks), settings.CANDIDATE_RANKING_TIMEOUT)
+        cache.set(STATE_KEY, (epoch, number + 1), timeout=None)
+        return True
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def current_rotation():
+    return int(time.time() // settings.CANDIDATE_SPONSORED_ROTATION)
+
+
+def rotated(keys, rotation, page_size):
+    if not keys:
+        return keys
+    shift = rotation * page_size % len(keys)
+    return keys[shift:] + keys[:shift]
+
+
+def page_ids(position, page_size, rotation):
+    """(ids de la page commençant à `position`, nombre total de candidats) dans l'ordre de `rotation`."""
+    ranking = get_ranking()
+    sponsored = rotated(ranking['sponsored'], rotation, page_size)
+    end = position + page_size
+    keys = sponsored[position:end] + ranking['regular'][max(position - len(sponsored), 0):max(end - len(sponsored), 0)]
+    return [-key[2] for key in keys], len(sponsored) + len(ranking['regular'])
+
+
+def sponsored_first(candidate_ids, page_size):
+    """Réordonne des résultats de recherche : sponsorisés d'abord (ordre de rotation), puis les autres."""
+    wanted = set(candidate_ids)
+    sponsored = [-key[2] for key in rotated(get_ranking()['sponsored'], current_rotation(), page_size)]
+    first = [pk for pk in sponsored if pk in wanted]
+    chosen = set(first)
+    return first + [pk for pk in candidate_ids if pk not in chosen]
+
+
+def parse_cursor(cursor):
+    """Curseur de parcours : (période de rotation, position) ; la rotation reste figée pendant le parcours."""
+    if not cursor:
+        return current_rotation(), 0
+    values = decode_cursor(cursor)
+    if len(values) != 2 or not all(isinstance(value, int) and value >= 0 for value in values):
+        raise Http404("Curseur de pagination invalide.")
+    return values[0], values[1]
@@ -0,0 +1,122 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+
+from .metrics import registry
+
+# Limitation de débit par seau à jetons, avant toute vue et toute requête SQL.
+# settings.RATE_LIMITS associe un nom de vue à des débits « N/s|m|h » par portée :
+# - « ip » : adresse du client (seule clé possible pour un robot sans session) ;
+# - « user » : cookie de session, donc par utilisateur connecté, sans lire la base ; ou, si la
+#   vue déclare « user_field », l'identifiant soumis dans ce champ POST (connexion : un client
+#   qui abandonne ses cookies retrouve le même seau pour le même compte visé).
+# Un seau contient au plus N jetons et se remplit de N jetons par période ; chaque requête
+# en consomme un. Les seaux vivent dans le cache local du processus (alias « ratelimit »).
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600}
+
+registry.describe('eeuez_ratelimit_rejected_total', 'counter', "Requêtes refusées (429) par la limitation de débit.")
+
+_lock = threading.Lock()  # Lecture-modification-écriture des seaux, partagés par les threads du processus
+
+
+def parse_rate(rate):
+    """« 60/m » -> (capacité 60, 1 jeton par seconde)."""
+    count, _, period = rate.partition('/')
+    count = int(count)
+    return count, count / PERIODS[period]
+
+
+def take(key, capacity, refill):
+    """Consomme un jeton du seau `key` ; renvoie 0, ou le délai en secondes avant le prochain jeton."""
+    cache = caches[settings.RATE_LIMIT_CACHE]
+    now = time.monotonic()
+    timeout = math.ceil(capacity / refill) + 1  # Seau plein au-delà : inutile de le garder
+    with _lock:
+        tokens, stamp = cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - stamp) * refill)
+        if tokens >= 1:
+            cache.set(key, (tokens - 1, now), timeout)
+            return 0
+        cache.set(key, (tokens, now), timeout)
+    return (1 - tokens) / refill
+
+
+def client_ip(request):
+    """Adresse du client ; derrière RATE_LIMIT_PROXY_COUNT mandataires, lue dans X-Forwarded-For."""
+    proxies = settings.RATE_LIMIT_PROXY_COUNT
+    if proxies:
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _digest(value):
+    return hashlib.blake2b(value.encode(), digest_size=12).hexdigest()
+
+
+def identities(request, scope, limits):
+    if scope == 'ip':
+        return client_ip(request)
+    field = limits.get('user_field')
+    if field:
+        submitted = request.POST.get(field, '').strip().casefold()
+        if submitted:
+            return 'field:' + _digest(submitted)
+    session = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return 'session:' + _digest(session) if session else None
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        "Trop de requêtes, veuillez réessayer dans quelques instants.\n",
+        status=429, content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+class RateLimitMiddleware:
+    """Refuse en 429 les requêtes au-delà du débit configuré ; à placer avant sessions et authentification."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.RATE_LIMIT_ENABLED:
+            response = self.check(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def check(self, request):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        limits = settings.RATE_LIMITS.get(match.view_name)
+        if not limits or request.method not in limits.get('methods', ('GET', 'HEAD', 'POST')):
+            return None
+        wait = 0
+        for scope in ('ip', 'user'):
+            if scope not in limits:
+                continue
+            identity = identities(request, scope, limits)
+            if not identity:
+                continue
+            capacity, refill = parse_rate(limits[scope])
+            delay = take(f"rl:{match.view_name}:{scope}:{identity}", capacity, refill)
+            if delay:
+                registry.inc('eeuez_ratelimit_rejected_total', (('view', match.view_name), ('scope', scope)))
+                wait = max(wait, delay)
+        if wait:
+            request.resolver_match = match  # Étiquette de vue des métriques de la requête refusée
+            return too_many_requests(wait)
+        return None
@@ -0,0 +1,226 @@
+import asyncio
+import datetime
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+# Diffusion en temps réel (messages, notifications) vers les navigateurs connectés en
+# server-sent events. Chaque connexion est une coroutine en attente sur sa file asyncio :
+# pas de thread par client ni de requête de scrutation. Le courtier est configurable via
+# settings.REALTIME_BROKER :
+#  - InProcessBroker ne relaie que les événements publiés dans le même processus ;
+#  - DatabaseRelayBroker (par défaut) relaie entre processus : les événements publiés par le
+#    worker run_tasks (notifications de masse) ou par un autre worker web passent par la table
+#    RealtimeEvent. Seuls les destinataires connectés à un processus servant des flux y sont
+#    écrits (registre des connexions dans le cache « coordination ») ; chaque processus ne relit
+#    la table que lorsque l'horodatage du dernier événement publié a changé. La table est purgée
+#    par run_tasks (purge_relay).
+
+logger = logging.getLogger(__name__)
+
+
+class BaseBroker:
+    def publish(self, user_id, event):
+        """Publie `event` (dict sérialisable) à toutes les connexions de `user_id`. Appelable depuis un thread."""
+        raise NotImplementedError
+
+    def publish_many(self, user_ids, event):
+        for user_id in user_ids:
+            self.publish(user_id, event)
+
+    def subscribe(self, user_id):
+        """Gestionnaire de contexte asynchrone renvoyant une asyncio.Queue d'événements."""
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or settings.REALTIME_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)  # user_id -> {(boucle, file)}
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                pass  # Boucle fermée : l'abonnement sera retiré à la déconnexion
+
+    @staticmethod
+    def _deliver(queue, event):
+        if queue.full():
+            # Client trop lent : on sacrifie l'événement le plus ancien plutôt que la mémoire
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers[user_id].add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers[user_id].discard(entry)
+                if not self._subscribers[user_id]:
+                    del self._subscribers[user_id]
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._subscribers.values())
+
+
+SERVERS_KEY = 'realtime:servers'  # {jeton du processus: expiration} des processus servant des flux
+STAMP_KEY = 'realtime:last-event'  # Change à chaque écriture dans RealtimeEvent
+
+
+def server_key(token):
+    return f'realtime:server:{token}'  # Utilisateurs connectés à ce processus
+
+
+def connected_users():
+    """Utilisateurs ayant au moins un flux ouvert, tous processus confondus (lecture du registre)."""
+    coordination = caches['coordination']
+    now = time.time()
+    servers = coordination.get(SERVERS_KEY) or {}
+    keys = [server_key(token) for token, expires in servers.items() if expires > now]
+    return set().union(*coordination.get_many(keys).values()) if keys else set()
+
+
+def purge_relay():
+    """Supprime les événements relayés plus vieux que REALTIME_RELAY_RETENTION ; renvoie leur nombre."""
+    from .models import RealtimeEvent
+
+    limit = timezone.now() - datetime.timedelta(seconds=settings.REALTIME_RELAY_RETENTION)
+    return RealtimeEvent.objects.filter(created_at__lt=limit).delete()[0]
+
+
+class DatabaseRelayBroker(InProcessBroker):
+    """Relais entre processus par la table RealtimeEvent.
+
+    Un thread par processus servant des flux inscrit ses utilisateurs connectés dans le registre,
+    puis remet aux files locales les événements qui leur sont destinés. Publier vers des
+    utilisateurs qui ne sont connectés nulle part n'écrit rien.
+    """
+
+    def __init__(self, queue_size=None):
+        super().__init__(queue_size)
+        self._poller = None
+        self._token = uuid.uuid4().hex
+        self._registered = (frozenset(), 0.0)  # (utilisateurs inscrits, date de l'inscription)
+
+    def publish(self, user_id, event):
+        self.publish_many([user_id], event)
+
+    def publish_many(self, user_ids, event):
+        from .models import RealtimeEvent
+
+        connected = connected_users()
+        recipients = [user_id for user_id in user_ids if user_id in connected]
+        if not recipients:
+            return
+        RealtimeEvent.objects.bulk_create([RealtimeEvent(user_id=user_id, event=event) for user_id in recipients], batch_size=500)
+        caches['coordination'].set(STAMP_KEY, time.time_ns())
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        with self._lock:
+            if self._poller is None or not self._poller.is_alive():
+                self._poller = threading.Thread(target=self._run, name='realtime-relay', daemon=True)
+                self._poller.start()
+        async with super().subscribe(user_id) as queue:
+            yield queue
+
+    def _run(self):
+        coordination = caches['coordination']
+        last_pk = seen = None
+        while True:
+            time.sleep(settings.REALTIME_RELAY_INTERVAL)
+            try:
+                with self._lock:
+                    listening = frozenset(self._subscribers)
+                self._register(coordination, listening)
+                if not listening:
+                    last_pk = seen = None  # Reprise au dernier événement à la prochaine connexion
+                    continue
+                stamp = coordination.get(STAMP_KEY)  # Lu avant la table : rien ne peut être manqué
+                if last_pk is None:
+                    last_pk = self._last_pk()
+                elif stamp != seen:
+                    last_pk = self._relay(last_pk, listening)
+                seen = stamp
+            except Exception:
+                logger.exception("Relais temps réel : lecture des événements impossible")
+            finally:
+                close_old_connections()
+
+    def _register(self, coordination, listening):
+        """Inscrit (ou retire) les utilisateurs connectés ici ; réécrit au plus toutes les ttl/2 secondes."""
+        ttl = max(5.0, 5 * settings.REALTIME_RELAY_INTERVAL)
+        registered, refreshed = self._registered
+        now = time.time()
+        if listening == registered and (not listening or now - refreshed < ttl / 2):
+            return
+        # Lecture-modification-écriture du registre : une inscription écrasée par un autre
+        # processus est rétablie au tour suivant
+        servers = {token: expires for token, expires in (coordination.get(SERVERS_KEY) or {}).items() if expires > now}
+        if listening:
+            coordination.set(server_key(self._token), listening, timeout=ttl)
+            servers[self._token] = now + ttl
+        else:
+            coordination.delete(server_key(self._token))
+            servers.pop(self._token, None)
+        coordination.set(SERVERS_KEY, servers)
+        self._registered = (listening, now)
+
+    @staticmethod
+    def _last_pk():
+        from .models import RealtimeEvent
+
+        return RealtimeEvent.objects.aggregate(last=Max('pk'))['last'] or 0
+
+    def _relay(self, last_pk, listening):
+        """Remet les événements postérieurs à `last_pk` ; renvoie le nouveau point de reprise."""
+        from .models import RealtimeEvent
+
+        rows = RealtimeEvent.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'user_id', 'event')
+        for pk, user_id, event in rows.iterator(chunk_size=500):
+            if user_id in listening:
+                super().publish(user_id, event)
+            last_pk = pk
+        return last_pk
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.REALTIME_BROKER)()
+
+
+def publish(user_ids, event_type, data):
+    """Publie un événement après validation de la transaction courante."""
+    event = {'type': event_type, 'data': data}
+    user_ids = list(user_ids)
+
+    def send():
+        get_broker().publish_many(user_ids, event)
+
+    transaction.on_commit(send)
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
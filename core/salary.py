@@ -0,0 +1,131 @@
+import re
+
+from django.conf import settings
+
+from .text import fold
+
+# Analyse du champ libre JobOffer.salary (« 50,000 FCFA/mois », « 1,2 M - 1,5 M FCFA par an »,
+# « 800 €/mois », « À négocier »…) en colonnes numériques. salary_monthly, le montant mensuel
+# en devise de référence (milieu de la fourchette), est indexé pour filtrer et trier.
+
+# Multiplicateurs vers un montant mensuel, par valeur de JobOffer.salary_period (temps plein : 173 h, 22 jours ouvrés par mois)
+MONTHLY_FACTORS = {
+    'hour': 173,
+    'day': 22,
+    'week': 52 / 12,
+    'month': 1,
+    'year': 1 / 12,
+}
+
+PERIOD_PATTERNS = [
+    ('hour', re.compile(r"\b(?:heure|horaire|hour|hr)\b|/\s*h\b")),
+    ('day', re.compile(r"\b(?:jour|journalier|journee|day|daily)s?\b")),
+    ('week', re.compile(r"\b(?:semaine|hebdo\w*|week\w*)\b")),
+    ('year', re.compile(r"\b(?:an|ans|annee|annuel\w*|year\w*|yearly|annum|pa)\b")),
+    ('month', re.compile(r"\b(?:mois|mensuel\w*|month\w*|mo)\b")),
+]
+
+CURRENCY_PATTERNS = [
+    ('XAF', re.compile(r"\b(?:f\s?cfa|cfa|xaf|xof|fcfa|francs?)\b|\bf\b")),
+    ('EUR', re.compile(r"€|\b(?:eur|euros?)\b")),
+    ('USD', re.compile(r"\$|\b(?:usd|dollars?)\b")),
+]
+
+# Nombre avec séparateurs de milliers (espaces, points, virgules) et décimales éventuelles
+# (« 1 500,50 »), ou nombre simple, suivi d'un éventuel multiplicateur (« 150k », « 1,5 million »)
+GROUPED_RE = r"\d{1,3}(?:[ .,\u00a0\u202f']\d{3})+(?:[.,]\d{1,2})?(?!\d)"
+AMOUNT_RE = re.compile(
+    rf"({GROUPED_RE}|\d+(?:[.,]\d+)?)(?:\s*(k|m|millions?|mille|mil)(?![a-z]))?"
+)
+MULTIPLIERS = {'k': 1_000, 'mille': 1_000, 'mil': 1_000, 'm': 1_000_000, 'million': 1_000_000, 'millions': 1_000_000}
+
+# Nombres qui ne sont pas des montants : ordinaux (« 13e mois », « 1er ») et durées
+# d'expérience (« 2 ans d'expérience »), retirés avant l'analyse des montants et de la période
+NOT_AMOUNT_RE = re.compile(
+    r"\b\d+\s?(?:er|ere|eme|e|nd|nde|th)\b(?:\s+mois)?"
+    r"|\b\d{1,2}\s*(?:ans?|annees?|years?|yrs?)\b(?:\s+(?:d'\s?|de\s+|of\s+)?(?:exp\w*|anciennete))?"
+)
+# Montant négligeable devant le plus grand (prime, reste d'un texte) : écarté
+MIN_AMOUNT_RATIO = 0.05
+
+EMPTY = {
+    'salary_min': None,
+    'salary_max': None,
+    'salary_currency': '',
+    'salary_period': '',
+    'salary_monthly': None,
+}
+FIELDS = list(EMPTY)
+
+
+def _number(text):
+    if re.fullmatch(GROUPED_RE, text):
+        # Séparateurs de milliers, puis décimales éventuelles après le dernier groupe de 3 chiffres
+        decimals = re.search(r"(?<=\d{3})[.,](\d{1,2})$", text)
+        integer = text[:decimals.start()] if decimals else text
+        return float(re.sub(r"\D", '', integer)) + (float('0.' + decimals.group(1)) if decimals else 0)
+    return float(text.replace(',', '.'))
+
+
+def parse_amounts(text):
+    """Montants trouvés dans le texte, multiplicateurs appliqués (« 100-150k » -> [100000, 150000])."""
+    found = []
+    for match in AMOUNT_RE.finditer(NOT_AMOUNT_RE.sub(' ', text)):
+        found.append((_number(match.group(1)), MULTIPLIERS.get(match.group(2) or '')))
+    if not found:
+        return []
+    # Fourchette dont seule la dernière borne porte le multiplicateur : il vaut pour toutes
+    last = found[-1][1]
+    amounts = []
+    for value, multiplier in found:
+        if multiplier is None and last and value * last <= found[-1][0] * last * 10:
+            multiplier = last
+        amounts.append(value * (multiplier or 1))
+    largest = max(amounts)
+    return [amount for amount in amounts if amount >= 1 and amount >= largest * MIN_AMOUNT_RATIO]
+
+
+def parse_salary(text):
+    """Colonnes salary_* de JobOffer tirées du texte libre ; valeurs vides si aucun montant."""
+    folded = NOT_AMOUNT_RE.sub(' ', fold(text))
+    amounts = parse_amounts(folded)
+    if not amounts:
+        return dict(EMPTY)
+    low, high = min(amounts[:2]), max(amounts[:2])
+    period = next((name for name, pattern in PERIOD_PATTERNS if pattern.search(folded)), 'month')
+    currency = next((code for code, pattern in CURRENCY_PATTERNS if pattern.search(folded)), settings.SALARY_BASE_CURRENCY)
+    rate = 1 if currency == settings.SALARY_BASE_CURRENCY else settings.SALARY_EXCHANGE_RATES.get(currency)
+    monthly = None
+    if rate is not None:
+        monthly = round((low + high) / 2 * MONTHLY_FACTORS[period] * rate)
+    return {
+        'salary_min': round(low),
+        'salary_max': round(high),
+        'salary_currency': currency,
+        'salary_period': period,
+        'salary_monthly': monthly,
+    }
+
+
+def filter_offers(queryset, params):
+    """Filtre de salaire mensuel (?salary_min=, ?salary_max=) ; renvoie (queryset, {paramètre: valeur})."""
+    active = {}
+    for param, lookup in (('salary_min', 'gte'), ('salary_max', 'lte')):
+        value = params.get(param, '')
+        if value.isdigit():
+            queryset = queryset.filter(**{f'salary_monthly__{lookup}': int(value)})
+            active[param] = value
+    return queryset, active
+
+
+SORTS = {
+    'salary_desc': ('-salary_monthly', '-id'),
+    'salary_asc': ('salary_monthly', 'id'),
+}
+
+
+def sorted_offers(queryset, sort):
+    """Ordre de pagination pour le tri demandé (None : ordre par défaut) ; exclut les salaires inconnus."""
+    if sort not in SORTS:
+        return queryset, None
+    return queryset.filter(salary_monthly__isnull=False), SORTS[sort]
@@ -0,0 +1,276 @@
+import bisect
+import math
+import sys
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, connections, router
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .text import tokenize
+
+# Recherche plein texte classée sur les offres d'emploi validées.
+# Le moteur est configurable via settings.SEARCH_BACKEND :
+#  - SqliteFTSBackend : table virtuelle FTS5 (tokenizer unicode61 sans accents) ;
+#  - InMemoryIndexBackend : index inversé en mémoire du processus.
+# Par défaut FTS5 si la base est SQLite, l'index en mémoire sinon.
+
+FTS_TABLE = 'core_joboffer_fts'
+
+# Poids des champs pour le classement : un mot du titre compte plus qu'un mot de la description.
+FIELD_WEIGHTS = {
+    'title': 10.0,
+    'description': 1.0,
+    'location': 4.0,
+    'category': 6.0,
+}
+FIELDS = tuple(FIELD_WEIGHTS)
+
+
+def offer_documents(pks=None):
+    """Renvoie (id, champs) pour les offres validées, sans instancier de modèles."""
+    from .models import JobOffer
+
+    queryset = JobOffer.objects.filter(is_validated=True)
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+    rows = queryset.values_list('pk', 'title', 'description', 'location', 'category__name')
+    for pk, title, description, location, category in rows.iterator(chunk_size=2000):
+        yield pk, {
+            'title': title or '',
+            'description': description or '',
+            'location': location or '',
+            'category': category or '',
+        }
+
+
+class BaseSearchBackend:
+    def index(self, pks):
+        """(Ré)indexe les offres données ; celles non validées sont retirées de l'index."""
+        raise NotImplementedError
+
+    def remove(self, pks):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def search(self, query, limit=20, offset=0, queryset=None):
+        """Renvoie les identifiants d'offres classés par pertinence décroissante.
+
+        `queryset` (offres filtrées, par facettes par exemple) restreint les résultats avant la
+        pagination : une page reste pleine tant qu'il existe des offres correspondantes.
+        """
+        raise NotImplementedError
+
+    def matching(self, queryset, query):
+        """Restreint `queryset` aux offres correspondant à `query`, sans classement : pour un tri
+        imposé (salaire) appliqué ensuite par la base et paginé par curseur."""
+        return queryset.filter(pk__in=self.search(query, limit=sys.maxsize, queryset=queryset))
+
+
+class SqliteFTSBackend(BaseSearchBackend):
+    def index(self, pks):
+        pks = list(pks)
+        if not pks:
+            return
+        with connection.cursor() as cursor:
+            self._delete(cursor, pks)
+            self._insert(cursor, offer_documents(pks))
+
+    def remove(self, pks):
+        pks = list(pks)
+        if pks:
+            with connection.cursor() as cursor:
+                self._delete(cursor, pks)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            self._insert(cursor, offer_documents())
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+    def search(self, query, limit=20, offset=0, queryset=None):
+        match = self.match_expression(query)
+        if not match:
+            return []
+        weights = ', '.join(str(FIELD_WEIGHTS[field]) for field in FIELDS)
+        from .models import JobOffer
+
+        # Lecture : suit le routage des offres (base « replica » dans les vues de consultation)
+        alias = router.db_for_read(JobOffer)
+        restriction, restriction_params = '', []
+        if queryset is not None:
+            # Filtres de l'offre dans la même requête, avant LIMIT/OFFSET
+            subquery, restriction_params = queryset.values('pk').order_by().query.get_compiler(using=alias).as_sql()
+            restriction = f"AND rowid IN ({subquery}) "
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s {restriction}"
+                f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid DESC LIMIT %s OFFSET %s",
+                [match, *restriction_params, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def matching(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+
+    @staticmethod
+    def match_expression(query):
+        # Chaque mot devient un terme entre guillemets (pas d'injection de syntaxe FTS),
+        # le dernier est en préfixe pour la saisie en cours ("develop" -> "développeur").
+        terms = tokenize(query)
+        if not terms:
+            return ''
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    @staticmethod
+    def _delete(cursor, pks):
+        for start in range(0, len(pks), 500):
+            chunk = pks[start:start + 500]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+
+    @staticmethod
+    def _insert(cursor, documents):
+        columns = ', '.join(FIELDS)
+        placeholders = ', '.join(['%s'] * (len(FIELDS) + 1))
+        sql = f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({placeholders})"
+        batch = []
+        for pk, fields in documents:
+            batch.append([pk] + [fields[field] for field in FIELDS])
+            if len(batch) >= 1000:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+class InMemoryIndexBackend(BaseSearchBackend):
+    """Index inversé local au processus, construit à la première recherche."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = None  # terme -> {offer_id: poids}
+        self._documents = {}  # offer_id -> ensemble des termes (pour la suppression)
+        self._vocabulary = []  # termes triés, pour la recherche par préfixe
+
+    def _ensure_built(self):
+        if self._postings is None:
+            self.rebuild()
+
+    def rebuild(self):
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._documents = {}
+            for pk, fields in offer_documents():
+                self._add(pk, fields)
+            self._vocabulary = sorted(self._postings)
+
+    def index(self, pks):
+        pks = list(pks)
+        with self._lock:
+            if self._postings is None:
+                return
+            self._discard(pks)
+            for pk, fields in offer_documents(pks):
+                self._add(pk, fields)
+            self._vocabulary = sorted(self._postings)
+
+    def remove(self, pks):
+        with self._lock:
+            if self._postings is not None:
+                self._discard(list(pks))
+                self._vocabulary = sorted(self._postings)
+
+    def search(self, query, limit=20, offset=0, queryset=None):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        allowed = set(queryset.values_list('pk', flat=True)) if queryset is not None else None
+        with self._lock:
+            self._ensure_built()
+            total = len(self._documents) or 1
+            scores = None
+            # Le dernier mot est traité comme un préfixe, les autres comme des mots exacts.
+            for position, term in enumerate(terms):
+                if position == len(terms) - 1:
+                    candidates = self._prefix_terms(term)
+                else:
+                    candidates = [term] if term in self._postings else []
+                term_scores = defaultdict(float)
+                for candidate in candidates:
+                    postings = self._postings[candidate]
+                    idf = math.log(1 + total / len(postings))
+                    for pk, weight in postings.items():
+                        term_scores[pk] += weight * idf
+                if allowed is not None:
+                    term_scores = {pk: score for pk, score in term_scores.items() if pk in allowed}
+                if scores is None:
+                    scores = dict(term_scores)
+                else:
+                    scores = {pk: score + term_scores[pk] for pk, score in scores.items() if pk in term_scores}
+                if not scores:
+                    return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return [pk for pk, _ in ranked[offset:offset + limit]]
+
+    def _prefix_terms(self, prefix):
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _add(self, pk, fields):
+        terms = set()
+        for field, text in fields.items():
+            for term in tokenize(text):
+                postings = self._postings[term]
+                postings[pk] = postings.get(pk, 0.0) + FIELD_WEIGHTS[field]
+                terms.add(term)
+        self._documents[pk] = terms
+
+    def _discard(self, pks):
+        for pk in pks:
+            for term in self._documents.pop(pk, ()):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(pk, None)
+                    if not postings:
+                        del self._postings[term]
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    backend = import_string(settings.SEARCH_BACKEND)
+    if issubclass(backend, SqliteFTSBackend) and connection.vendor != 'sqlite':
+        # La table FTS5 n'est créée que sur SQLite (migration 0002)
+        backend = InMemoryIndexBackend
+    return backend()
+
+
+def index_offers(pks):
+    get_backend().index(pks)
+
+
+def remove_offers(pks):
+    get_backend().remove(pks)
+
+
+def search_offers(query, limit=20, offset=0, queryset=None):
+    return get_backend().search(query, limit=limit, offset=offset, queryset=queryset)
+
+
+def matching_offers(queryset, query):
+    return get_backend().matching(queryset, query)
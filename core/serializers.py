@@ -0,0 +1,41 @@
+from rest_framework import serializers
+
+from .models import Category, Guide, JobOffer
+
+
+class SparseFieldsetMixin:
+    """Restreint les champs renvoyés à ceux demandés par ?fields=a,b,c."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request is not None else None
+        if requested:
+            wanted = {name.strip() for name in requested.split(',') if name.strip()}
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ['id', 'name', 'description', 'updated_at']
+
+
+class JobOfferSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    category_name = serializers.CharField(source='category.name', default=None, read_only=True)
+    url = serializers.HyperlinkedIdentityField(view_name='job_offer_detail')
+
+    class Meta:
+        model = JobOffer
+        fields = [
+            'id', 'title', 'description', 'category', 'category_name', 'location', 'salary',
+            'salary_min', 'salary_max', 'salary_currency', 'salary_period', 'salary_monthly',
+            'experience_required', 'created_at', 'updated_at', 'url',
+        ]
+
+
+class GuideSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Guide
+        fields = ['id', 'title', 'content', 'category', 'created_at', 'updated_at']
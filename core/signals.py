@@ -0,0 +1,231 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import caching, dedup, facets, notifications, ranking, realtime, salary, search, stats, tasks, testimonials, uploads  # noqa: F401 (enregistre les tâches)
+from .skills import sync_profile_skills
+from .models import Application, CandidateProfile, CandidateSkill, Category, FacetCount, JobOffer, Notification, Skill, Testimonial
+
+
+# Index de recherche : mis à jour après le commit pour ne jamais indexer une écriture annulée
+@receiver(post_save, sender=JobOffer)
+def index_job_offer(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: search.index_offers([pk]))
+
+
+@receiver(post_delete, sender=JobOffer)
+def unindex_job_offer(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: search.remove_offers([pk]))
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_offers(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    pks = list(instance.joboffer_set.filter(is_validated=True).values_list('pk', flat=True))
+    transaction.on_commit(lambda: search.index_offers(pks))
+
+
+@receiver(pre_delete, sender=Category)
+def reindex_orphaned_offers(sender, instance, **kwargs):
+    # La suppression passe category à NULL sans signal sur les offres
+    pks = list(instance.joboffer_set.filter(is_validated=True).values_list('pk', flat=True))
+    transaction.on_commit(lambda: search.index_offers(pks))
+
+
+# Cache des pages publiques : nouvelle génération à chaque changement d'offre ou de catégorie
+@receiver(post_save, sender=JobOffer)
+@receiver(post_delete, sender=JobOffer)
+def invalidate_offer_pages(sender, instance, raw=False, **kwargs):
+    if not raw:
+        pk = instance.pk
+        transaction.on_commit(lambda: caching.invalidate_offers([pk]))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(caching.invalidate_offers)
+
+
+# Correspondance candidats/offres : recalcul de la seule ligne ou colonne modifiée, par le worker.
+# La validation d'une offre déclenche en plus la diffusion des notifications aux candidats concernés.
+@receiver(pre_save, sender=JobOffer)
+def remember_validation_state(sender, instance, raw=False, **kwargs):
+    instance._was_validated = False
+    instance._previous_facets = []
+    if raw:
+        return
+    derived = facets.derived_fields(instance.location, instance.experience_required)
+    derived.update(salary.parse_salary(instance.salary))
+    for field, value in derived.items():
+        setattr(instance, field, value)
+    if instance.pk is None:
+        return
+    previous = JobOffer.objects.filter(pk=instance.pk).values_list(
+        'is_validated', 'category_id', 'location_normalized', 'experience_years'
+    ).first()
+    if previous is not None and previous[0]:
+        instance._was_validated = True
+        instance._previous_facets = facets.offer_keys(*previous[1:])
+
+
+@receiver(post_save, sender=JobOffer)
+def rematch_job_offer(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.is_validated and not getattr(instance, '_was_validated', False):
+        tasks.enqueue('notifications.offer_validated', {'offer_id': instance.pk})
+    else:
+        tasks.enqueue('matching.refresh_offer', {'offer_id': instance.pk})
+
+
+@receiver(post_save, sender=JobOffer)
+def check_duplicate_offer(sender, instance, raw=False, **kwargs):
+    # Signature MinHash et seaux LSH recalculés par le worker (core.dedup)
+    if not raw:
+        tasks.enqueue('dedup.check_offer', {'offer_id': instance.pk})
+
+
+# Compteurs de facettes : delta entre l'état avant et après l'enregistrement (offres validées seulement)
+@receiver(post_save, sender=JobOffer)
+def count_offer_facets(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    current = facets.offer_keys(instance.category_id, instance.location_normalized, instance.experience_years)
+    labels = {('location', instance.location_normalized): facets.normalize_location(instance.location)[1]}
+    facets.apply_change(getattr(instance, '_previous_facets', []), current if instance.is_validated else [], labels)
+
+
+@receiver(post_delete, sender=JobOffer)
+def uncount_offer_facets(sender, instance, **kwargs):
+    if instance.is_validated:
+        facets.apply_change(
+            facets.offer_keys(instance.category_id, instance.location_normalized, instance.experience_years), []
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def drop_category_facet(sender, instance, **kwargs):
+    FacetCount.objects.filter(facet='category', value=str(instance.pk)).delete()
+
+
+@receiver(post_delete, sender=JobOffer)
+def unmatch_job_offer(sender, instance, **kwargs):
+    tasks.enqueue('matching.refresh_offer', {'offer_id': instance.pk})
+
+
+@receiver(post_save, sender=CandidateProfile)
+def rematch_candidate(sender, instance, raw=False, **kwargs):
+    if not raw:
+        tasks.enqueue('matching.refresh_candidate', {'candidate_id': instance.pk})
+
+
+@receiver(post_delete, sender=CandidateProfile)
+def unmatch_candidate(sender, instance, **kwargs):
+    tasks.enqueue('matching.refresh_candidate', {'candidate_id': instance.pk})
+
+
+# Taxonomie des compétences : liens normalisés tenus à jour avec le champ texte
+@receiver(post_save, sender=CandidateProfile)
+def sync_candidate_skills(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_profile_skills(instance)
+
+
+@receiver(pre_delete, sender=CandidateProfile)
+def release_candidate_skills(sender, instance, **kwargs):
+    skill_ids = CandidateSkill.objects.filter(candidate=instance).values_list('skill_id', flat=True)
+    Skill.objects.filter(pk__in=list(skill_ids)).update(candidate_count=F('candidate_count') - 1)
+
+
+# Classement des candidats (core.ranking) : mis à jour quand un critère de tri change
+@receiver(pre_save, sender=CandidateProfile)
+def remember_candidate_rank(sender, instance, raw=False, **kwargs):
+    instance._previous_rank = None
+    if not raw and instance.pk is not None:
+        instance._previous_rank = CandidateProfile.objects.filter(pk=instance.pk).values_list(*ranking.RANK_FIELDS).first()
+
+
+@receiver(post_save, sender=CandidateProfile)
+def rerank_candidate(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if getattr(instance, '_previous_rank', None) != tuple(getattr(instance, field) for field in ranking.RANK_FIELDS):
+        pk = instance.pk
+        transaction.on_commit(lambda: ranking.update_profiles([pk]))
+
+
+@receiver(post_delete, sender=CandidateProfile)
+def unrank_candidate(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: ranking.update_profiles([pk]))
+
+
+# Temps réel : pousse les notifications créées une à une (les lots sont publiés par leur tâche)
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        realtime.publish([instance.user_id], 'notification', {
+            'content': instance.content,
+            'offer': instance.related_offer_id,
+        })
+
+
+# Statistiques de candidatures : un delta par création, changement de statut ou suppression
+@receiver(pre_save, sender=Application)
+def remember_application_status(sender, instance, raw=False, **kwargs):
+    instance._previous = None
+    if not raw and instance.pk is not None:
+        instance._previous = Application.objects.filter(pk=instance.pk).values_list('job_offer_id', 'status').first()
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', None)
+    if previous is None:
+        stats.apply_delta(instance.job_offer_id, stats.status_delta(instance.status, 1))
+    elif previous != (instance.job_offer_id, instance.status):
+        stats.apply_delta(previous[0], stats.status_delta(previous[1], -1))
+        stats.apply_delta(instance.job_offer_id, stats.status_delta(instance.status, 1))
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    stats.apply_delta(instance.job_offer_id, stats.status_delta(instance.status, -1))
+
+
+# Carrousel de l'accueil : reconstruit quand un témoignage approuvé apparaît, change ou disparaît
+CAROUSEL_FIELDS = ('display_name', 'content', 'rating', 'created_at', 'is_approved')
+
+
+@receiver(pre_save, sender=Testimonial)
+def remember_testimonial(sender, instance, raw=False, **kwargs):
+    instance._previous = None
+    if not raw and instance.pk is not None:
+        instance._previous = Testimonial.objects.filter(pk=instance.pk).values(*CAROUSEL_FIELDS).first()
+
+
+@receiver(post_save, sender=Testimonial)
+def refresh_carousel_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', None) or {'is_approved': False}
+    if not (instance.is_approved or previous['is_approved']):
+        return  # Témoignage en attente de modération : absent du carrousel
+    if previous != {field: getattr(instance, field) for field in CAROUSEL_FIELDS}:
+        transaction.on_commit(testimonials.refresh)
+
+
+@receiver(post_delete, sender=Testimonial)
+def refresh_carousel_on_delete(sender, instance, **kwargs):
+    if instance.is_approved:
+        transaction.on_commit(testimonials.refresh)
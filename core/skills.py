@@ -0,0 +1,144 @@
+import re
+
+from django.db import transaction
+from django.db.models import F
+
+from .text import fold
+
+# Taxonomie des compétences : forme canonique, synonymes et listes de candidats par compétence.
+
+SEPARATORS_RE = re.compile(r"[,;\n/|]+")
+# On garde + # et . qui distinguent C, C++, C# ou Node.js
+NOISE_RE = re.compile(r"[^\w+#. ]+")
+SPACES_RE = re.compile(r"\s+")
+
+
+def canonical_key(label):
+    """Forme canonique d'un libellé : "  Node.JS " -> "node.js", "Développement  Web" -> "developpement web"."""
+    key = NOISE_RE.sub(' ', fold(label))
+    return SPACES_RE.sub(' ', key).strip(' .')
+
+
+def parse_skills(text):
+    """Découpe le champ libre des compétences en libellés distincts, dans l'ordre."""
+    labels = {}
+    for part in SEPARATORS_RE.split(text or ''):
+        label = SPACES_RE.sub(' ', part).strip()
+        key = canonical_key(label)
+        if key and len(key) <= 100 and key not in labels:
+            labels[key] = label[:100]
+    return labels
+
+
+def resolve_skills(labels, create=True, cache=None):
+    """Associe {clé canonique: libellé} aux objets Skill, en passant par les synonymes.
+
+    `cache` (dict clé -> Skill) évite de refaire les mêmes requêtes lors d'un traitement par lots.
+    """
+    from .models import Skill, SkillAlias
+
+    cache = {} if cache is None else cache
+    missing = [key for key in labels if key not in cache]
+    if missing:
+        for alias in SkillAlias.objects.filter(alias__in=missing).select_related('skill'):
+            cache[alias.alias] = alias.skill
+        missing = [key for key in missing if key not in cache]
+    if missing:
+        for skill in Skill.objects.filter(slug__in=missing):
+            cache[skill.slug] = skill
+        missing = [key for key in missing if key not in cache]
+    if missing and create:
+        Skill.objects.bulk_create(
+            [Skill(slug=key, name=labels[key]) for key in missing], ignore_conflicts=True
+        )
+        for skill in Skill.objects.filter(slug__in=missing):
+            cache[skill.slug] = skill
+    skills = {}
+    for key in labels:
+        skill = cache.get(key)
+        if skill is not None:
+            skills[skill.pk] = skill
+    return list(skills.values())
+
+
+def skills_in_text(text, max_words=3):
+    """Compétences déjà connues citées dans un texte libre (texte extrait d'un CV, par exemple).
+
+    Chaque suite de 1 à `max_words` mots est comparée aux compétences et synonymes existants ;
+    aucune compétence n'est créée.
+    """
+    words = canonical_key(text).split()
+    keys = {}
+    for size in range(1, max_words + 1):
+        for start in range(len(words) - size + 1):
+            key = ' '.join(words[start:start + size]).strip('.')
+            if key and len(key) <= 100:
+                keys[key] = key
+    found = {}
+    items = list(keys.items())
+    for start in range(0, len(items), 500):
+        for skill in resolve_skills(dict(items[start:start + 500]), create=False):
+            found[skill.pk] = skill
+    return list(found.values())
+
+
+@transaction.atomic
+def sync_profile_skills(profile, cache=None):
+    """Aligne les liens CandidateSkill d'un profil sur son champ `skills` et le texte de son CV."""
+    from .models import CandidateSkill, Skill
+
+    wanted = {skill.pk for skill in resolve_skills(parse_skills(profile.skills), cache=cache)}
+    if profile.cv_text:
+        wanted.update(skill.pk for skill in skills_in_text(profile.cv_text))
+    current = set(CandidateSkill.objects.filter(candidate=profile).values_list('skill_id', flat=True))
+    added, removed = wanted - current, current - wanted
+    if removed:
+        CandidateSkill.objects.filter(candidate=profile, skill_id__in=removed).delete()
+        Skill.objects.filter(pk__in=removed).update(candidate_count=F('candidate_count') - 1)
+    if added:
+        CandidateSkill.objects.bulk_create([CandidateSkill(candidate=profile, skill_id=pk) for pk in added])
+        Skill.objects.filter(pk__in=added).update(candidate_count=F('candidate_count') + 1)
+
+
+def search_candidates(labels, min_experience=0, max_experience=None):
+    """Identifiants des candidats ayant toutes les compétences demandées, du plus récent au plus ancien.
+
+    Les listes de candidats sont intersectées de la plus courte à la plus longue : seule la première
+    est lue en entier, chaque suivante n'est consultée que pour les candidats encore retenus.
+    """
+    from .models import CandidateProfile, CandidateSkill
+
+    keys = parse_skills(', '.join(labels))
+    resolved = {}
+    skills = resolve_skills(keys, create=False, cache=resolved)
+    # Deux libellés peuvent désigner la même compétence (« javascript », « js ») : un libellé
+    # inconnu se repère à sa clé non résolue, pas au nombre de compétences trouvées
+    if any(key not in resolved for key in keys):
+        return []  # Compétence inconnue : aucun candidat ne peut l'avoir
+    profiles = CandidateProfile.objects.all()
+    if min_experience:
+        profiles = profiles.filter(years_experience__gte=min_experience)
+    if max_experience is not None:
+        profiles = profiles.filter(years_experience__lte=max_experience)
+    if not skills:
+        return []
+
+    skills.sort(key=lambda skill: skill.candidate_count)
+    ids = set(CandidateSkill.objects.filter(skill=skills[0]).values_list('candidate_id', flat=True))
+    for skill in skills[1:]:
+        if not ids:
+            return []
+        remaining = sorted(ids)
+        ids = set()
+        for start in range(0, len(remaining), 500):
+            ids.update(
+                CandidateSkill.objects.filter(
+                    skill=skill, candidate_id__in=remaining[start:start + 500]
+                ).values_list('candidate_id', flat=True)
+            )
+    if min_experience or max_experience is not None:
+        remaining = sorted(ids)
+        ids = set()
+        for start in range(0, len(remaining), 500):
+            ids.update(profiles.filter(pk__in=remaining[start:start + 500]).values_list('pk', flat=True))
+    return sorted(ids, reverse=True)
@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Greatest
+
+# Statistiques de candidatures par offre (ApplicationStats), maintenues de façon incrémentale :
+# chaque création, changement de statut ou suppression d'une candidature applique un delta
+# (+1/-1) à la ligne de l'offre. Les opérations en masse sans signaux (QuerySet.update,
+# bulk_create) doivent appeler recount(), ou rebuild() après un chargement complet ; la commande
+# reconcile_application_stats recalcule tout en signalant les écarts.
+
+STATUS_FIELDS = ('pending', 'accepted', 'rejected')
+COUNT_FIELDS = ('total',) + STATUS_FIELDS
+
+
+def status_delta(status, sign):
+    delta = {'total': sign}
+    if status in STATUS_FIELDS:
+        delta[status] = sign
+    return delta
+
+
+def apply_delta(job_offer_id, delta):
+    """Ajoute `delta` ({champ: ±n}) aux compteurs de l'offre, en créant la ligne au besoin."""
+    from .models import ApplicationStats, JobOffer
+
+    delta = {field: value for field, value in delta.items() if value}
+    if not delta:
+        return
+    changes = {field: Greatest(F(field) + value, Value(0)) for field, value in delta.items()}
+    if ApplicationStats.objects.filter(pk=job_offer_id).update(**changes):
+        return
+    if all(value < 0 for value in delta.values()):
+        return  # Rien à retirer (ligne absente, ou supprimée avec l'offre en cascade)
+    recruiter_id = JobOffer.objects.filter(pk=job_offer_id).values_list('created_by_id', flat=True).first()
+    if recruiter_id is None:
+        return  # Offre supprimée : sa ligne part avec elle
+    try:
+        with transaction.atomic():
+            ApplicationStats.objects.create(
+                job_offer_id=job_offer_id, recruiter_id=recruiter_id,
+                **{field: max(value, 0) for field, value in delta.items()},
+            )
+    except IntegrityError:
+        # Ligne créée entre-temps par une autre requête
+        ApplicationStats.objects.filter(pk=job_offer_id).update(**changes)
+
+
+def compute(job_offer_ids=None):
+    """Compteurs exacts {offre: {champ: n}} en une agrégation sur les candidatures."""
+    from .models import Application
+
+    applications = Application.objects.all()
+    if job_offer_ids is not None:
+        applications = applications.filter(job_offer_id__in=job_offer_ids)
+    counts = defaultdict(lambda: dict.fromkeys(COUNT_FIELDS, 0))
+    for row in applications.values('job_offer_id', 'status').annotate(n=Count('pk')).order_by():
+        for field, value in status_delta(row['status'], row['n']).items():
+            counts[row['job_offer_id']][field] += value
+    return counts
+
+
+@transaction.atomic
+def recount(job_offer_ids):
+    """Recalcule les lignes des offres données (après une opération en masse sur leurs candidatures)."""
+    from .models import ApplicationStats, JobOffer
+
+    job_offer_ids = list(job_offer_ids)
+    counts = compute(job_offer_ids)
+    owners = dict(JobOffer.objects.filter(pk__in=job_offer_ids).values_list('pk', 'created_by_id'))
+    ApplicationStats.objects.filter(pk__in=job_offer_ids).delete()
+    ApplicationStats.objects.bulk_create([
+        ApplicationStats(job_offer_id=pk, recruiter_id=owners[pk], **counts[pk])
+        for pk in job_offer_ids if pk in owners
+    ])
+
+
+@transaction.atomic
+def rebuild():
+    """Recalcule toute la table en une passe (après un chargement en masse) ; renvoie le nombre de lignes."""
+    from .models import ApplicationStats, JobOffer
+
+    counts = compute()
+    owners = dict(JobOffer.objects.values_list('pk', 'created_by_id'))
+    ApplicationStats.objects.all().delete()
+    created = ApplicationStats.objects.bulk_create([
+        ApplicationStats(job_offer_id=pk, recruiter_id=owners[pk], **row)
+        for pk, row in counts.items() if pk in owners
+    ], batch_size=500)
+    return len(created)
+
+
+def recruiter_summary(recruiter):
+    """Totaux de toutes les offres d'un recruteur, lus dans la seule table des statistiques."""
+    from .models import ApplicationStats
+
+    totals = ApplicationStats.objects.filter(recruiter=recruiter).aggregate(
+        **{field: Sum(field) for field in COUNT_FIELDS}
+    )
+    return {field: totals[field] or 0 for field in COUNT_FIELDS}
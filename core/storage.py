@@ -0,0 +1,16 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Fichiers statiques hachés et compressés (whitenoise), tolérants à un manifeste absent ou
+# incomplet : un fichier que collectstatic n'a pas (encore) traité est servi sous son nom
+# non haché au lieu de faire échouer le rendu de la page en erreur 500.
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Absent du manifeste et de STATIC_ROOT : impossible à hacher, URL non hachée
+            return name
@@ -0,0 +1,118 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+# File de tâches d'arrière-plan adossée à la table QueuedTask.
+# Les vues et signaux appellent enqueue() ; la commande run_tasks réclame les tâches dues
+# et les exécute dans un pool de threads, avec nouvelles tentatives à délai croissant.
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(name):
+    """Enregistre `func(payload, queued_task)` comme gestionnaire des tâches `name`."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, delay=None, max_attempts=None):
+    """Ajoute une tâche à la file, dans la transaction courante s'il y en a une."""
+    from .models import QueuedTask
+
+    if name not in _registry:
+        raise KeyError(f"Tâche inconnue : {name}")
+    if settings.TASKS_EAGER:
+        # Mode développement : exécution directe une fois la transaction validée
+        transaction.on_commit(lambda: _registry[name](payload or {}, None))
+        return None
+    fields = {'name': name, 'payload': payload or {}}
+    if delay:
+        fields['run_after'] = timezone.now() + delay
+    if max_attempts:
+        fields['max_attempts'] = max_attempts
+    return QueuedTask.objects.create(**fields)
+
+
+def enqueue_many(name, payloads):
+    """Ajoute une tâche par payload en une seule insertion (imports, traitements par lots)."""
+    from .models import QueuedTask
+
+    if name not in _registry:
+        raise KeyError(f"Tâche inconnue : {name}")
+    if settings.TASKS_EAGER:
+        for payload in payloads:
+            transaction.on_commit(lambda payload=payload: _registry[name](payload, None))
+        return []
+    return QueuedTask.objects.bulk_create(
+        [QueuedTask(name=name, payload=payload) for payload in payloads], batch_size=500
+    )
+
+
+def claim(limit):
+    """Passe au plus `limit` tâches dues à l'état « en cours » et les renvoie."""
+    from .models import QueuedTask
+
+    # Une seule instruction UPDATE ... WHERE pk IN (SELECT ...) : le verrou d'écriture est pris
+    # d'emblée, sans lecture préalable qui pourrait entrer en conflit avec un autre worker.
+    now = timezone.now()
+    due = (
+        QueuedTask.objects.filter(status='pending', run_after__lte=now)
+        .order_by('run_after', 'pk')
+        .values('pk')[:limit]
+    )
+    if not QueuedTask.objects.filter(pk__in=due).update(status='running', locked_at=now):
+        return []
+    return list(QueuedTask.objects.filter(status='running', locked_at=now).order_by('pk'))
+
+
+def run(queued_task):
+    """Exécute une tâche réclamée et enregistre son issue ; à appeler depuis un thread du pool."""
+    from .models import QueuedTask
+
+    try:
+        handler = _registry[queued_task.name]
+        handler(queued_task.payload, queued_task)
+    except Exception:
+        attempts = queued_task.attempts + 1
+        error = traceback.format_exc()
+        logger.exception("Échec de la tâche %s (#%s, tentative %s)", queued_task.name, queued_task.pk, attempts)
+        if attempts >= queued_task.max_attempts:
+            changes = {'status': 'failed'}
+        else:
+            backoff = settings.TASKS_RETRY_BACKOFF * (2 ** (attempts - 1))
+            changes = {'status': 'pending', 'run_after': timezone.now() + timedelta(seconds=backoff)}
+        QueuedTask.objects.filter(pk=queued_task.pk).update(
+            attempts=attempts, last_error=error[-5000:], locked_at=None, updated_at=timezone.now(), **changes
+        )
+    else:
+        QueuedTask.objects.filter(pk=queued_task.pk).update(
+            status='done', locked_at=None, last_error='', updated_at=timezone.now()
+        )
+    finally:
+        close_old_connections()
+
+
+def checkpoint(queued_task, **progress):
+    """Enregistre l'avancement d'une tâche (à appeler dans la transaction du lot traité)."""
+    from .models import QueuedTask
+
+    if queued_task is None:
+        return
+    queued_task.payload.update(progress)
+    QueuedTask.objects.filter(pk=queued_task.pk).update(payload=queued_task.payload)
+
+
+def requeue_stale(timeout):
+    """Remet en file les tâches restées « en cours » trop longtemps (worker arrêté brutalement)."""
+    from .models import QueuedTask
+
+    limit = timezone.now() - timeout
+    return QueuedTask.objects.filter(status='running', locked_at__lt=limit).update(status='pending', locked_at=None)
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from . import caching
+
+# Carrousel de témoignages de l'accueil : fragment HTML des derniers témoignages approuvés,
+# rendu une fois par processus et gardé en mémoire. Son numéro de version vit dans le cache
+# « coordination » (commun aux processus, sans requête SQL) : un témoignage qui entre ou sort
+# de la sélection (approbation, retrait, modification, suppression) change la version, et
+# chaque processus re-rend son fragment à la lecture suivante. Au plus tard après
+# TESTIMONIALS_CAROUSEL_TIMEOUT secondes, le fragment est re-rendu de toute façon
+# (modification faite hors signaux, par QuerySet.update ou directement en base).
+
+VERSION_KEY = 'testimonials:carousel:version'
+
+_local = {'version': None, 'html': None, 'rendered_at': 0.0}
+_lock = threading.Lock()
+
+
+def render_carousel():
+    from .models import Testimonial
+
+    testimonials = (
+        Testimonial.objects.filter(is_approved=True).select_related('user')
+        .order_by('-created_at')[:settings.TESTIMONIALS_CAROUSEL_SIZE]
+    )
+    return render_to_string('core/includes/testimonial_carousel.html', {'testimonials': testimonials})
+
+
+def current_version():
+    coordination = caches['coordination']
+    version = coordination.get(VERSION_KEY)
+    if version is None:
+        coordination.add(VERSION_KEY, time.time_ns())
+        version = coordination.get(VERSION_KEY)
+    return version
+
+
+def carousel():
+    """Fragment HTML du carrousel : copie du processus, re-rendue si la version commune a changé."""
+    version = current_version()
+    with _lock:
+        fresh = time.monotonic() - _local['rendered_at'] < settings.TESTIMONIALS_CAROUSEL_TIMEOUT
+        if _local['html'] is not None and _local['version'] == version and fresh:
+            return mark_safe(_local['html'])
+    html = render_carousel()
+    with _lock:
+        _local.update(version=version, html=html, rendered_at=time.monotonic())
+    return mark_safe(html)
+
+
+def refresh():
+    """Change la version du fragment (tous les processus) et périme les pages d'accueil qui l'incluent."""
+    caches['coordination'].set(VERSION_KEY, time.time_ns())
+    caching.invalidate_offers()  # Génération commune : l'accueil est re-rendu partout avec le fragment
@@ -1,3 +1,316 @@
-from django.test import TestCase
+import base64
+import datetime
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import dedup, ranking, testimonials
+from .messaging import send_message
+from .models import CandidateProfile, Category, JobOffer, OfferSignature, RecruiterProfile, Testimonial
+from .pagination import decode_cursor, encode_cursor, keyset_paginate, offset_from_cursor
+from .ratelimit import client_ip, parse_rate
+from .salary import parse_amounts, parse_salary
+from .skills import search_candidates
+
+# Cache « coordination » en mémoire pendant les tests : les fichiers de cache/ ne sont pas touchés.
+# Lectures sur « default » : la réplique, autre connexion, ne voit pas la transaction de chaque test.
+TEST_CACHES = {
+    **settings.CACHES,
+    'coordination': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-coordination'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES, TASKS_EAGER=False, DATABASE_REPLICA_VIEWS=[])
+class CacheTestCase(TestCase):
+    """Caches et copies des processus vidés avant chaque test (le cache « shared » suit la base de test)."""
+    def setUp(self):
+        super().setUp()
+        for alias in ('default', 'ratelimit', 'coordination'):
+            caches[alias].clear()
+        testimonials._local.update(version=None, html=None, rendered_at=0.0)
+        ranking._local.update(state=None, ranking=None, built_at=0.0)
+
+    def make_user(self, username):
+        return User.objects.create_user(username, password='secret')
+
+    def make_offer(self, title, **fields):
+        if not hasattr(self, 'recruiter'):
+            self.recruiter = self.make_user('recruteur')
+            self.category = Category.objects.create(name='Technologie')
+        fields.setdefault('description', f"Description de l'offre {title}.")
+        fields.setdefault('location', 'Douala')
+        fields.setdefault('is_validated', True)
+        return JobOffer.objects.create(title=title, category=self.category, created_by=self.recruiter, **fields)
+
+    def make_candidate(self, username, skills='', **fields):
+        with self.captureOnCommitCallbacks(execute=True):  # Mise à jour du classement après validation
+            return CandidateProfile.objects.create(user=self.make_user(username), full_name=username, skills=skills, **fields)
+
+    def count_queries(self, path, client=None):
+        with CaptureQueriesContext(connection) as context:
+            response = (client or self.client).get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+
+class SalaryParsingTests(SimpleTestCase):
+    def test_single_amount_with_currency_and_period(self):
+        self.assertEqual(parse_salary('50,000 FCFA/mois'), {
+            'salary_min': 50000, 'salary_max': 50000, 'salary_currency': 'XAF',
+            'salary_period': 'month', 'salary_monthly': 50000,
+        })
+
+    def test_range_with_multiplier_per_year(self):
+        parsed = parse_salary('1,2 M - 1,5 M FCFA par an')
+        self.assertEqual((parsed['salary_min'], parsed['salary_max']), (1_200_000, 1_500_000))
+        self.assertEqual(parsed['salary_period'], 'year')
+        self.assertEqual(parsed['salary_monthly'], 112_500)
+
+    def test_multiplier_on_last_bound_applies_to_range(self):
+        self.assertEqual(parse_amounts('100-150k'), [100_000, 150_000])
+
+    def test_foreign_currency_converted_to_base(self):
+        parsed = parse_salary('800 €/mois')
+        self.assertEqual(parsed['salary_currency'], 'EUR')
+        self.assertEqual(parsed['salary_monthly'], round(800 * settings.SALARY_EXCHANGE_RATES['EUR']))
+
+    def test_ordinals_and_experience_are_not_amounts(self):
+        self.assertEqual(parse_salary("5 ans d'expérience, 300 000 FCFA")['salary_min'], 300_000)
+        parsed = parse_salary('2 000 $ par semaine, 13e mois')
+        self.assertEqual((parsed['salary_min'], parsed['salary_period']), (2000, 'week'))
+
+    def test_no_amount(self):
+        parsed = parse_salary('À négocier')
+        self.assertIsNone(parsed['salary_monthly'])
+        self.assertEqual(parsed['salary_currency'], '')
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip_keeps_microseconds(self):
+        created_at = datetime.datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor([created_at, 42])), [created_at.isoformat(), 42])
+
+    def test_invalid_cursors(self):
+        for cursor in ('pas-un-curseur', base64.urlsafe_b64encode(b'{}').decode()):  # JSON qui n'est pas une liste
+            with self.subTest(cursor=cursor), self.assertRaises(Http404):
+                decode_cursor(cursor)
+
+    def test_offset_cursor(self):
+        self.assertEqual(offset_from_cursor(None), 0)
+        self.assertEqual(offset_from_cursor(encode_cursor([40])), 40)
+        with self.assertRaises(Http404):
+            offset_from_cursor(encode_cursor([-20]))
+
+    def test_ranking_cursor(self):
+        self.assertEqual(ranking.parse_cursor(encode_cursor([3, 20])), (3, 20))
+        with self.assertRaises(Http404):
+            ranking.parse_cursor(encode_cursor([3]))
+
+
+class KeysetPaginationTests(CacheTestCase):
+    def test_pages_cover_every_row_once_despite_ties(self):
+        same_time = timezone.now()
+        for index in range(7):
+            self.make_offer(f'Offre {index}', created_at=same_time if index % 2 else same_time - datetime.timedelta(days=index))
+        expected = list(JobOffer.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+        seen, cursor = [], None
+        while True:
+            page = keyset_paginate(JobOffer.objects.all(), cursor, page_size=3)
+            seen.extend(offer.pk for offer in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, expected)
+
+    def test_cursor_of_wrong_length_is_rejected(self):
+        with self.assertRaises(Http404):
+            keyset_paginate(JobOffer.objects.all(), encode_cursor([1]), page_size=3)
+
+    def test_list_view_follows_cursor(self):
+        for index in range(5):
+            self.make_offer(f'Offre {index}')
+        with self.settings(JOB_OFFERS_PAGE_SIZE=3):
+            first = self.client.get(reverse('job_offer_list'))
+            second = self.client.get(reverse('job_offer_list'), {'cursor': first.context['page'].next_cursor})
+        titles = [offer.title for offer in first.context['page']] + [offer.title for offer in second.context['page']]
+        self.assertEqual(sorted(titles), [f'Offre {index}' for index in range(5)])
+        self.assertFalse(second.context['page'].has_next)
+
+
+class SkillSearchTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.senior = self.make_candidate('senior', 'JavaScript, Python', years_experience=6)
+        self.junior = self.make_candidate('junior', 'javascript', years_experience=1)
+        self.make_candidate('pythoniste', 'Python', years_experience=3)
+
+    def test_alias_finds_canonical_skill(self):
+        self.assertCountEqual(search_candidates(['js']), [self.senior.pk, self.junior.pk])
+
+    def test_two_labels_for_the_same_skill(self):
+        self.assertCountEqual(search_candidates(['JavaScript', 'js']), [self.senior.pk, self.junior.pk])
+
+    def test_all_skills_required(self):
+        self.assertEqual(search_candidates(['js', 'python']), [self.senior.pk])
+
+    def test_unknown_skill_matches_nobody(self):
+        self.assertEqual(search_candidates(['js', 'cobol']), [])
+
+    def test_experience_bounds(self):
+        self.assertEqual(search_candidates(['js'], min_experience=2), [self.senior.pk])
+        self.assertEqual(search_candidates(['js'], max_experience=2), [self.junior.pk])
+
+
+class PageCacheTests(CacheTestCase):
+    def test_cached_home_page_makes_no_query(self):
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_saving_an_offer_invalidates_the_list(self):
+        self.make_offer('Développeur Django')
+        self.assertContains(self.client.get(reverse('job_offer_list')), 'Développeur Django')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_offer('Comptable')
+        self.assertContains(self.client.get(reverse('job_offer_list')), 'Comptable')
+
+    def test_invalidation_from_another_process(self):
+        # Un autre processus n'a que le cache « coordination » en commun avec celui-ci
+        self.client.get(reverse('job_offer_list'))
+        JobOffer.objects.bulk_create([JobOffer(
+            title='Importée', description='Offre importée.', location='Yaoundé',
+            created_by=self.make_user('import'), is_validated=True,
+        )])
+        self.assertNotContains(self.client.get(reverse('job_offer_list')), 'Importée')
+        caches['coordination'].clear()
+        self.assertContains(self.client.get(reverse('job_offer_list')), 'Importée')
+
+    def test_detail_revalidation(self):
+        offer = self.make_offer('Infirmier')
+        url = reverse('job_offer_detail', args=[offer.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.title = 'Infirmier de nuit'
+            offer.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Infirmier de nuit')
+
+    def test_carousel_follows_shared_version(self):
+        author = self.make_user('temoin')
+        testimonials.carousel()
+        with self.assertNumQueries(0):
+            testimonials.carousel()
+        with self.captureOnCommitCallbacks(execute=True):
+            Testimonial.objects.create(user=author, content='Très bonne plateforme', is_approved=True)
+        self.assertIn('Très bonne plateforme', testimonials.carousel())
+
+    def test_pending_testimonial_keeps_carousel(self):
+        testimonials.carousel()
+        with self.captureOnCommitCallbacks(execute=True):
+            Testimonial.objects.create(user=self.make_user('temoin'), content='En attente')
+        with self.assertNumQueries(0):
+            self.assertNotIn('En attente', testimonials.carousel())
+
+
+class QueryCountTests(CacheTestCase):
+    """Le nombre de requêtes des pages principales ne dépend pas du nombre de lignes affichées."""
+
+    def assertConstantQueries(self, path, add_rows, client=None):
+        counts = []
+        for count in (2, 6):
+            add_rows(count)
+            self.count_queries(path, client)  # Travail ponctuel (état partagé, classement du processus)
+            caches['default'].clear()  # Page rendue, pas servie depuis le cache
+            counts.append(self.count_queries(path, client))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_job_offer_list(self):
+        offers = iter(range(100))
+        self.assertConstantQueries(
+            reverse('job_offer_list'), lambda count: [self.make_offer(f'Offre {next(offers)}') for _ in range(count)]
+        )
+
+    def test_message_list(self):
+        user = self.make_user('lecteur')
+        self.client.force_login(user)
+        contacts = iter(range(100))
+
+        def add_conversations(count):
+            for _ in range(count):
+                send_message(self.make_user(f'contact{next(contacts)}'), user, 'Bonjour')
+
+        self.assertConstantQueries(reverse('message_list'), add_conversations)
+
+    def test_candidate_list(self):
+        recruiter = self.make_user('recruteur-valide')
+        RecruiterProfile.objects.create(user=recruiter, company_name='Entreprise', is_validated=True)
+        self.client.force_login(recruiter)
+        candidates = iter(range(100))
+        self.assertConstantQueries(
+            reverse('candidate_list'),
+            lambda count: [self.make_candidate(f'candidat{next(candidates)}', is_sponsored=True) for _ in range(count)],
+        )
+
+
+class RateLimitTests(CacheTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('60/m'), (60, 1.0))
+        self.assertEqual(parse_rate('10/s'), (10, 10.0))
+
+    @override_settings(RATE_LIMITS={'job_offer_list': {'ip': '2/m'}})
+    def test_requests_over_the_limit_get_429(self):
+        url = reverse('job_offer_list')
+        self.assertEqual([self.client.get(url).status_code for _ in range(2)], [200, 200])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        # Autre adresse : autre seau
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    @override_settings(RATE_LIMIT_PROXY_COUNT=1)
+    def test_client_ip_behind_proxy(self):
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='203.0.113.9, 10.0.0.1', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(client_ip(request), '10.0.0.1')
+        with self.settings(RATE_LIMIT_PROXY_COUNT=2):
+            self.assertEqual(client_ip(request), '203.0.113.9')
+
+
+class RankingTests(CacheTestCase):
+    def test_sponsored_profiles_first(self):
+        regular = self.make_candidate('regulier', years_experience=10)
+        sponsored = self.make_candidate('sponsorise', is_sponsored=True)
+        ids, total = ranking.page_ids(0, 10, 0)
+        self.assertEqual((ids, total), ([sponsored.pk, regular.pk], 2))
+
+    def test_change_recorded_by_another_process_is_replayed(self):
+        first = self.make_candidate('premier', years_experience=1)
+        second = self.make_candidate('second', years_experience=5)
+        self.assertEqual(ranking.page_ids(0, 10, 0)[0], [second.pk, first.pk])
+        # Écriture hors signaux, suivie de l'entrée de journal qu'aurait ajoutée l'autre processus
+        CandidateProfile.objects.filter(pk=first.pk).update(years_experience=9)
+        self.assertTrue(ranking.record_change([first.pk]))
+        self.assertEqual(ranking.page_ids(0, 10, 0)[0], [first.pk, second.pk])
+        self.assertEqual(ranking.get_ranking(), ranking.build())
+
+
+class DedupTests(CacheTestCase):
+    def test_copied_offer_is_flagged(self):
+        description = (
+            "Nous recherchons un développeur web expérimenté pour concevoir, maintenir et faire évoluer "
+            "nos applications de gestion, en lien avec les équipes produit et support à Douala."
+        )
+        original = self.make_offer('Développeur web', description=description)
+        copy = self.make_offer('Développeur web', description=description + ' Postulez vite.')
+        dedup.check_offer(original.pk)
+        dedup.check_offer(copy.pk)
+        self.assertEqual(OfferSignature.objects.get(job_offer=copy).duplicate_of_id, original.pk)
@@ -0,0 +1,20 @@
+import re
+import unicodedata
+
+# Outils de normalisation de texte partagés (recherche, compétences, etc.)
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(text):
+    """Met en minuscules et retire les accents ("Développeur" -> "developpeur")."""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return stripped.casefold()
+
+
+def tokenize(text):
+    """Découpe un texte replié en mots."""
+    return WORD_RE.findall(fold(text))
@@ -0,0 +1,166 @@
+import logging
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+# Traitement des fichiers des profils candidats (CV, photo).
+# 1. Pendant la requête : les fichiers sont reçus par morceaux (fichier temporaire sur disque
+#    au-delà de FILE_UPLOAD_MAX_MEMORY_SIZE) et abandonnés dès qu'ils dépassent leur limite.
+# 2. Hors requête : la tâche uploads.process_profile_media, exécutée par le worker, confie à un
+#    pool de processus la création des vignettes et l'extraction du texte du CV.
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """Abandonne un fichier dès que sa taille dépasse UPLOAD_MAX_SIZES[champ], sans le lire en entier."""
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.limit = settings.UPLOAD_MAX_SIZES.get(field_name, settings.UPLOAD_DEFAULT_MAX_SIZE)
+        self.received = 0
+        if content_length and content_length > self.limit:
+            self._reject()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            self._reject()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None  # Les gestionnaires suivants produisent le fichier
+
+    def _reject(self):
+        # Lu par la vue pour afficher l'erreur dans le formulaire
+        rejected = getattr(self.request, 'rejected_uploads', {})
+        rejected[self.field_name] = self.limit
+        self.request.rejected_uploads = rejected
+        raise SkipFile()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.UPLOAD_PROCESS_WORKERS)
+        return _pool
+
+
+class UnreadableFile(Exception):
+    """Fichier envoyé impossible à analyser : échec définitif, inutile de retenter la tâche."""
+
+
+# -- Fonctions exécutées dans les processus du pool (arguments et résultats sérialisables) --
+
+def make_avatar_variants(source_path, output_dir, stem, sizes, quality):
+    """Crée une vignette JPEG carrée par taille ; renvoie {taille: nom de fichier}."""
+    from PIL import Image, ImageOps
+
+    os.makedirs(output_dir, exist_ok=True)
+    variants = {}
+    try:
+        with Image.open(source_path) as image:
+            image = ImageOps.exif_transpose(image).convert('RGB')
+    except Exception as exc:  # Image tronquée, format inconnu, bombe de décompression…
+        raise UnreadableFile(f"Photo illisible : {exc}") from None
+    for size in sizes:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        name = f"{stem}_{size}.jpg"
+        thumbnail.save(os.path.join(output_dir, name), 'JPEG', quality=quality, optimize=True, progressive=True)
+        variants[str(size)] = name
+    return variants
+
+
+def extract_cv_text(path, max_chars):
+    try:
+        text = _read_cv_text(path, max_chars)
+    except Exception as exc:  # Archive .docx corrompue, PDF invalide ou chiffré…
+        raise UnreadableFile(f"CV illisible : {exc}") from None
+    return re.sub(r'[ \t]+', ' ', text).strip()[:max_chars]
+
+
+def _read_cv_text(path, max_chars):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        from pypdf import PdfReader
+
+        parts, length = [], 0
+        for page in PdfReader(path).pages:
+            text = page.extract_text() or ''
+            parts.append(text)
+            length += len(text)
+            if length >= max_chars:
+                break
+        text = '\n'.join(parts)
+    elif extension == '.docx':
+        with zipfile.ZipFile(path) as archive:
+            xml = archive.read('word/document.xml').decode('utf-8', 'ignore')
+        text = re.sub(r'<w:p[ >]', '\n<w:p ', xml)
+        text = re.sub(r'<[^>]+>', '', text)
+    else:
+        text = ''  # Ancien format .doc : pas d'extraction
+    return text
+
+
+@task('uploads.process_profile_media')
+def process_profile_media(payload, queued_task=None):
+    from .models import CandidateProfile
+    from .skills import sync_profile_skills
+
+    profile = CandidateProfile.objects.filter(pk=payload['profile_id']).first()
+    if profile is None:
+        return
+    CandidateProfile.objects.filter(pk=profile.pk).update(media_status='processing')
+    pool = get_process_pool()
+    try:
+        picture_future = cv_future = None
+        if profile.profile_picture:
+            source = profile.profile_picture.path
+            output_dir = os.path.join(os.path.dirname(source), 'variants')
+            stem = f"{profile.pk}_{os.path.splitext(os.path.basename(source))[0]}"
+            picture_future = pool.submit(
+                make_avatar_variants, source, output_dir, stem, settings.AVATAR_SIZES, settings.AVATAR_QUALITY
+            )
+        if profile.cv_file:
+            cv_future = pool.submit(extract_cv_text, profile.cv_file.path, settings.CV_TEXT_MAX_CHARS)
+
+        # Un fichier illisible n'empêche pas d'enregistrer le résultat de l'autre ; seules les
+        # erreurs passagères (pool, disque) font échouer la tâche, qui sera retentée
+        changes = {'media_status': 'ready'}
+        if picture_future is not None:
+            try:
+                variants = picture_future.result()
+            except UnreadableFile as exc:
+                logger.warning("Profil %s : %s", profile.pk, exc)
+                changes['media_status'] = 'unreadable'
+                changes['picture_variants'] = {}  # Pas de vignettes d'une photo précédente
+            else:
+                directory = os.path.join(os.path.dirname(profile.profile_picture.name), 'variants')
+                changes['picture_variants'] = {size: f"{directory}/{name}" for size, name in variants.items()}
+        if cv_future is not None:
+            try:
+                changes['cv_text'] = cv_future.result()
+            except UnreadableFile as exc:
+                logger.warning("Profil %s : %s", profile.pk, exc)
+                changes['media_status'] = 'unreadable'
+                changes['cv_text'] = ''
+    except Exception:
+        CandidateProfile.objects.filter(pk=profile.pk).update(media_status='failed')
+        raise
+    CandidateProfile.objects.filter(pk=profile.pk).update(**changes)
+    if 'cv_text' in changes:
+        # Les compétences connues trouvées dans le CV rejoignent les listes de la recherche recruteur
+        profile.cv_text = changes['cv_text']
+        sync_profile_skills(profile)
@@ -4,7 +4,20 @@ from . import views
 urlpatterns = [
     path('', views.home, name='home'),
     path('profile/create/', views.candidate_profile_create, name='candidate_profile_create'),
+    path('profile/alerts/', views.alert_settings, name='alert_settings'),
     path('jobs/', views.job_offer_list, name='job_offer_list'),
+    path('jobs/export.<str:fmt>', views.job_offer_export, name='job_offer_export'),
     path('jobs/<int:pk>/', views.job_offer_detail, name='job_offer_detail'),
+    path('jobs/<int:pk>/apply/', views.apply_job, name='apply_job'),
+    path('jobs/<int:pk>/matches/', views.job_offer_matches, name='job_offer_matches'),
+    path('candidates/', views.candidate_list, name='candidate_list'),
+    path('candidates/search/', views.candidate_search, name='candidate_search'),
+    path('dashboard/', views.recruiter_dashboard, name='recruiter_dashboard'),
+    path('testimonials/new/', views.submit_testimonial, name='submit_testimonial'),
+    path('recommendations/', views.recommended_offers, name='recommended_offers'),
     path('messages/', views.message_list, name='message_list'),
+    path('messages/<int:pk>/', views.conversation_detail, name='conversation_detail'),
+    path('messages/new/<int:user_id>/', views.conversation_start, name='conversation_start'),
+    path('events/', views.event_stream, name='event_stream'),
+    path('metrics', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -1,11 +1,29 @@
-from django.shortcuts import render, redirect
+import asyncio
+
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from .models import JobOffer, Message, CandidateProfile
-from .forms import CandidateProfileForm, TestimonialForm
+from django.contrib.admin.views.decorators import staff_member_required
+from django.conf import settings
+from django.contrib.auth.models import User
+from .models import Application, ApplicationStats, JobOffer, CandidateProfile, ConversationMember, QueuedTask
+from .forms import AlertSettingsForm, CandidateProfileForm, CandidateSearchForm, MessageForm, TestimonialForm
+from .messaging import mark_conversation_read, send_message, thread_page, unread_count
+from .matching import top_candidates_for_offer, top_offers_for_candidate
+from .realtime import format_event, get_broker
+from . import facets, feeds, ranking, salary, tasks, testimonials
+from .applications import submit_application
+from .caching import cached_page
+from .metrics import registry as metrics_registry
+from .pagination import KeysetPage, encode_cursor, keyset_paginate, offset_from_cursor
+from .search import matching_offers, search_offers
+from .skills import search_candidates
+from .stats import recruiter_summary
 from django.contrib import messages
 
+@cached_page('home')
 def home(request):
-    return render(request, 'core/index.html')
+    return render(request, 'core/index.html', {'testimonial_carousel': testimonials.carousel()})
 
 @login_required
 def candidate_profile_create(request):
@@ -14,36 +32,294 @@ def candidate_profile_create(request):
         return redirect('home')
     if request.method == 'POST':
         form = CandidateProfileForm(request.POST, request.FILES)
+        # Accéder à request.FILES a lu le corps : les fichiers trop gros ont été abandonnés en cours de route
+        form.reject_uploads(getattr(request, 'rejected_uploads', {}))
         if form.is_valid():
             profile = form.save(commit=False)
             profile.user = request.user
+            has_media = bool(profile.cv_file or profile.profile_picture)
+            profile.media_status = 'pending' if has_media else 'none'
             profile.save()
+            if has_media:
+                # Vignettes et texte du CV sont produits par le worker : la réponse n'attend pas
+                tasks.enqueue('uploads.process_profile_media', {'profile_id': profile.pk})
             messages.success(request, "Profil créé avec succès !")
             return redirect('home')
     else:
         form = CandidateProfileForm()
     return render(request, 'core/candidate_profile_form.html', {'form': form})
 
+@login_required
+def alert_settings(request):
+    # Fréquence et catégorie des résumés d'alertes emploi (commande send_job_alerts)
+    profile = getattr(request.user, 'candidate_profile', None)
+    if profile is None:
+        messages.info(request, "Créez d'abord votre profil candidat pour recevoir des alertes emploi.")
+        return redirect('candidate_profile_create')
+    if request.method == 'POST':
+        form = AlertSettingsForm(request.POST, instance=profile)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Préférences d'alertes enregistrées.")
+            return redirect('alert_settings')
+    else:
+        form = AlertSettingsForm(instance=profile)
+    return render(request, 'core/alert_settings.html', {'form': form})
+
+@cached_page('offers')
 def job_offer_list(request):
-    job_offers = JobOffer.objects.filter(is_validated=True)
-    return render(request, 'core/job_offer_list.html', {'job_offers': job_offers})
+    query = request.GET.get('q', '').strip()
+    cursor = request.GET.get('cursor')
+    page_size = settings.JOB_OFFERS_PAGE_SIZE
+    offers, active_facets = facets.filter_offers(JobOffer.objects.filter(is_validated=True), request.GET)
+    offers, active_salary = salary.filter_offers(offers, request.GET)
+    sort = request.GET.get('sort', '')
+    if query and sort in salary.SORTS:
+        # Tri par salaire demandé : l'index plein texte ne fait que restreindre les offres,
+        # l'ordre et la pagination par curseur restent ceux de la liste
+        offers, ordering = salary.sorted_offers(matching_offers(offers, query), sort)
+        page = keyset_paginate(offers, cursor, page_size, ordering=ordering)
+    elif query:
+        # Résultats classés par pertinence via l'index plein texte ; les filtres actifs (facettes,
+        # salaire) sont appliqués dans la requête classée, avant la pagination
+        offset = offset_from_cursor(cursor)
+        filtered = active_facets or active_salary
+        ranked_ids = search_offers(query, limit=page_size + 1, offset=offset, queryset=offers if filtered else None)
+        next_cursor = encode_cursor([offset + page_size]) if len(ranked_ids) > page_size else None
+        ranked_ids = ranked_ids[:page_size]
+        offers_by_id = offers.in_bulk(ranked_ids)
+        page = KeysetPage([offers_by_id[pk] for pk in ranked_ids if pk in offers_by_id], next_cursor)
+    else:
+        offers, ordering = salary.sorted_offers(offers, sort)
+        page = keyset_paginate(offers, cursor, page_size, **({'ordering': ordering} if ordering else {}))
+    return render(request, 'core/job_offer_list.html', {
+        'job_offers': page,
+        'page': page,
+        'query': query,
+        'active_facets': active_facets,
+        'active_salary': active_salary,
+        'sort': sort if sort in salary.SORTS else '',
+        # Compteurs pré-calculés (core.facets) : coût proportionnel au nombre de valeurs, pas d'offres
+        'facet_groups': facets.sidebar(request.GET, settings.FACETS_MAX_VALUES),
+    })
+
+@staff_member_required
+def job_offer_export(request, fmt):
+    if fmt not in feeds.FORMATS:
+        raise Http404
+    # Flux généré au fil de l'eau : les offres sont lues par tranches pendant l'envoi
+    offers = JobOffer.objects.filter(is_validated=True)
+    if 'source' in request.GET:
+        offers = offers.filter(source=request.GET['source'])
+    content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(
+        feeds.serialize(feeds.iter_offers(offers), fmt), content_type=f'{content_type}; charset=utf-8'
+    )
+    response['Content-Disposition'] = f'attachment; filename="offres.{fmt}"'
+    return response
 
+@cached_page('offer', offer_kwarg='pk')
 def job_offer_detail(request, pk):
-    job_offer = JobOffer.objects.get(pk=pk, is_validated=True)
+    job_offer = get_object_or_404(JobOffer, pk=pk, is_validated=True)
     return render(request, 'core/job_offer_detail.html', {'job_offer': job_offer})
 
+@login_required
+def apply_job(request, pk):
+    job_offer = get_object_or_404(JobOffer, pk=pk, is_validated=True)
+    if not hasattr(request.user, 'candidate_profile'):
+        messages.info(request, "Créez votre profil candidat pour postuler.")
+        return redirect('candidate_profile_create')
+    candidate = request.user.candidate_profile
+    if request.method == 'POST':
+        # Écriture regroupée avec les candidatures simultanées (core.applications) ; un renvoi du
+        # formulaire retrouve la candidature existante
+        try:
+            application_id, created = submit_application(candidate, job_offer)
+        except TimeoutError:
+            messages.info(request, "Votre candidature est en cours d'enregistrement.")
+        else:
+            if created:
+                messages.success(request, "Votre candidature a été envoyée !")
+            elif application_id is not None:
+                messages.info(request, "Vous avez déjà postulé à cette offre.")
+            else:
+                messages.error(request, "Cette offre n'est plus disponible.")
+        return redirect('job_offer_detail', pk=pk)
+    if Application.objects.filter(candidate=candidate, job_offer=job_offer).exists():
+        messages.info(request, "Vous avez déjà postulé à cette offre.")
+        return redirect('job_offer_detail', pk=pk)
+    return render(request, 'core/apply_job.html', {'job_offer': job_offer, 'candidate': candidate})
+
+@login_required
+def recruiter_dashboard(request):
+    if not hasattr(request.user, 'recruiter_profile'):
+        messages.error(request, "Le tableau de bord est réservé aux recruteurs.")
+        return redirect('home')
+    # Lecture des seuls compteurs pré-calculés (core.stats), jamais de la table des candidatures
+    page = keyset_paginate(
+        ApplicationStats.objects.filter(recruiter=request.user).select_related('job_offer'),
+        request.GET.get('cursor'), settings.JOB_OFFERS_PAGE_SIZE, ordering=('-job_offer_id',),
+    )
+    return render(request, 'core/recruiter_dashboard.html', {
+        'page': page,
+        'summary': recruiter_summary(request.user),
+        'company': request.user.recruiter_profile.company_name,
+    })
+
+@login_required
+def recommended_offers(request):
+    if not hasattr(request.user, 'candidate_profile'):
+        messages.info(request, "Créez votre profil candidat pour recevoir des recommandations.")
+        return redirect('candidate_profile_create')
+    matches = top_offers_for_candidate(request.user.candidate_profile)
+    return render(request, 'core/recommended_offers.html', {'matches': matches})
+
+@login_required
+def job_offer_matches(request, pk):
+    # Réservé au recruteur qui a publié l'offre
+    job_offer = get_object_or_404(JobOffer, pk=pk, created_by=request.user)
+    matches = top_candidates_for_offer(job_offer)
+    return render(request, 'core/job_offer_matches.html', {'job_offer': job_offer, 'matches': matches})
+
+def _is_validated_recruiter(user):
+    return hasattr(user, 'recruiter_profile') and user.recruiter_profile.is_validated
+
+@login_required
+def candidate_list(request):
+    if not _is_validated_recruiter(request.user):
+        messages.error(request, "La liste des candidats est réservée aux recruteurs validés.")
+        return redirect('home')
+    # Tranche du classement pré-calculé (core.ranking) : seuls les profils de la page sont lus
+    rotation, position = ranking.parse_cursor(request.GET.get('cursor'))
+    page_size = settings.JOB_OFFERS_PAGE_SIZE
+    page_ids, total = ranking.page_ids(position, page_size, rotation)
+    next_cursor = encode_cursor([rotation, position + page_size]) if total > position + page_size else None
+    profiles = CandidateProfile.objects.in_bulk(page_ids)
+    page = KeysetPage([profiles[pk] for pk in page_ids if pk in profiles], next_cursor)
+    page.total = total
+    return render(request, 'core/candidate_list.html', {'page': page})
+
+@login_required
+def candidate_search(request):
+    if not _is_validated_recruiter(request.user):
+        messages.error(request, "La recherche de candidats est réservée aux recruteurs validés.")
+        return redirect('home')
+    form = CandidateSearchForm(request.GET or None)
+    page = None
+    if form.is_valid():
+        candidate_ids = search_candidates(
+            form.cleaned_data['skills'].split(','),
+            min_experience=form.cleaned_data['min_experience'] or 0,
+            max_experience=form.cleaned_data['max_experience'],
+        )
+        page_size = settings.JOB_OFFERS_PAGE_SIZE
+        candidate_ids = ranking.sponsored_first(candidate_ids, page_size)
+        offset = offset_from_cursor(request.GET.get('cursor'))
+        page_ids = candidate_ids[offset:offset + page_size]
+        next_cursor = encode_cursor([offset + page_size]) if len(candidate_ids) > offset + page_size else None
+        profiles = CandidateProfile.objects.in_bulk(page_ids)
+        page = KeysetPage([profiles[pk] for pk in page_ids if pk in profiles], next_cursor)
+        page.total = len(candidate_ids)
+    return render(request, 'core/candidate_search.html', {'form': form, 'page': page})
+
 @login_required
 def message_list(request):
-    messages_received = Message.objects.filter(recipient=request.user)
-    return render(request, 'core/message_list.html', {'messages': messages_received})
+    # Une requête pour la page de conversations (interlocuteur et dernier message joints)
+    conversations = ConversationMember.objects.filter(user=request.user).select_related(
+        'other_user', 'conversation__last_message'
+    )
+    page = keyset_paginate(
+        conversations, request.GET.get('cursor'), settings.MESSAGES_PAGE_SIZE, ordering=('-last_message_at', '-id')
+    )
+    return render(request, 'core/message_list.html', {
+        'conversations': page,
+        'page': page,
+        'unread_count': unread_count(request.user),
+    })
+
+@login_required
+def conversation_detail(request, pk):
+    member = get_object_or_404(
+        ConversationMember.objects.select_related('conversation', 'other_user'), conversation_id=pk, user=request.user
+    )
+    if request.method == 'POST':
+        form = MessageForm(request.POST)
+        if form.is_valid():
+            send_message(request.user, member.other_user, form.cleaned_data['content'])
+            return redirect('conversation_detail', pk=pk)
+    else:
+        form = MessageForm()
+    if member.unread_count:
+        mark_conversation_read(member.conversation, request.user)
+    page = thread_page(member.conversation, request.GET.get('cursor'), settings.MESSAGES_PAGE_SIZE)
+    return render(request, 'core/conversation_detail.html', {
+        'conversation': member.conversation,
+        'other_user': member.other_user,
+        'thread': list(reversed(page.object_list)),  # Du plus ancien au plus récent
+        'page': page,
+        'form': form,
+    })
 
+@login_required
+def conversation_start(request, user_id):
+    recipient = get_object_or_404(User, pk=user_id, is_active=True)
+    if recipient == request.user:
+        return redirect('message_list')
+    if request.method == 'POST':
+        form = MessageForm(request.POST)
+        if form.is_valid():
+            message = send_message(request.user, recipient, form.cleaned_data['content'])
+            return redirect('conversation_detail', pk=message.conversation_id)
+    else:
+        form = MessageForm()
+    return render(request, 'core/conversation_start.html', {'recipient': recipient, 'form': form})
+
+async def event_stream(request):
+    # Flux server-sent events : nouveaux messages et notifications de l'utilisateur connecté.
+    # Vue asynchrone, à servir via l'application ASGI (eeuezjob/asgi.py).
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+    broker = get_broker()
+
+    async def events():
+        async with broker.subscribe(user.pk) as queue:
+            yield f"retry: {settings.REALTIME_RETRY_MS}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.REALTIME_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"  # Garde la connexion ouverte à travers les proxys
+                else:
+                    yield format_event(event)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
 def submit_testimonial(request):
     if request.method == 'POST':
         form = TestimonialForm(request.POST)
         if form.is_valid():
-            # Save to database (e.g., Testimonial model) - Placeholder
-            messages.success(request, "Témoignage soumis avec succès !")
+            testimonial = form.save(commit=False)
+            testimonial.user = request.user
+            testimonial.save()  # Publié sur l'accueil après approbation par le personnel
+            messages.success(request, "Merci ! Votre témoignage sera publié après validation.")
             return redirect('home')
     else:
         form = TestimonialForm()
-    return render(request, 'core/submit_testimonial.html', {'form': form})
\ No newline at end of file
+    return render(request, 'core/submit_testimonial.html', {'form': form})
+
+def metrics(request):
+    # Réservé au collecteur Prometheus (adresses autorisées) et au personnel
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS and not request.user.is_staff:
+        raise Http404
+    broker = get_broker()
+    gauges = [
+        ('eeuez_tasks_pending', "Tâches d'arrière-plan en attente.", QueuedTask.objects.filter(status='pending').count()),
+    ]
+    if hasattr(broker, 'connection_count'):
+        gauges.append(('eeuez_realtime_connections', "Connexions temps réel ouvertes dans ce processus.", broker.connection_count()))
+    return HttpResponse(metrics_registry.render(gauges), content_type='text/plain; version=0.0.4; charset=utf-8')
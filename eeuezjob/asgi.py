@@ -3,6 +3,9 @@ ASGI config for eeuezjob project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The server-sent events endpoint (core.views.event_stream) needs this entry point,
+e.g. ``gunicorn eeuezjob.asgi:application -k uvicorn.workers.UvicornWorker``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -47,6 +47,21 @@ CRISPY_TEMPLATE_PACK = 'tailwind'
 
 # Configuration pour django-tailwind
 TAILWIND_APP_NAME = 'dark'
+# Sortie de « python manage.py tailwind build » (dark/static_src) ; tant qu'elle n'a pas été
+# produite, la feuille compilée versionnée static/css/tailwind.css (mêmes classes) la remplace.
+TAILWIND_CSS_PATH = env('TAILWIND_CSS_PATH', default=(
+    'css/dist/styles.css' if (BASE_DIR / 'dark/static/css/dist/styles.css').exists() else 'css/tailwind.css'
+))
+
+# E-mails (alertes emploi, comptes) : console en développement, SMTP configuré par l'environnement
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = env('EMAIL_HOST', default='localhost')
+EMAIL_PORT = env.int('EMAIL_PORT', default=25)
+EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=False)
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='EEUEZJob <no-reply@localhost>')
+SITE_URL = env('SITE_URL', default='http://localhost:8000')  # Liens absolus des e-mails
 
 # Configuration pour django-allauth
 AUTHENTICATION_BACKENDS = [
@@ -55,7 +70,11 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',  # En tête : mesure aussi le coût des autres middlewares
+    'core.db.ReadReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',  # Fichiers statiques servis avant sessions et authentification
+    'core.ratelimit.RateLimitMiddleware',  # 429 avant toute vue et toute requête SQL
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -63,7 +82,6 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     "allauth.account.middleware.AccountMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
 ]
 
 ROOT_URLCONF = 'eeuezjob.urls'
@@ -91,12 +109,126 @@ WSGI_APPLICATION = 'eeuezjob.wsgi.application'
 
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DATABASE_URL (ex. postgres://…) remplace SQLite ; sinon SQLite réglé pour plusieurs workers :
+# journal WAL (lecteurs et écrivain simultanés), transactions IMMEDIATE (verrou d'écriture pris
+# dès BEGIN, sans conflit d'upgrade « database is locked ») et attente plutôt qu'échec immédiat.
+DB_CONN_MAX_AGE = env.int('DB_CONN_MAX_AGE', default=60)  # Connexions persistantes (secondes, 0 : une par requête)
+if 'DATABASE_URL' in os.environ:
+    DATABASES = {'default': env.db('DATABASE_URL')}
+else:
+    SQLITE_PATH = env('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3'))
+    SQLITE_PRAGMAS = [
+        'PRAGMA synchronous=NORMAL',  # Sûr en WAL : seule la dernière transaction peut être perdue en cas de panne
+        f"PRAGMA mmap_size={env.int('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024)}",
+        f"PRAGMA cache_size=-{env.int('SQLITE_CACHE_KB', default=64 * 1024)}",  # Négatif : en Kio
+        'PRAGMA temp_store=MEMORY',
+    ]
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SQLITE_PATH,
+            'OPTIONS': {
+                'init_command': ';'.join(['PRAGMA journal_mode=WAL'] + SQLITE_PRAGMAS),
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': env.int('SQLITE_TIMEOUT', default=20),  # Attente maximale du verrou d'écriture
+            },
+        }
     }
+    if env.bool('DB_READ_REPLICA', default=True):
+        # Même fichier ouvert en lecture seule : les vues de consultation ne prennent jamais
+        # le verrou d'écriture (voir core.db.ReadReplicaRouter)
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': f"file:{SQLITE_PATH}?mode=ro",
+            'OPTIONS': {
+                'init_command': ';'.join(SQLITE_PRAGMAS + ['PRAGMA query_only=1']),
+                'timeout': env.int('SQLITE_TIMEOUT', default=20),
+            },
+            'TEST': {'MIRROR': 'default'},
+        }
+if 'DATABASE_REPLICA_URL' in os.environ:
+    DATABASES['replica'] = env.db('DATABASE_REPLICA_URL')
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+for _database in DATABASES.values():
+    _database['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+    _database['CONN_HEALTH_CHECKS'] = True
+DATABASE_ROUTERS = ['core.db.ReadReplicaRouter']
+# Vues (noms d'URL) dont les requêtes GET lisent sur la base « replica »
+DATABASE_REPLICA_VIEWS = env.list('DATABASE_REPLICA_VIEWS', default=[
+    'home', 'job_offer_list', 'job_offer_detail', 'message_list',
+    'v1:offer-list', 'v1:offer-detail', 'v1:category-list', 'v1:category-detail',
+    'v1:guide-list', 'v1:guide-detail',
+])
+# Cache
+# CACHE_BACKEND=locmem (par processus) ou file (partagé entre workers, dans CACHE_LOCATION)
+CACHE_BACKEND = env('CACHE_BACKEND', default='locmem')
+CACHES = {
+    'default': {
+        'BACKEND': {
+            'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+            'file': 'django.core.cache.backends.filebased.FileBasedCache',
+        }[CACHE_BACKEND],
+        'LOCATION': env('CACHE_LOCATION', default=str(BASE_DIR / 'cache') if CACHE_BACKEND == 'file' else 'eeuezjob'),
+        'TIMEOUT': env.int('CACHE_TIMEOUT', default=600),
+        'OPTIONS': {
+            # Au-delà de MAX_ENTRIES, 1/CULL_FREQUENCY des entrées sont évincées
+            'MAX_ENTRIES': env.int('CACHE_MAX_ENTRIES', default=5000),
+            'CULL_FREQUENCY': 3,
+        },
+    },
+    # Seaux de la limitation de débit : toujours en mémoire du processus
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'eeuezjob-ratelimit',
+        'OPTIONS': {'MAX_ENTRIES': env.int('RATE_LIMIT_MAX_ENTRIES', default=50000), 'CULL_FREQUENCY': 4},
+    },
+    # Données partagées par tous les processus (web, worker run_tasks) : table de la base,
+    # créée par la migration core 0019 (ou « manage.py createcachetable »)
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': env('SHARED_CACHE_TABLE', default='core_shared_cache'),
+        'TIMEOUT': env.int('SHARED_CACHE_TIMEOUT', default=3600),
+        'OPTIONS': {'MAX_ENTRIES': env.int('SHARED_CACHE_MAX_ENTRIES', default=1000), 'CULL_FREQUENCY': 3},
+    },
+    # Petites valeurs partagées par tous les processus et lues à chaque requête (génération des
+    # pages en cache…) : fichiers locaux, sans requête SQL. Plusieurs serveurs : un cache commun,
+    # par exemple COORDINATION_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache.
+    'coordination': {
+        'BACKEND': env('COORDINATION_CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': env('COORDINATION_CACHE_LOCATION', default=str(BASE_DIR / 'cache' / 'coordination')),
+        'TIMEOUT': env.int('COORDINATION_CACHE_TIMEOUT', default=86400),  # Une génération expirée est simplement renouvelée
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# Limitation de débit par seau à jetons (core.ratelimit) : débits « N/s|m|h » par vue,
+# par adresse IP et par session. Les limites IP restent larges (NAT des opérateurs mobiles).
+# « user_field » : champ POST (identifiant saisi) qui remplace la session comme clé du seau « user »,
+# pour qu'un client ne repartisse pas d'un seau plein en abandonnant ses cookies.
+RATE_LIMIT_ENABLED = env.bool('RATE_LIMIT_ENABLED', default=True)
+RATE_LIMIT_CACHE = 'ratelimit'
+RATE_LIMIT_PROXY_COUNT = env.int('RATE_LIMIT_PROXY_COUNT', default=0)  # Mandataires inverses de confiance devant l'application
+RATE_LIMITS = {
+    'job_offer_list': {'ip': '120/m', 'user': '60/m'},
+    'job_offer_detail': {'ip': '240/m', 'user': '120/m'},
+    'v1:offer-list': {'ip': '120/m', 'user': '60/m'},
+    'v1:offer-detail': {'ip': '240/m', 'user': '120/m'},
+    'candidate_search': {'ip': '60/m', 'user': '30/m'},
+    'account_login': {'ip': '20/m', 'user': '5/m', 'user_field': 'login', 'methods': ['POST']},
+    'account_signup': {'ip': '10/m', 'user': '3/m', 'methods': ['POST']},
+    'account_reset_password': {'ip': '10/m', 'user': '3/m', 'user_field': 'email', 'methods': ['POST']},
+    'apply_job': {'ip': '60/m', 'user': '10/m', 'methods': ['POST']},
 }
+
+# API (Django REST framework)
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -134,7 +266,125 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# collectstatic produit des noms hachés (manifeste) et leurs variantes .gz/.br (Brotli si le
+# paquet brotli est installé) ; whitenoise sert les fichiers hachés avec un cache d'un an,
+# « immutable ». Déploiement : tailwind install, tailwind build, puis collectstatic.
+# Un fichier absent du manifeste (collectstatic non rejoué) est servi sous son nom non haché.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': env('STATICFILES_BACKEND', default='core.storage.StaticFilesStorage'),
+    },
+}
+WHITENOISE_MAX_AGE = env.int('WHITENOISE_MAX_AGE', default=3600)  # Fichiers non hachés ; les fichiers hachés sont cachés un an
+
+# Fichiers envoyés par les utilisateurs (CV, photos de profil)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = env('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Recherche plein texte des offres (core.search) : FTS5 sur SQLite, index en mémoire sinon
+SEARCH_BACKEND = env('SEARCH_BACKEND', default=(
+    'core.search.SqliteFTSBackend' if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'
+    else 'core.search.InMemoryIndexBackend'
+))
+
+# Pagination par curseur des listes d'offres (core.pagination)
+JOB_OFFERS_PAGE_SIZE = env.int('JOB_OFFERS_PAGE_SIZE', default=20)
+MESSAGES_PAGE_SIZE = env.int('MESSAGES_PAGE_SIZE', default=20)
+
+# Rétention (core.archive, commande archive_messages) : âge en jours au-delà duquel les messages
+# lus et les notifications lues passent dans les archives mensuelles compressées
+ARCHIVE_MESSAGES_AFTER_DAYS = env.int('ARCHIVE_MESSAGES_AFTER_DAYS', default=365)
+ARCHIVE_NOTIFICATIONS_AFTER_DAYS = env.int('ARCHIVE_NOTIFICATIONS_AFTER_DAYS', default=90)
+ARCHIVE_BATCH_SIZE = env.int('ARCHIVE_BATCH_SIZE', default=1000)
+
+# Carrousel de témoignages de l'accueil (core.testimonials)
+TESTIMONIALS_CAROUSEL_SIZE = env.int('TESTIMONIALS_CAROUSEL_SIZE', default=10)
+TESTIMONIALS_CAROUSEL_TIMEOUT = env.int('TESTIMONIALS_CAROUSEL_TIMEOUT', default=900)  # Re-rendu de sécurité de la copie locale
+
+# Classement des candidats pour les recruteurs (core.ranking) : sponsorisés en tête, en rotation
+CANDIDATE_RECENCY_BUCKET_DAYS = env.int('CANDIDATE_RECENCY_BUCKET_DAYS', default=7)  # Profils d'une même tranche classés par expérience
+CANDIDATE_SPONSORED_ROTATION = env.int('CANDIDATE_SPONSORED_ROTATION', default=3600)  # Secondes entre deux décalages
+CANDIDATE_RANKING_TIMEOUT = env.int('CANDIDATE_RANKING_TIMEOUT', default=6 * 3600)  # Recalcul complet de sécurité
+CANDIDATE_RANKING_CACHE = env('CANDIDATE_RANKING_CACHE', default='shared')  # Alias de CACHES, partagé entre processus
+CANDIDATE_RANKING_LOCK_WAIT = env.float('CANDIDATE_RANKING_LOCK_WAIT', default=2.0)  # Attente du verrou avant mise en file
+
+# Filtres à facettes de la liste des offres (core.facets)
+FACETS_MAX_VALUES = env.int('FACETS_MAX_VALUES', default=15)  # Valeurs affichées par facette
+
+# Correspondance candidats/offres (core.matching)
+MATCHING_TOP_K = env.int('MATCHING_TOP_K', default=10)
+MATCHING_MIN_SCORE = env.float('MATCHING_MIN_SCORE', default=0.1)
+
+# File de tâches d'arrière-plan (core.tasks, commande run_tasks)
+TASKS_EAGER = env.bool('TASKS_EAGER', default=False)  # Exécute les tâches sans worker (développement)
+TASKS_RETRY_BACKOFF = env.int('TASKS_RETRY_BACKOFF', default=30)  # Secondes, doublées à chaque échec
+NOTIFICATION_FANOUT_CHUNK = env.int('NOTIFICATION_FANOUT_CHUNK', default=500)
+
+# Dépôt des candidatures (core.applications) : écritures regroupées par un thread par processus
+APPLICATIONS_COALESCE = env.bool('APPLICATIONS_COALESCE', default=True)  # False : écriture directe dans la requête
+APPLICATIONS_COALESCE_WINDOW = env.float('APPLICATIONS_COALESCE_WINDOW', default=0.02)  # Secondes d'attente avant écriture
+APPLICATIONS_BATCH_SIZE = env.int('APPLICATIONS_BATCH_SIZE', default=500)
+APPLICATIONS_SUBMIT_TIMEOUT = env.float('APPLICATIONS_SUBMIT_TIMEOUT', default=10)
+
+# Résumés d'alertes emploi (core.alerts, commande send_job_alerts)
+DIGEST_MAX_OFFERS = env.int('DIGEST_MAX_OFFERS', default=10)  # Offres par e-mail
+DIGEST_CHUNK = env.int('DIGEST_CHUNK', default=1000)  # Candidats par transaction d'écriture
+DIGEST_EMAIL_WORKERS = env.int('DIGEST_EMAIL_WORKERS', default=4)  # Connexions SMTP simultanées
+DIGEST_EMAIL_BATCH = env.int('DIGEST_EMAIL_BATCH', default=50)  # E-mails par connexion
+DIGEST_MAX_ATTEMPTS = env.int('DIGEST_MAX_ATTEMPTS', default=3)
+
+# Diffusion temps réel en server-sent events (core.realtime, servie en ASGI)
+# DatabaseRelayBroker : événements relayés entre processus (worker run_tasks compris) par la base,
+# pour les seuls utilisateurs connectés ; purgés par run_tasks
+REALTIME_BROKER = env('REALTIME_BROKER', default='core.realtime.DatabaseRelayBroker')
+REALTIME_RELAY_INTERVAL = env.float('REALTIME_RELAY_INTERVAL', default=1.0)  # Secondes entre deux vérifications du relais
+REALTIME_RELAY_RETENTION = env.int('REALTIME_RELAY_RETENTION', default=300)  # Secondes de conservation des événements relayés
+REALTIME_HEARTBEAT = env.int('REALTIME_HEARTBEAT', default=25)  # Secondes entre deux commentaires keep-alive
+REALTIME_RETRY_MS = env.int('REALTIME_RETRY_MS', default=5000)  # Délai de reconnexion du navigateur
+REALTIME_QUEUE_SIZE = env.int('REALTIME_QUEUE_SIZE', default=100)  # Événements en attente par connexion
+
+# Envois de fichiers (core.uploads) : reçus par morceaux, écrits sur disque au-delà de
+# FILE_UPLOAD_MAX_MEMORY_SIZE, puis traités hors requête par la tâche uploads.process_profile_media
+FILE_UPLOAD_HANDLERS = [
+    'core.uploads.LimitedUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+FILE_UPLOAD_MAX_MEMORY_SIZE = env.int('FILE_UPLOAD_MAX_MEMORY_SIZE', default=1024 * 1024)
+UPLOAD_DEFAULT_MAX_SIZE = env.int('UPLOAD_DEFAULT_MAX_SIZE', default=5 * 1024 * 1024)
+UPLOAD_MAX_SIZES = {
+    'cv_file': env.int('UPLOAD_MAX_CV_SIZE', default=10 * 1024 * 1024),
+    'profile_picture': env.int('UPLOAD_MAX_PICTURE_SIZE', default=5 * 1024 * 1024),
+}
+UPLOAD_PROCESS_WORKERS = env.int('UPLOAD_PROCESS_WORKERS', default=2)  # Processus de traitement des fichiers
+AVATAR_SIZES = [64, 160, 320]  # Côtés des vignettes carrées, en pixels
+AVATAR_QUALITY = env.int('AVATAR_QUALITY', default=82)
+CV_TEXT_MAX_CHARS = env.int('CV_TEXT_MAX_CHARS', default=20000)
+
+# Instrumentation des requêtes (core.metrics), exposée en texte Prometheus sur /metrics
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=True)
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1'])  # Collecteurs autorisés (en plus du personnel)
+METRICS_SLOW_REQUEST_MS = env.int('METRICS_SLOW_REQUEST_MS', default=0)  # Journalise les requêtes plus lentes, avec leur SQL (0 : désactivé)
+METRICS_NPLUSONE_THRESHOLD = env.int('METRICS_NPLUSONE_THRESHOLD', default=5)  # Répétitions d'une même requête SQL signalant un N+1
+
+# Modération (core.admin, core.dedup) : décomptes approchés et détection des quasi-doublons par MinHash/LSH
+ADMIN_COUNT_LIMIT = env.int('ADMIN_COUNT_LIMIT', default=10000)  # Plafond du décompte des listes filtrées
+ADMIN_COUNT_CACHE_TIMEOUT = env.int('ADMIN_COUNT_CACHE_TIMEOUT', default=300)  # Secondes de cache du décompte total
+DEDUP_NUM_PERM = env.int('DEDUP_NUM_PERM', default=64)  # Taille de la signature MinHash
+DEDUP_BANDS = env.int('DEDUP_BANDS', default=16)  # Bandes LSH (DEDUP_NUM_PERM doit en être multiple)
+DEDUP_THRESHOLD = env.float('DEDUP_THRESHOLD', default=0.8)  # Similarité de Jaccard estimée d'un doublon
+DEDUP_MAX_CANDIDATES = env.int('DEDUP_MAX_CANDIDATES', default=200)  # Comparaisons au plus par offre
+DEDUP_SPAM_MIN_OWNERS = env.int('DEDUP_SPAM_MIN_OWNERS', default=3)  # Recruteurs distincts publiant la même offre
+DEDUP_SPAM_MAX_CONTACTS = env.int('DEDUP_SPAM_MAX_CONTACTS', default=3)  # Liens, e-mails ou numéros dans le texte
+
+# Salaires structurés (core.salary) : montants mensuels comparables, en devise de référence
+SALARY_BASE_CURRENCY = env('SALARY_BASE_CURRENCY', default='XAF')
+SALARY_EXCHANGE_RATES = env.dict(
+    'SALARY_EXCHANGE_RATES', cast={'value': float}, default={'EUR': 655.957, 'USD': 600.0}
+)  # Unités de devise de référence pour une unité de devise étrangère
@@ -2,9 +2,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from core.api import router as api_router
 
 urlpatterns = [
     path('', include('core.urls')),
+    path('api/v1/', include((api_router.urls, 'api'), namespace='v1')),
     path('admin/', admin.site.urls),
     path('accounts/', include('allauth.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file